@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基于 asyncio 的轻量 HTTP/1.1 工具
+只依赖标准库，供本地服务脚本复用（请求解析、响应构造、keep-alive 连接处理、分块传输的流式响应）
+"""
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# 单个请求头部和请求体的大小上限，防止异常请求占满内存
+MAX_HEADER_SIZE = 64 * 1024
+MAX_BODY_SIZE = 16 * 1024 * 1024
+
+STATUS_TEXT = {
+    200: 'OK',
+    201: 'Created',
+    202: 'Accepted',
+    204: 'No Content',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error',
+    503: 'Service Unavailable',
+}
+
+
+class HTTPError(Exception):
+    """处理请求时抛出，会被转换为对应状态码的JSON错误响应"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class HTTPRequest:
+    """解析后的HTTP请求"""
+
+    def __init__(self, method: str, target: str, headers: Dict[str, str], body: bytes):
+        self.method = method
+        self.target = target
+        self.headers = headers
+        self.body = body
+
+        parts = urlsplit(target)
+        self.path = parts.path
+        # 查询参数只保留每个键的最后一个值
+        self.query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+
+    @property
+    def keep_alive(self) -> bool:
+        """HTTP/1.1 默认保持连接，除非客户端要求关闭"""
+        return self.headers.get('connection', '').lower() != 'close'
+
+    def json(self) -> Any:
+        """把请求体解析为JSON，格式错误时返回400"""
+        try:
+            return json.loads(self.body.decode('utf-8') or 'null')
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise HTTPError(400, f"请求体不是有效的JSON: {e}")
+
+
+# 处理函数返回 (状态码, 响应体, 额外响应头)，响应体为 dict/list 时按JSON输出，
+# 为异步迭代器（逐块产生 bytes）时以 chunked 编码边生成边发送
+Handler = Callable[[HTTPRequest], Awaitable[Tuple[int, Any, Dict[str, str]]]]
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[HTTPRequest]:
+    """读取一个完整请求；连接已关闭时返回 None"""
+    try:
+        head = await reader.readuntil(b'\r\n\r\n')
+    except asyncio.IncompleteReadError:
+        return None
+    except asyncio.LimitOverrunError:
+        raise HTTPError(413, "请求头过大")
+
+    if len(head) > MAX_HEADER_SIZE:
+        raise HTTPError(413, "请求头过大")
+
+    lines = head.decode('latin-1').split('\r\n')
+    try:
+        method, target, _version = lines[0].split(' ', 2)
+    except ValueError:
+        raise HTTPError(400, "无效的请求行")
+
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+
+    # 只接受十进制数字（int() 还会接受负数、空白、下划线和全角数字），先比较位数避免超长数字串
+    length_text = headers.get('content-length', '') or '0'
+    if not (length_text.isascii() and length_text.isdigit()):
+        raise HTTPError(400, f"无效的 Content-Length: {length_text[:32]}")
+    if len(length_text) > len(str(MAX_BODY_SIZE)) or int(length_text) > MAX_BODY_SIZE:
+        raise HTTPError(413, "请求体过大")
+    length = int(length_text)
+    try:
+        body = await reader.readexactly(length) if length else b''
+    except asyncio.IncompleteReadError:
+        # 请求体没发完客户端就断开了
+        return None
+
+    return HTTPRequest(method.upper(), target, headers, body)
+
+
+def build_response(status: int, payload: Any, headers: Optional[Dict[str, str]] = None,
+                   keep_alive: bool = True) -> bytes:
+    """构造完整的HTTP响应报文"""
+    headers = dict(headers or {})
+    if isinstance(payload, bytes):
+        body = payload
+        headers.setdefault('Content-Type', 'application/octet-stream')
+    elif isinstance(payload, str):
+        body = payload.encode('utf-8')
+        headers.setdefault('Content-Type', 'text/plain; charset=utf-8')
+    else:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        headers.setdefault('Content-Type', 'application/json; charset=utf-8')
+
+    headers['Content-Length'] = str(len(body))
+    headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+
+    head = f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'Unknown')}\r\n"
+    head += ''.join(f"{name}: {value}\r\n" for name, value in headers.items())
+    return head.encode('latin-1') + b'\r\n' + body
+
+
+def build_stream_head(status: int, headers: Optional[Dict[str, str]] = None, keep_alive: bool = True) -> bytes:
+    """构造分块传输响应的状态行和响应头"""
+    headers = dict(headers or {})
+    headers.setdefault('Content-Type', 'application/octet-stream')
+    headers['Transfer-Encoding'] = 'chunked'
+    headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+
+    head = f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'Unknown')}\r\n"
+    head += ''.join(f"{name}: {value}\r\n" for name, value in headers.items())
+    return head.encode('latin-1') + b'\r\n'
+
+
+async def write_stream(writer: asyncio.StreamWriter, status: int, body: AsyncIterator[bytes],
+                       headers: Optional[Dict[str, str]] = None, keep_alive: bool = True):
+    """逐块发送响应体，每块发送后等待缓冲区排空，慢速客户端不会让内存堆积"""
+    try:
+        writer.write(build_stream_head(status, headers, keep_alive))
+        async for chunk in body:
+            if chunk:
+                writer.write(b'%x\r\n' % len(chunk) + chunk + b'\r\n')
+                await writer.drain()
+        writer.write(b'0\r\n\r\n')
+        await writer.drain()
+    finally:
+        # 客户端中途断开时也让生成器执行清理（例如删除临时文件）
+        if hasattr(body, 'aclose'):
+            await body.aclose()
+
+
+def make_connection_handler(handler: Handler):
+    """把请求处理函数包装成 asyncio.start_server 需要的连接回调"""
+
+    async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except HTTPError as e:
+                    writer.write(build_response(e.status, {"error": e.message}, keep_alive=False))
+                    await writer.drain()
+                    break
+
+                if request is None:
+                    break
+
+                try:
+                    status, payload, headers = await handler(request)
+                except HTTPError as e:
+                    status, payload, headers = e.status, {"error": e.message}, {}
+                except Exception as e:
+                    print(f"处理请求 {request.method} {request.path} 时出错: {e}")
+                    status, payload, headers = 500, {"error": "服务器内部错误"}, {}
+
+                if hasattr(payload, '__aiter__'):
+                    try:
+                        await write_stream(writer, status, payload, headers, request.keep_alive)
+                    except (ConnectionResetError, BrokenPipeError):
+                        raise
+                    except Exception as e:
+                        # 响应头已经发出，只能断开连接，客户端会收到不完整的分块响应
+                        print(f"发送 {request.method} {request.path} 的响应时出错: {e}")
+                        break
+                else:
+                    writer.write(build_response(status, payload, headers, request.keep_alive))
+                    await writer.drain()
+
+                if not request.keep_alive:
+                    break
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            writer.close()
+
+    return handle_connection
+
+
+async def serve(handler: Handler, host: str, port: int) -> asyncio.AbstractServer:
+    """启动HTTP服务并返回 server 对象"""
+    return await asyncio.start_server(make_connection_handler(handler), host, port,
+                                      limit=MAX_HEADER_SIZE)
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+难度均衡的组卷工具
+根据题库中 item_analysis.py 写入的难度统计，按目标难度分布和主题覆盖抽题，
+让不同考生拿到的试卷难度接近。题目预先按 (难度, 主题) 分桶，每份试卷只需 O(题数) 的抽样。
+生成的题目不带主题信息，主题按题干关键词推断（见 derive_topics）；题目带 topic 字段时以该字段为准。
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# 难度等级，按 p 值（答对比例）划分
+LEVELS = ('easy', 'medium', 'hard')
+
+# 目标难度分布的默认值
+DEFAULT_DISTRIBUTION = {'easy': 0.3, 'medium': 0.5, 'hard': 0.2}
+
+# 某个难度的题不够时，依次从这些等级借题
+FALLBACK_ORDER = {
+    'easy': ('medium', 'hard'),
+    'medium': ('easy', 'hard'),
+    'hard': ('medium', 'easy'),
+}
+
+# 关键词：汉字二元组和3个字母以上的英文单词；含有疑问词、虚词用字的二元组不作为关键词
+WORD_RE = re.compile(r'[\u4e00-\u9fff]+|[A-Za-z]{3,}')
+STOP_CHARS = set('什么哪些如何怎样为是否多少的了吗呢和与及或有要该能会可')
+
+
+def difficulty_level(question: Dict[str, Any], easy_threshold: float = 0.7, hard_threshold: float = 0.4) -> str:
+    """根据 stats.p_value 判断难度，没有统计数据的题按中等处理"""
+    p_value = (question.get('stats') or {}).get('p_value')
+    if p_value is None:
+        return 'medium'
+    if p_value >= easy_threshold:
+        return 'easy'
+    if p_value < hard_threshold:
+        return 'hard'
+    return 'medium'
+
+
+def allocate(total: int, weights: Dict[str, float]) -> Dict[str, int]:
+    """最大余数法把 total 按权重分配成整数配额"""
+    weight_sum = sum(weights.values())
+    if total <= 0 or weight_sum <= 0:
+        return {key: 0 for key in weights}
+
+    exact = {key: total * weight / weight_sum for key, weight in weights.items()}
+    quotas = {key: int(value) for key, value in exact.items()}
+    remaining = total - sum(quotas.values())
+    for key in sorted(exact, key=lambda k: exact[k] - quotas[k], reverse=True)[:remaining]:
+        quotas[key] += 1
+    return quotas
+
+
+def question_keywords(text: str) -> Set[str]:
+    """题干中可作为主题的关键词"""
+    keywords = set()
+    for word in WORD_RE.findall(text):
+        if word.isascii():
+            keywords.add(word.lower())
+            continue
+        for i in range(len(word) - 1):
+            pair = word[i:i + 2]
+            if not STOP_CHARS.intersection(pair):
+                keywords.add(pair)
+    return keywords
+
+
+def derive_topics(questions: List[Dict[str, Any]], min_count: int = 3, max_share: float = 0.2) -> List[str]:
+    """推断每道题的主题：题干关键词中在题库里出现次数最多的一个。
+    出现不到 min_count 道题的词太偏，超过 max_share 比例的词（如题库的领域名）区分不出主题，都不参与；
+    没有合适关键词的题主题为空字符串"""
+    keywords = [question_keywords(question.get('question', '')) for question in questions]
+    counts = Counter(word for words in keywords for word in words)
+    limit = max_share * len(questions)
+    topics = []
+    for question, words in zip(questions, keywords):
+        if question.get('topic'):
+            topics.append(question['topic'])
+            continue
+        candidates = [word for word in words if min_count <= counts[word] <= limit]
+        topics.append(max(candidates, key=lambda word: (counts[word], word)) if candidates else '')
+    return topics
+
+
+def parse_distribution(text: str) -> Dict[str, float]:
+    """解析 easy=0.3,medium=0.5,hard=0.2 形式的难度分布"""
+    distribution = {}
+    for part in text.split(','):
+        level, _, weight = part.partition('=')
+        level = level.strip()
+        if level not in LEVELS:
+            raise ValueError(f"未知的难度等级 {level}，可选 {', '.join(LEVELS)}")
+        distribution[level] = float(weight)
+    return distribution
+
+
+class BalancedSelector:
+    """预先分桶的分层抽样器"""
+
+    def __init__(self, questions: List[Dict[str, Any]], easy_threshold: float = 0.7, hard_threshold: float = 0.4):
+        self.questions = questions
+        # buckets[难度][主题] = 题目下标列表，建好后只读
+        self.buckets: Dict[str, Dict[str, List[int]]] = {level: {} for level in LEVELS}
+        for index, (question, topic) in enumerate(zip(questions, derive_topics(questions))):
+            level = difficulty_level(question, easy_threshold, hard_threshold)
+            self.buckets[level].setdefault(topic, []).append(index)
+        self.topics = {level: list(topics) for level, topics in self.buckets.items()}
+        self.level_sizes = {level: sum(len(b) for b in topics.values()) for level, topics in self.buckets.items()}
+
+    def _plan_levels(self, num_questions: int, distribution: Dict[str, float]) -> Dict[str, int]:
+        """计算每个难度的抽题数，题量不足的等级按 FALLBACK_ORDER 借用"""
+        quotas = allocate(num_questions, {level: distribution.get(level, 0) for level in LEVELS})
+        plan = {level: min(quotas[level], self.level_sizes[level]) for level in LEVELS}
+        for level in LEVELS:
+            shortage = quotas[level] - plan[level]
+            for other in FALLBACK_ORDER[level]:
+                if shortage <= 0:
+                    break
+                extra = min(shortage, self.level_sizes[other] - plan[other])
+                plan[other] += extra
+                shortage -= extra
+        return plan
+
+    def _sample_level(self, level: str, count: int, rng: random.Random) -> List[int]:
+        """在一个难度内按主题轮流分配配额，保证主题覆盖"""
+        # 主题数多于题数时只抽取 count 个主题，各出一题
+        all_topics = self.topics[level]
+        topics = rng.sample(all_topics, min(count, len(all_topics)))
+
+        picks = {topic: 0 for topic in topics}
+        remaining = count
+        while remaining > 0:
+            progressed = False
+            for topic in topics:
+                if remaining == 0:
+                    break
+                if picks[topic] < len(self.buckets[level][topic]):
+                    picks[topic] += 1
+                    remaining -= 1
+                    progressed = True
+            if not progressed:
+                break
+
+        selected = []
+        for topic, k in picks.items():
+            if k:
+                selected.extend(rng.sample(self.buckets[level][topic], k))
+        return selected
+
+    def select(self, num_questions: int, distribution: Optional[Dict[str, float]] = None,
+               rng: Optional[random.Random] = None) -> List[Dict[str, Any]]:
+        """抽取一份试卷的题目"""
+        rng = rng or random
+        num_questions = min(num_questions, len(self.questions))
+        plan = self._plan_levels(num_questions, distribution or DEFAULT_DISTRIBUTION)
+
+        indices = []
+        for level in LEVELS:
+            if plan[level]:
+                indices.extend(self._sample_level(level, plan[level], rng))
+        rng.shuffle(indices)
+        return [self.questions[i] for i in indices]
+
+
+def describe_form(questions: List[Dict[str, Any]]) -> Tuple[Dict[str, int], Optional[float]]:
+    """统计一份试卷的难度构成和平均 p 值"""
+    counts = {level: 0 for level in LEVELS}
+    p_values = []
+    for question in questions:
+        counts[difficulty_level(question)] += 1
+        p_value = (question.get('stats') or {}).get('p_value')
+        if p_value is not None:
+            p_values.append(p_value)
+    return counts, (sum(p_values) / len(p_values) if p_values else None)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='难度均衡的组卷工具')
+    parser.add_argument('bank', help='带难度统计的题库JSON文件路径（先运行 item_analysis.py）')
+    parser.add_argument('--num-questions', '-n', type=int, default=25, help='每份试卷的题目数量')
+    parser.add_argument('--distribution', default='easy=0.3,medium=0.5,hard=0.2', help='目标难度分布')
+    parser.add_argument('--forms', type=int, default=1, help='生成的试卷份数')
+    parser.add_argument('--seed', type=int, help='随机种子')
+    parser.add_argument('--output-dir', '-o', default='data/forms', help='试卷输出目录')
+    parser.add_argument('--benchmark', action='store_true', help='只测量组卷速度，不写文件')
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.bank):
+        print(f"错误：文件不存在 {args.bank}")
+        return
+
+    try:
+        distribution = parse_distribution(args.distribution)
+    except ValueError as e:
+        print(f"错误：{e}")
+        return
+
+    with open(args.bank, 'r', encoding='utf-8') as f:
+        bank = json.load(f)
+
+    selector = BalancedSelector(bank['questions'])
+    print("题库分桶: " + ", ".join(f"{level} {selector.level_sizes[level]} 题 {len(selector.topics[level])} 个主题"
+                               for level in LEVELS))
+    rng = random.Random(args.seed)
+
+    if args.benchmark:
+        forms = max(args.forms, 10000)
+        start = time.perf_counter()
+        for _ in range(forms):
+            selector.select(args.num_questions, distribution, rng)
+        elapsed = time.perf_counter() - start
+        print(f"⏱️ 组卷 {forms} 份用时 {elapsed:.3f} 秒，{forms / elapsed:.0f} 份/秒")
+        return
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for form_no in range(1, args.forms + 1):
+        questions = selector.select(args.num_questions, distribution, rng)
+        form = {
+            'title': bank.get('title', '知识测试'),
+            'description': bank.get('description', ''),
+            'time_limit': bank.get('time_limit', 30),
+            'total_questions': len(questions),
+            'questions': questions,
+        }
+        path = os.path.join(args.output_dir, f"form_{form_no:04d}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(form, f, ensure_ascii=False, indent=2)
+
+        counts, mean_p = describe_form(questions)
+        mean_text = f"{mean_p:.3f}" if mean_p is not None else "无统计"
+        print(f"✅ {path}: " + ", ".join(f"{level} {counts[level]}" for level in LEVELS) + f"，平均p值 {mean_text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量题目生成流水线
+一次处理大量文档（例如网络存储上的知识库目录），每个文档生成一个题目文件。
+各阶段之间用有界队列连接，读文件、提取、解析、生成、写文件同时进行：
+
+  读取(线程) → 提取(进程池) → 解析(进程池) → 生成(进程池) → 写入(线程)
+
+队列满时上游阶段会等待（背压），内存中同时存在的文档数不超过 队列容量×阶段数。
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import extractors
+from quiz_records import QAPair
+from quiz_stream import QuizStreamWriter
+from quiz_core import distractor_strategy_names, generate_quiz_questions, parse_qa_content_universal
+
+
+class Job:
+    """流水线中的一个文档，各阶段依次填充字段"""
+
+    def __init__(self, path: str, output_path: str, seed: Optional[str]):
+        self.path = path
+        self.output_path = output_path
+        self.seed = seed
+        self.data: Optional[bytes] = None
+        self.content: Optional[str] = None
+        self.qa_pairs: Optional[List[QAPair]] = None
+        self.quiz_data: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+
+    @property
+    def ext(self) -> str:
+        return os.path.splitext(self.path)[1].lower()
+
+
+# ---- 各阶段的同步函数（在线程池或进程池中运行，必须是模块级函数才能被进程池调用） ----
+
+def read_file(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def extract_document(data: bytes, ext: str) -> str:
+    return extractors.extract_bytes(data, ext)
+
+
+def parse_document(content: str) -> List[QAPair]:
+    return parse_qa_content_universal(content)
+
+
+def generate_document(qa_pairs: List[QAPair], config: Dict[str, Any], seed: Optional[str]) -> Dict[str, Any]:
+    return generate_quiz_questions(qa_pairs, config, random.Random(seed))
+
+
+def write_quiz_file(path: str, quiz_data: Dict[str, Any], fmt: Optional[str]) -> int:
+    with QuizStreamWriter(path, quiz_data['title'], quiz_data['description'], quiz_data['time_limit'],
+                          fmt) as writer:
+        for question in quiz_data['questions']:
+            writer.write_question(question.to_dict())
+    return writer.count
+
+
+def collect_inputs(paths: List[str]) -> List[str]:
+    """展开目录，返回所有支持格式的文档路径"""
+    supported = set(extractors.supported_extensions())
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                for name in sorted(names):
+                    if os.path.splitext(name)[1].lower() in supported:
+                        files.append(os.path.join(root, name))
+        elif os.path.exists(path):
+            files.append(path)
+        else:
+            print(f"错误：文件不存在 {path}")
+    return files
+
+
+def plan_jobs(files: List[str], output_dir: str, fmt: str, seed: Optional[int]) -> List[Job]:
+    """为每个文档确定输出路径，同名文档依次加编号"""
+    used = set()
+    jobs = []
+    ext = '.jsonl' if fmt == 'jsonl' else '.json'
+    for path in files:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        name, suffix = stem, 2
+        while name in used:
+            name, suffix = f"{stem}-{suffix}", suffix + 1
+        used.add(name)
+        # 每个文档的随机数种子由全局种子和文件名派生，结果与处理顺序无关
+        job_seed = f"{seed}:{name}" if seed is not None else None
+        jobs.append(Job(path, os.path.join(output_dir, name + ext), job_seed))
+    return jobs
+
+
+class QuizPipeline:
+    """用有界 asyncio 队列串联各阶段的流水线"""
+
+    STAGES = ('read', 'extract', 'parse', 'generate', 'write')
+
+    def __init__(self, config: Dict[str, Any], fmt: str, workers: int, io_concurrency: int, queue_size: int,
+                 use_processes: bool = True):
+        self.config = config
+        self.format = fmt
+        self.workers = workers
+        self.io_concurrency = io_concurrency
+        self.queue_size = queue_size
+        self.io_executor = ThreadPoolExecutor(max_workers=io_concurrency)
+        self.cpu_executor: Executor = (ProcessPoolExecutor(max_workers=workers) if use_processes
+                                       else ThreadPoolExecutor(max_workers=workers))
+        self.busy = {stage: 0.0 for stage in self.STAGES}
+        self.done: List[Job] = []
+        self.failed: List[Job] = []
+
+    def close(self):
+        self.io_executor.shutdown()
+        self.cpu_executor.shutdown()
+
+    async def _in(self, executor: Executor, func: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+    # ---- 各阶段：返回 False 表示该文档到此为止 ----
+
+    async def read(self, job: Job) -> bool:
+        job.data = await self._in(self.io_executor, read_file, job.path)
+        return True
+
+    async def extract(self, job: Job) -> bool:
+        job.content = await self._in(self.cpu_executor, extract_document, job.data, job.ext)
+        job.data = None
+        if not job.content:
+            job.error = "无法提取文档内容"
+            return False
+        return True
+
+    async def parse(self, job: Job) -> bool:
+        job.qa_pairs = await self._in(self.cpu_executor, parse_document, job.content)
+        job.content = None
+        if not job.qa_pairs:
+            job.error = "无法解析到有效的问答对"
+            return False
+        return True
+
+    async def generate(self, job: Job) -> bool:
+        stem = os.path.splitext(os.path.basename(job.path))[0]
+        config = dict(self.config,
+                      title=self.config.get('title') or stem,
+                      description=self.config.get('description') or f"基于{os.path.basename(job.path)}生成的测试题目")
+        job.quiz_data = await self._in(self.cpu_executor, generate_document, job.qa_pairs, config, job.seed)
+        job.qa_pairs = None
+        return True
+
+    async def write(self, job: Job) -> bool:
+        await self._in(self.io_executor, write_quiz_file, job.output_path, job.quiz_data, self.format)
+        self.done.append(job)
+        return True
+
+    async def _run_stage(self, name: str, handler: Callable[[Job], Awaitable[bool]], inbox: asyncio.Queue,
+                         outbox: Optional[asyncio.Queue], concurrency: int, downstream: int):
+        async def worker():
+            while True:
+                job = await inbox.get()
+                if job is None:
+                    return
+                start = time.perf_counter()
+                try:
+                    ok = await handler(job)
+                except Exception as e:
+                    job.error = f"{type(e).__name__}: {e}"
+                    ok = False
+                self.busy[name] += time.perf_counter() - start
+                if not ok:
+                    print(f"❌ {job.path}: {job.error}")
+                    self.failed.append(job)
+                elif outbox is not None:
+                    await outbox.put(job)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        # 本阶段全部结束后，给下游每个工作协程发一个结束标记
+        if outbox is not None:
+            for _ in range(downstream):
+                await outbox.put(None)
+
+    async def run(self, jobs: List[Job]):
+        concurrency = {
+            'read': self.io_concurrency,
+            'extract': self.workers,
+            'parse': self.workers,
+            'generate': self.workers,
+            'write': self.io_concurrency,
+        }
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.STAGES]
+
+        tasks = []
+        for i, stage in enumerate(self.STAGES):
+            outbox = queues[i + 1] if i + 1 < len(self.STAGES) else None
+            downstream = concurrency[self.STAGES[i + 1]] if outbox is not None else 0
+            tasks.append(asyncio.create_task(
+                self._run_stage(stage, getattr(self, stage), queues[i], outbox, concurrency[stage], downstream)))
+
+        for job in jobs:
+            await queues[0].put(job)
+        for _ in range(concurrency['read']):
+            await queues[0].put(None)
+
+        await asyncio.gather(*tasks)
+
+    def run_sequential(self, jobs: List[Job]):
+        """逐个文档依次执行全部阶段，用于与流水线对比耗时"""
+        async def run_one(job: Job):
+            for stage in self.STAGES:
+                start = time.perf_counter()
+                try:
+                    ok = await getattr(self, stage)(job)
+                except Exception as e:
+                    job.error = f"{type(e).__name__}: {e}"
+                    ok = False
+                self.busy[stage] += time.perf_counter() - start
+                if not ok:
+                    print(f"❌ {job.path}: {job.error}")
+                    self.failed.append(job)
+                    return
+
+        async def run_all():
+            for job in jobs:
+                await run_one(job)
+
+        asyncio.run(run_all())
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='批量题目生成流水线：每个文档生成一个题目文件')
+    parser.add_argument('inputs', nargs='+', help='输入文档或目录（目录会递归查找支持的格式）')
+    parser.add_argument('--output-dir', '-o', default='data/quizzes', help='输出目录')
+    parser.add_argument('--title', '-t', default='', help='测试标题，默认使用文件名')
+    parser.add_argument('--description', '-d', default='', help='测试描述')
+    parser.add_argument('--num-questions', '-n', type=int, default=25, help='每个文档生成的题目数量')
+    parser.add_argument('--time-limit', '-l', type=int, default=30, help='答题时间限制（分钟）')
+    parser.add_argument('--domain', help='知识领域 (medical/technical/business/legal)')
+    parser.add_argument('--format', choices=['json', 'jsonl'], default='json', help='输出格式')
+    parser.add_argument('--distractor-strategy', choices=distractor_strategy_names(), default='random',
+                        help='干扰项来源：random 随机抽取其他答案，tfidf 选取最相似的答案，'
+                             'legacy 数值改写加主题词相同的答案（早期糖尿病脚本）')
+    parser.add_argument('--seed', type=int, help='随机数种子，指定后结果可复现')
+    parser.add_argument('--workers', '-w', type=int, default=os.cpu_count() or 2,
+                        help='提取、解析、生成阶段的并行进程数')
+    parser.add_argument('--io-concurrency', type=int, default=8, help='同时读写的文件数')
+    parser.add_argument('--queue-size', type=int, default=4, help='阶段之间队列的容量（背压）')
+    parser.add_argument('--threads', action='store_true', help='CPU阶段使用线程池而不是进程池')
+    parser.add_argument('--sequential', action='store_true', help='不使用流水线，逐个文档顺序处理（对比用）')
+
+    args = parser.parse_args()
+
+    if args.workers <= 0 or args.io_concurrency <= 0 or args.queue_size <= 0:
+        print("错误：--workers、--io-concurrency 和 --queue-size 必须大于0")
+        sys.exit(1)
+
+    files = collect_inputs(args.inputs)
+    if not files:
+        print("错误：没有找到可处理的文档")
+        print(f"支持的格式: {', '.join(extractors.supported_extensions())}")
+        sys.exit(1)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    jobs = plan_jobs(files, args.output_dir, args.format, args.seed)
+
+    config = {
+        'title': args.title,
+        'description': args.description,
+        'num_questions': args.num_questions,
+        'time_limit': args.time_limit,
+        'domain': args.domain or '',
+        'distractor_strategy': args.distractor_strategy,
+    }
+
+    pipeline = QuizPipeline(config, args.format, args.workers, args.io_concurrency, args.queue_size,
+                            use_processes=not args.threads)
+    print(f"正在处理 {len(jobs)} 个文档 -> {args.output_dir}")
+    start = time.perf_counter()
+    try:
+        if args.sequential:
+            pipeline.run_sequential(jobs)
+        else:
+            asyncio.run(pipeline.run(jobs))
+    finally:
+        pipeline.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"\n✅ 完成 {len(pipeline.done)} 个文档，失败 {len(pipeline.failed)} 个，总用时 {elapsed:.2f} 秒")
+    print("各阶段累计耗时（含等待执行器的时间）：")
+    for stage in QuizPipeline.STAGES:
+        print(f"  {stage:<9} {pipeline.busy[stage]:8.2f} 秒")
+
+    if pipeline.failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
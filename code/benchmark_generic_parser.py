@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+通用格式解析器性能测试
+用知识库中的问答对合成几MB的"未知格式"文本（问号后直接接答案、问题夹在大段正文中），
+对比 parse_generic_format 与原先按问号整体切分的实现，并检查两者解析出的问答对完全相同。
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from typing import Callable, List
+
+from quiz_records import QAPair
+from quiz_core import (COLONS, QUESTION_MARK_RE, QUESTION_MARKS, detect_qa_format, parse_generic_format,
+                       parse_qa_content_universal)
+
+MARKER_RE = re.compile(f'^\\d+[、.]|答[{COLONS}]|[QA][{COLONS}]', re.IGNORECASE)
+
+
+def reference_parse_generic(content: str) -> List[QAPair]:
+    """原先的实现：整篇按问号切分，每段再整段 strip、split 两次，作为对照"""
+    qa_pairs = []
+    sections = QUESTION_MARK_RE.split(content)
+    for i in range(len(sections) - 1):
+        question = sections[i].strip().split('\n')[-1]
+        answer_section = sections[i + 1].strip()
+        answer = ""
+        for line in answer_section.split('\n'):
+            line = line.strip()
+            if line and not line.endswith(tuple(QUESTION_MARKS)):
+                answer += " " + line
+            else:
+                break
+        if len(question) > 3 and len(answer) > 10:
+            qa_pairs.append(QAPair(question + "？", answer.strip()))
+    return qa_pairs
+
+
+def build_document(qa_pairs: List[QAPair], target_mb: float, prose_lines: int, rng: random.Random) -> str:
+    """合成未知格式文本：每题"问题？答案"写在同一行，题与题之间插入若干行不含问号的正文"""
+    # 去掉问号、编号和"答："等标记，保证文本不会被识别为其他格式
+    answers = [MARKER_RE.sub('', QUESTION_MARK_RE.sub('。', pair.answer)) for pair in qa_pairs]
+    parts = []
+    size = 0
+    target = target_mb * 2**20
+    while size < target:
+        pair = rng.choice(qa_pairs)
+        question = MARKER_RE.sub('', QUESTION_MARK_RE.sub('，', pair.question.rstrip(QUESTION_MARKS)))
+        block = [f"{question}？{rng.choice(answers)}", ""]
+        block.extend(rng.choice(answers) for _ in range(prose_lines))
+        block.append("")
+        text = '\n'.join(block) + '\n'
+        parts.append(text)
+        size += len(text.encode('utf-8'))
+    return ''.join(parts)
+
+
+def best_time(func: Callable[[str], List[QAPair]], content: str, repeat: int):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(content)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='通用格式解析器性能测试')
+    parser.add_argument('source', nargs='?', default='data/extracted_content.txt', help='用于合成文本的知识库文本')
+    parser.add_argument('--size-mb', type=float, default=8, help='合成文本大小（MB）')
+    parser.add_argument('--repeat', type=int, default=3, help='每种实现运行次数，取最快一次')
+    parser.add_argument('--seed', type=int, default=0, help='随机数种子')
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.source):
+        print(f"错误：文件不存在 {args.source}")
+        sys.exit(1)
+
+    with open(args.source, 'r', encoding='utf-8') as f:
+        qa_pairs = parse_qa_content_universal(f.read())
+    if not qa_pairs:
+        print("错误：无法解析到有效的问答对")
+        sys.exit(1)
+
+    failed = False
+    # 没有正文时每段都很短；正文越长，原实现对每段整段 strip、split 的开销越大
+    for prose_lines in (0, 5, 50):
+        content = build_document(qa_pairs, args.size_mb, prose_lines, random.Random(args.seed))
+        size_mb = len(content.encode('utf-8')) / 2**20
+        print(f"\n合成文本 {size_mb:.1f} MB，题间正文 {prose_lines} 行，检测格式: {detect_qa_format(content)}")
+
+        old_time, expected = best_time(reference_parse_generic, content, args.repeat)
+        new_time, actual = best_time(parse_generic_format, content, args.repeat)
+        print(f"  原实现   {old_time:.3f} 秒（{size_mb / old_time:.0f} MB/秒）")
+        print(f"  单遍扫描 {new_time:.3f} 秒（{size_mb / new_time:.0f} MB/秒），快 {old_time / new_time:.1f} 倍")
+
+        if actual == expected:
+            print(f"  ✅ 结果一致：{len(actual)} 个问答对")
+        else:
+            print(f"  ❌ 结果不一致：原实现 {len(expected)} 个问答对，单遍扫描 {len(actual)} 个")
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+内存占用对比：dict 记录 vs __slots__ 记录
+用 tracemalloc 分别测量同一批问答对、题目在两种表示下额外占用的内存
+"""
+
+import argparse
+import random
+import tracemalloc
+from typing import Callable, List
+
+from quiz_records import QAPair, QuizQuestion
+
+GENERIC_OPTIONS = ["以上说法都不正确", "需要根据具体情况判断", "尚无明确规定", "因具体环境而异", "需要进一步确认"]
+
+
+def measure(build: Callable[[], list]) -> int:
+    """返回 build() 新分配并仍然存活的字节数"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='问答对与题目的内存占用对比')
+    parser.add_argument('--pairs', type=int, default=200000, help='问答对数量')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    # 文本在测量前生成，两种表示共享同一批字符串，只比较容器本身的开销
+    questions = [f"第{i}个问题是什么？" for i in range(args.pairs)]
+    answers = [f"第{i}个问题的答案，包含若干说明文字。" * 3 for i in range(args.pairs)]
+
+    dict_pairs = measure(lambda: [{"question": q, "answer": a} for q, a in zip(questions, answers)])
+    slot_pairs = measure(lambda: [QAPair(q, a) for q, a in zip(questions, answers)])
+
+    # 题目：干扰项大量来自其他答案的截断和通用选项，截断后的字符串每题都会新建一份
+    def option_lists() -> List[List[str]]:
+        result = []
+        for i in range(args.pairs):
+            result.append([answers[i], answers[rng.randrange(args.pairs)][:20] + "...",
+                           GENERIC_OPTIONS[i % 5], GENERIC_OPTIONS[(i + 1) % 5]])
+        return result
+
+    rng.seed(1)
+    dict_questions = measure(lambda: [
+        {"id": i, "question": questions[i], "options": options, "correct_answer": 0, "explanation": answers[i]}
+        for i, options in enumerate(option_lists())])
+    rng.seed(1)
+    slot_questions = measure(lambda: [
+        QuizQuestion.create(i, questions[i], options, 0, answers[i])
+        for i, options in enumerate(option_lists())])
+
+    n = args.pairs
+    print(f"=== {n} 个问答对 ===")
+    print(f"dict:    {dict_pairs / 2**20:8.1f} MB  ({dict_pairs / n:.0f} 字节/条)")
+    print(f"QAPair:  {slot_pairs / 2**20:8.1f} MB  ({slot_pairs / n:.0f} 字节/条)")
+    print(f"\n=== {n} 道题目 ===")
+    print(f"dict:          {dict_questions / 2**20:8.1f} MB  ({dict_questions / n:.0f} 字节/题)")
+    print(f"QuizQuestion:  {slot_questions / 2**20:8.1f} MB  ({slot_questions / n:.0f} 字节/题)")
+
+
+if __name__ == "__main__":
+    main()
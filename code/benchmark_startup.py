@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+命令行工具启动耗时检查
+在子进程中用 python -X importtime 导入各模块，统计总导入耗时，并确认没有提前加载重量级依赖；
+超出阈值或出现不该加载的依赖时以非零状态退出，可放在提交前或CI中防止启动变慢。
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 需要检查的模块（命令行入口）
+DEFAULT_MODULES = ['universal_quiz_generator', 'quiz_validator', 'update_website_questions']
+
+# 导入这些模块时不应加载的依赖，只在真正处理对应格式或功能时才导入
+HEAVY_MODULES = ('docx', 'lxml', 'numpy', 'scipy', 'PyPDF2')
+
+
+def measure_import(module: str) -> Tuple[int, Dict[str, int]]:
+    """在新进程中导入模块，返回 (该模块累计导入耗时微秒, {顶层包名: 累计耗时})"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=CODE_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"导入 {module} 失败：\n{result.stderr.strip().splitlines()[-1]}")
+
+    total = 0
+    packages: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        # 格式：import time:   self [us] | cumulative | imported package
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        parts = line[len('import time:'):].split('|')
+        try:
+            cumulative = int(parts[1])
+        except ValueError:
+            continue  # 表头
+        name = parts[2].strip()
+        root = name.split('.')[0]
+        packages[root] = max(packages.get(root, 0), cumulative)
+        if name == module:
+            total = cumulative
+    return total, packages
+
+
+def median_import(module: str, repeat: int) -> Tuple[int, Dict[str, int]]:
+    """多次测量取中位数，减少磁盘缓存等带来的波动"""
+    runs = [measure_import(module) for _ in range(repeat)]
+    runs.sort(key=lambda run: run[0])
+    return runs[len(runs) // 2]
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='检查命令行工具的启动（导入）耗时')
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES, help='要检查的模块名')
+    parser.add_argument('--max-ms', type=float, default=80.0, help='单个模块允许的最大导入耗时（毫秒）')
+    parser.add_argument('--repeat', type=int, default=5, help='每个模块测量次数，取中位数')
+    parser.add_argument('--top', type=int, default=5, help='显示耗时最多的前N个包')
+
+    args = parser.parse_args()
+
+    failures: List[str] = []
+    for module in args.modules:
+        try:
+            total, packages = median_import(module, args.repeat)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            failures.append(module)
+            continue
+
+        loaded_heavy = [name for name in HEAVY_MODULES if name in packages]
+        ok = total / 1000 <= args.max_ms and not loaded_heavy
+        print(f"{'✅' if ok else '❌'} {module}: {total / 1000:.1f} ms")
+
+        top = sorted(((cost, name) for name, cost in packages.items() if name != module), reverse=True)
+        for cost, name in top[:args.top]:
+            print(f"    {name:<28} {cost / 1000:7.1f} ms")
+
+        if loaded_heavy:
+            print(f"    启动时加载了重量级依赖: {', '.join(loaded_heavy)}")
+        if not ok:
+            failures.append(module)
+
+    if failures:
+        print(f"\n启动耗时检查未通过（阈值 {args.max_ms:.0f} ms）: {', '.join(failures)}")
+        sys.exit(1)
+    print(f"\n全部模块导入耗时均在 {args.max_ms:.0f} ms 以内")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+干扰项持久缓存
+为同一个答案选定的干扰项保存在 SQLite 中，按 (规范化答案的哈希, 领域, 词表版本) 查找。
+generate_enhanced_wrong_options 在做任何计算之前先查缓存：重新生成大题库时几乎不用计算，
+而且同一道题每次生成的干扰项都相同，按题目统计的难度、区分度等指标不会因为选项变化而失效。
+需要换一批干扰项时使用 refresh（命令行 --refresh-distractors）重新生成并覆盖。
+
+词表版本由替换词表、通用选项和干扰项策略计算得到，修改词表后旧条目自动失效。
+缓存条目数有上限，超出时按最近使用时间淘汰最久未用的条目（LRU）。
+命中和写入先记在内存中，攒够一批后在一个事务里写回，查询路径上不会每次都写数据库。
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from quiz_core.distractors import vocabulary_version
+
+DEFAULT_CACHE_PATH = os.path.join('data', 'distractor_cache.db')
+DEFAULT_MAX_ENTRIES = 200000
+# 内存中攒够这么多条命中或写入后写回数据库
+FLUSH_EVERY = 1000
+# 批量查询时每条 IN 查询携带的哈希数量
+LOOKUP_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS distractors (
+    answer_hash INTEGER NOT NULL,
+    domain      TEXT NOT NULL,
+    vocabulary  TEXT NOT NULL,
+    options     TEXT NOT NULL,
+    last_used   INTEGER NOT NULL,
+    PRIMARY KEY (answer_hash, domain, vocabulary)
+);
+CREATE INDEX IF NOT EXISTS distractors_last_used ON distractors(last_used);
+"""
+
+
+def answer_hash(answer: str) -> int:
+    """规范化答案（统一 Unicode 组合形式、合并空白）的64位有符号哈希，可直接存入 SQLite INTEGER"""
+    normalized = ' '.join(unicodedata.normalize('NFC', answer).split())
+    digest = hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+class DistractorCache:
+    """按答案缓存干扰项；可在多个线程中共用"""
+
+    def __init__(self, db_path: str = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 strategy: str = 'random', refresh: bool = False):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.vocabulary = vocabulary_version(strategy)
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._lock = threading.Lock()
+        # 尚未写回的条目，以及只需更新最近使用时间的条目：(答案哈希, 领域) -> ...
+        self._pending: Dict[Tuple[int, str], Tuple[str, ...]] = {}
+        self._touched: Dict[Tuple[int, str], int] = {}
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        # 最近使用时间用递增的计数代替时钟，同一秒内的先后也能区分
+        self._clock = self.conn.execute('SELECT MAX(last_used) FROM distractors').fetchone()[0] or 0
+
+    def get(self, answer: str, domain: str = '') -> Optional[Tuple[str, ...]]:
+        """取缓存的干扰项，没有（或 refresh 时）返回 None。
+        写法略有不同的两个答案共用同一条目，缓存的干扰项恰好是当前答案本身时也视为未命中"""
+        if self.refresh:
+            self.misses += 1
+            return None
+        key = (answer_hash(answer), domain)
+        with self._lock:
+            options = self._pending.get(key)
+            if options is None:
+                row = self.conn.execute(
+                    'SELECT options FROM distractors WHERE answer_hash = ? AND domain = ? AND vocabulary = ?',
+                    (key[0], domain, self.vocabulary)).fetchone()
+                options = tuple(json.loads(row[0])) if row else None
+            if options is None or answer in options:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._clock += 1
+            self._touched[key] = self._clock
+            self._maybe_flush()
+            return options
+
+    def get_many(self, answers: Sequence[str], domain: str = '') -> List[Optional[Tuple[str, ...]]]:
+        """批量查询，结果与逐个调用 get 相同，但每批哈希只需一次 IN 查询（用于整个题库预生成）"""
+        if self.refresh:
+            self.misses += len(answers)
+            return [None] * len(answers)
+        hashes = [answer_hash(answer) for answer in answers]
+        found: Dict[int, str] = {}
+        with self._lock:
+            self._flush()
+            unique = list(set(hashes))
+            for start in range(0, len(unique), LOOKUP_CHUNK):
+                chunk = unique[start:start + LOOKUP_CHUNK]
+                rows = self.conn.execute(
+                    f"SELECT answer_hash, options FROM distractors WHERE domain = ? AND vocabulary = ? "
+                    f"AND answer_hash IN ({', '.join('?' * len(chunk))})", [domain, self.vocabulary] + chunk)
+                found.update(rows)
+
+            results: List[Optional[Tuple[str, ...]]] = []
+            for answer, key_hash in zip(answers, hashes):
+                options = tuple(json.loads(found[key_hash])) if key_hash in found else None
+                if options is None or answer in options:
+                    self.misses += 1
+                    results.append(None)
+                    continue
+                self.hits += 1
+                self._clock += 1
+                self._touched[(key_hash, domain)] = self._clock
+                results.append(options)
+            self._maybe_flush()
+        return results
+
+    def put(self, answer: str, domain: str, options: Sequence[str]):
+        """记录为答案选定的干扰项，覆盖旧条目"""
+        key = (answer_hash(answer), domain)
+        with self._lock:
+            self._clock += 1
+            self._pending[key] = tuple(options)
+            self._touched[key] = self._clock
+            self._maybe_flush()
+
+    def _maybe_flush(self):
+        if len(self._touched) >= FLUSH_EVERY:
+            self._flush()
+
+    def flush(self):
+        """把内存中的条目写回数据库，并淘汰超出上限的最久未用条目"""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._touched:
+            return
+        inserts = [(key[0], key[1], self.vocabulary, json.dumps(options, ensure_ascii=False), self._touched[key])
+                   for key, options in self._pending.items()]
+        updates = [(clock, key[0], key[1], self.vocabulary)
+                   for key, clock in self._touched.items() if key not in self._pending]
+        with self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO distractors VALUES (?, ?, ?, ?, ?)', inserts)
+            self.conn.executemany(
+                'UPDATE distractors SET last_used = ? WHERE answer_hash = ? AND domain = ? AND vocabulary = ?',
+                updates)
+            if inserts:
+                excess = self.conn.execute('SELECT COUNT(*) FROM distractors').fetchone()[0] - self.max_entries
+                if excess > 0:
+                    self.conn.execute('DELETE FROM distractors WHERE rowid IN '
+                                      '(SELECT rowid FROM distractors ORDER BY last_used LIMIT ?)', (excess,))
+                    self.evicted += excess
+        self._pending.clear()
+        self._touched.clear()
+
+    def count(self) -> int:
+        with self._lock:
+            self._flush()
+            return self.conn.execute('SELECT COUNT(*) FROM distractors').fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+            self._touched.clear()
+            with self.conn:
+                self.conn.execute('DELETE FROM distractors')
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def __enter__(self) -> 'DistractorCache':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def run_benchmark(db_path: str, source: str, num_pairs: int, max_entries: int):
+    """合成题库，对比不用缓存、冷缓存和热缓存时整个题库生成干扰项的耗时，并检查热缓存结果与首次一致"""
+    from quiz_core.precompute import precompute_distractors
+    from quiz_records import QAPair
+
+    with open(source, 'r', encoding='utf-8') as f:
+        sentences = [line.strip() for line in f if len(line.strip()) > 10]
+    rng = random.Random(0)
+    qa_pairs = [QAPair(f"{rng.choice(sentences)[:30]}（{i}）？", f"{rng.choice(sentences)[:120]}（{i}）")
+                for i in range(num_pairs)]
+
+    for path in (db_path, db_path + '-wal', db_path + '-shm'):
+        if os.path.exists(path):
+            os.remove(path)
+
+    start = time.perf_counter()
+    precompute_distractors(qa_pairs, domain='medical')
+    print(f"不用缓存: {num_pairs} 个问答对，用时 {time.perf_counter() - start:.2f} 秒")
+
+    results = []
+    for label in ('冷缓存', '热缓存'):
+        with DistractorCache(db_path, max_entries) as cache:
+            start = time.perf_counter()
+            precompute_distractors(qa_pairs, domain='medical', seed=len(results) + 1, cache=cache)
+            cache.flush()
+            elapsed = time.perf_counter() - start
+            print(f"{label}: 用时 {elapsed:.2f} 秒，命中 {cache.hits}，未命中 {cache.misses}，"
+                  f"缓存 {cache.count()} 条")
+        results.append([qa.wrong_options for qa in qa_pairs])
+
+    # 第二次换了随机数种子，结果仍与第一次相同说明全部来自缓存
+    if num_pairs > max_entries:
+        print(f"缓存上限 {max_entries} 小于问答对数量，最久未用的条目已被淘汰")
+    elif results[0] == results[1]:
+        print("✅ 热缓存生成的干扰项与首次完全相同")
+    else:
+        print("❌ 热缓存生成的干扰项与首次不同")
+    print(f"缓存文件 {os.path.getsize(db_path) / 2**20:.1f} MB")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='干扰项持久缓存')
+    parser.add_argument('--db', default=DEFAULT_CACHE_PATH, help='缓存数据库路径')
+    parser.add_argument('--max-entries', type=int, default=DEFAULT_MAX_ENTRIES, help='缓存条目上限')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('stats', help='查看缓存条目数')
+    subparsers.add_parser('clear', help='清空缓存')
+
+    bench_parser = subparsers.add_parser('benchmark', help='在合成题库上对比有无缓存时的生成耗时')
+    bench_parser.add_argument('source', nargs='?', default='data/extracted_content.txt', help='用于合成问答对的文本')
+    bench_parser.add_argument('--pairs', type=int, default=50000, help='合成问答对数量')
+
+    args = parser.parse_args()
+
+    if args.command == 'benchmark':
+        if not os.path.exists(args.source):
+            print(f"错误：文件不存在 {args.source}")
+            return
+        run_benchmark(args.db, args.source, args.pairs, args.max_entries)
+        return
+
+    with DistractorCache(args.db, args.max_entries) as cache:
+        if args.command == 'clear':
+            cache.clear()
+            print(f"✅ 已清空缓存 {args.db}")
+        else:
+            print(f"缓存 {args.db}: {cache.count()} 条（上限 {args.max_entries}）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+答题记录导出
+从记录库（record_store.RecordStore）分块读取记录，边读边写，内存占用与记录总数无关：
+- XLSX：openpyxl 只写模式，行数据直接写入临时文件。"答题记录"表每条记录一行，
+  "答题明细"表每道题的作答一行，超过 Excel 单表行数上限时自动续写到"答题明细2"……
+- CSV：记录和明细分别写入 <输出>.csv 和 <输出>_answers.csv（带 BOM，Excel 可直接打开中文）
+
+管理后台在浏览器里导出时只能看到本机 localStorage 中的记录，记录多了还会卡住页面；
+记录收集服务（record_ingest_service.py）汇总的全部记录可以用本工具或服务的 GET /export 接口导出。
+"""
+
+import argparse
+import csv
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from record_store import RecordStore
+
+try:
+    import resource
+except ImportError:   # Windows
+    resource = None
+
+DEFAULT_DB_PATH = 'data/records/records.db'
+# Excel 单个工作表最多 1048576 行（含表头）
+MAX_SHEET_ROWS = 1048576
+
+SUMMARY_HEADERS = ('记录ID', '姓名', '手机号', '得分', '正确率(%)', '错题数', '答题用时', '开始时间', '结束时间',
+                   '提交时间', 'IP地址')
+DETAIL_HEADERS = ('记录ID', '姓名', '手机号', '题号', '题目ID', '题目', '用户答案', '正确答案', '是否正确')
+
+SUMMARY_WIDTHS = (38, 10, 15, 8, 10, 8, 12, 20, 20, 20, 16)
+DETAIL_WIDTHS = (38, 10, 15, 6, 18, 50, 30, 30, 10)
+
+CONTENT_TYPES = {
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+def format_timestamp(timestamp: Optional[float]) -> str:
+    if timestamp is None:
+        return ''
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))
+
+
+def summary_row(record: Dict[str, Any]) -> Tuple:
+    """一条记录在"答题记录"表中的一行"""
+    return (
+        record['recordId'],
+        record['name'],
+        record['phone'],
+        record['score'],
+        record['correctRate'],
+        record['wrongCount'],
+        record['timeUsed'],
+        record['startTime'],
+        record['endTime'],
+        format_timestamp(record['receivedAt']),
+        record['ipAddress'],
+    )
+
+
+def detail_rows(record: Dict[str, Any]) -> Iterator[Tuple]:
+    """一条记录在"答题明细"表中的各行，每道题一行"""
+    record_id, name, phone = record['recordId'], record['name'], record['phone']
+    for number, answer in enumerate(record['answers'], 1):
+        yield (
+            record_id,
+            name,
+            phone,
+            number,
+            answer.get('questionId'),
+            answer.get('question'),
+            answer.get('userAnswer'),
+            answer.get('correctAnswer'),
+            '是' if answer.get('isCorrect') else '否',
+        )
+
+
+def detail_path_for(output_path: str) -> str:
+    """CSV 格式下明细文件的路径"""
+    stem, ext = os.path.splitext(output_path)
+    return f"{stem}_answers{ext or '.csv'}"
+
+
+def export_csv(records: Iterable[Dict[str, Any]], summary_path: Optional[str],
+               detail_path: Optional[str]) -> Tuple[int, int]:
+    """写出记录表和明细表（路径为 None 的表不写），返回 (记录数, 明细行数)"""
+    files = []
+    try:
+        writers = []
+        for path, headers in ((summary_path, SUMMARY_HEADERS), (detail_path, DETAIL_HEADERS)):
+            if path is None:
+                writers.append(None)
+                continue
+            f = open(path, 'w', encoding='utf-8-sig', newline='')
+            files.append(f)
+            writer = csv.writer(f)
+            writer.writerow(headers)
+            writers.append(writer)
+        summary_writer, detail_writer = writers
+
+        record_count = answer_count = 0
+        for record in records:
+            record_count += 1
+            if summary_writer is not None:
+                summary_writer.writerow(summary_row(record))
+            if detail_writer is not None:
+                rows = list(detail_rows(record))
+                detail_writer.writerows(rows)
+                answer_count += len(rows)
+    finally:
+        for f in files:
+            f.close()
+    return record_count, answer_count
+
+
+def load_openpyxl():
+    """导入 openpyxl，未安装时给出提示并返回 None"""
+    try:
+        import openpyxl
+    except ImportError:
+        print("需要安装openpyxl库来导出Excel文件: pip install openpyxl")
+        return None
+    return openpyxl
+
+
+def export_xlsx(records: Iterable[Dict[str, Any]], output_path: str) -> Tuple[int, int]:
+    """以只写模式写出 XLSX，返回 (记录数, 明细行数)；未安装 openpyxl 时抛出 ImportError"""
+    from openpyxl import Workbook
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+    from openpyxl.utils import get_column_letter
+
+    def clean(row: Tuple) -> Tuple:
+        # 姓名等字段来自用户输入，XML 不允许的控制字符会导致写入失败
+        return tuple(ILLEGAL_CHARACTERS_RE.sub('', value) if isinstance(value, str) else value
+                     for value in row)
+
+    def new_sheet(title: str, headers: Tuple[str, ...], widths: Tuple[int, ...]):
+        sheet = workbook.create_sheet(title)
+        for index, width in enumerate(widths, 1):
+            sheet.column_dimensions[get_column_letter(index)].width = width
+        sheet.append(headers)
+        return sheet
+
+    workbook = Workbook(write_only=True)
+    summary = new_sheet('答题记录', SUMMARY_HEADERS, SUMMARY_WIDTHS)
+    detail_sheets = 1
+    detail = new_sheet('答题明细', DETAIL_HEADERS, DETAIL_WIDTHS)
+    detail_rows_in_sheet = 1
+
+    record_count = answer_count = 0
+    for record in records:
+        record_count += 1
+        summary.append(clean(summary_row(record)))
+        for row in detail_rows(record):
+            if detail_rows_in_sheet >= MAX_SHEET_ROWS:
+                detail_sheets += 1
+                detail = new_sheet(f'答题明细{detail_sheets}', DETAIL_HEADERS, DETAIL_WIDTHS)
+                detail_rows_in_sheet = 1
+            detail.append(clean(row))
+            detail_rows_in_sheet += 1
+            answer_count += 1
+
+    # 先写临时文件再改名，导出中途失败不会留下损坏的文件
+    tmp_path = output_path + '.tmp'
+    workbook.save(tmp_path)
+    os.replace(tmp_path, output_path)
+    return record_count, answer_count
+
+
+def export_store(db_path: str, output_path: str, fmt: str, chunk_size: int = 1000,
+                 table: Optional[str] = None) -> Tuple[int, int]:
+    """从记录库导出。CSV 默认同时写记录表和明细表，table 为 'records' 或 'answers' 时只写其中一个到 output_path"""
+    store = RecordStore(db_path)
+    try:
+        records = store.iter_records(chunk_size)
+        if fmt == 'xlsx':
+            return export_xlsx(records, output_path)
+        if table == 'records':
+            return export_csv(records, output_path, None)
+        if table == 'answers':
+            return export_csv(records, None, output_path)
+        return export_csv(records, output_path, detail_path_for(output_path))
+    finally:
+        store.close()
+
+
+def guess_format(output_path: str) -> str:
+    return 'csv' if output_path.lower().endswith('.csv') else 'xlsx'
+
+
+def max_rss_mb() -> Optional[float]:
+    """进程内存峰值（Linux 上 ru_maxrss 单位为KB）"""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage / 2**20 if sys.platform == 'darwin' else usage / 1024
+
+
+def make_synthetic_entries(count: int, answers_per_record: int, rng: random.Random,
+                           start: int = 0) -> Iterator[Dict[str, Any]]:
+    """生成性能测试用的记录日志条目（与 IngestService 写入的结构相同）"""
+    now = time.time()
+    for i in range(start, start + count):
+        answers = []
+        correct = 0
+        for n in range(answers_per_record):
+            is_correct = rng.random() < 0.7
+            correct += is_correct
+            answers.append({
+                'questionId': rng.getrandbits(52),
+                'question': f"第{n + 1}题：糖尿病患者日常饮食需要注意哪些方面？",
+                'userAnswer': rng.choice(('A', 'B', 'C', 'D')),
+                'correctAnswer': rng.choice(('A', 'B', 'C', 'D')),
+                'isCorrect': is_correct,
+            })
+        yield {
+            'record_id': f"bench-{i:08d}",
+            'received_at': now + i,
+            'record': {
+                'name': f"用户{i}",
+                'phone': f"138{i:08d}",
+                'score': correct,
+                'correctRate': round(correct * 100 / answers_per_record, 1),
+                'wrongCount': answers_per_record - correct,
+                'timeUsed': f"{rng.randint(5, 30)}分{rng.randint(0, 59)}秒",
+                'startTime': '2024-01-01 10:00:00',
+                'endTime': '2024-01-01 10:20:00',
+                'answers': answers,
+            },
+        }
+
+
+def run_benchmark(num_records: int, answers_per_record: int, chunk_size: int, keep_dir: Optional[str]):
+    work_dir = keep_dir or tempfile.mkdtemp(prefix='export-bench-')
+    os.makedirs(work_dir, exist_ok=True)
+    db_path = os.path.join(work_dir, 'records.db')
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    try:
+        store = RecordStore(db_path)
+        rng = random.Random(0)
+        batch = 1000
+        start = time.perf_counter()
+        for offset in range(0, num_records, batch):
+            store.insert_batch(list(make_synthetic_entries(min(batch, num_records - offset), answers_per_record,
+                                                           rng, offset)))
+        store.close()
+        print(f"生成测试记录库: {num_records} 条记录，每条 {answers_per_record} 题，"
+              f"用时 {time.perf_counter() - start:.1f} 秒")
+        baseline = max_rss_mb()
+
+        for fmt in ('csv', 'xlsx'):
+            if fmt == 'xlsx' and load_openpyxl() is None:
+                continue
+            output_path = os.path.join(work_dir, f'records.{fmt}')
+            start = time.perf_counter()
+            records, answers = export_store(db_path, output_path, fmt, chunk_size)
+            elapsed = time.perf_counter() - start
+            size = os.path.getsize(output_path)
+            if fmt == 'csv':
+                size += os.path.getsize(detail_path_for(output_path))
+            rss = max_rss_mb()
+            memory = f"，进程内存峰值 {rss:.0f} MB（导出前 {baseline:.0f} MB）" if rss is not None else ""
+            print(f"✅ {fmt.upper():<4} {records} 条记录 + {answers} 行明细，用时 {elapsed:.1f} 秒，"
+                  f"{records / elapsed:,.0f} 条记录/秒（{answers / elapsed:,.0f} 行明细/秒），"
+                  f"文件 {size / 2**20:.1f} MB{memory}")
+    finally:
+        if keep_dir is None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='答题记录导出：从记录库流式导出为 Excel 或 CSV')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = subparsers.add_parser('export', help='导出记录')
+    export_parser.add_argument('output', help='输出文件路径（.xlsx 或 .csv）')
+    export_parser.add_argument('--db', default=DEFAULT_DB_PATH, help='记录库路径')
+    export_parser.add_argument('--format', choices=['xlsx', 'csv'], help='输出格式，默认按扩展名判断')
+    export_parser.add_argument('--chunk-size', type=int, default=1000, help='每次从记录库读取的记录数')
+
+    bench_parser = subparsers.add_parser('benchmark', help='用合成记录测试导出速度')
+    bench_parser.add_argument('--records', type=int, default=100000, help='记录数量')
+    bench_parser.add_argument('--answers', type=int, default=25, help='每条记录的题目数')
+    bench_parser.add_argument('--chunk-size', type=int, default=1000, help='每次从记录库读取的记录数')
+    bench_parser.add_argument('--keep-dir', help='保留测试记录库和导出文件的目录')
+
+    args = parser.parse_args()
+
+    if args.chunk_size <= 0:
+        print("错误：--chunk-size 必须大于0")
+        sys.exit(1)
+
+    if args.command == 'benchmark':
+        run_benchmark(args.records, args.answers, args.chunk_size, args.keep_dir)
+        return
+
+    if not os.path.exists(args.db):
+        print(f"错误：记录库不存在 {args.db}")
+        sys.exit(1)
+
+    fmt = args.format or guess_format(args.output)
+    if fmt == 'xlsx' and load_openpyxl() is None:
+        sys.exit(1)
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    start = time.perf_counter()
+    records, answers = export_store(args.db, args.output, fmt, args.chunk_size)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ 已导出 {records} 条记录、{answers} 行答题明细到 {args.output}（用时 {elapsed:.1f} 秒）")
+    if fmt == 'csv':
+        print(f"   答题明细: {detail_path_for(args.output)}")
+
+
+if __name__ == "__main__":
+    main()
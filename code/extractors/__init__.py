@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+文档内容提取后端
+每种格式一个模块，只有真正处理该格式的文件时才导入（python-docx、PyPDF2 等依赖较重），
+命令行工具启动时不再为用不到的格式付出导入开销。
+提取结果统一经过 text_normalizer 规范化（空白、零宽字符和换行），解析器只需处理 LF 换行。
+"""
+
+import importlib
+import os
+from typing import Dict
+
+from text_normalizer import normalize_text
+
+# 扩展名 -> 后端模块，模块需提供 extract(file_path) -> str 和 extract_bytes(data) -> str
+BACKENDS: Dict[str, str] = {
+    '.docx': 'extractors.docx_backend',
+    '.pdf': 'extractors.pdf_backend',
+    '.txt': 'extractors.txt_backend',
+}
+
+
+def register_backend(file_ext: str, module_name: str):
+    """登记（或替换）某个扩展名的提取后端，模块在第一次用到时才导入"""
+    BACKENDS[file_ext.lower()] = module_name
+
+
+def supported_extensions():
+    """支持的文件扩展名"""
+    return sorted(BACKENDS)
+
+
+def get_backend(file_ext: str):
+    """按扩展名加载后端模块，不支持的格式返回 None"""
+    module_name = BACKENDS.get(file_ext.lower())
+    if module_name is None:
+        return None
+    return importlib.import_module(module_name)
+
+
+def extract_content(file_path: str) -> str:
+    """根据文件扩展名选择提取方法，不支持的格式返回空字符串"""
+    file_ext = os.path.splitext(file_path)[1].lower()
+    backend = get_backend(file_ext)
+
+    if backend is None:
+        print(f"不支持的文件格式: {file_ext}")
+        print(f"支持的格式: {', '.join(supported_extensions())}")
+        return ""
+
+    return normalize_text(backend.extract(file_path))
+
+
+def extract_bytes(data: bytes, file_ext: str) -> str:
+    """从已读入内存的文件内容提取，file_ext 为原文件扩展名"""
+    backend = get_backend(file_ext)
+    if backend is None:
+        print(f"不支持的文件格式: {file_ext}")
+        return ""
+    return normalize_text(backend.extract_bytes(data))
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""Word文档 (.docx) 提取后端，依赖 python-docx"""
+
+import io
+from typing import BinaryIO, Union
+
+from docx import Document
+
+
+def extract(file_path: str) -> str:
+    """提取Word文档内容"""
+    return _extract_from(file_path)
+
+
+def extract_bytes(data: bytes) -> str:
+    """从已读入内存的文件内容提取（流水线中读文件与解析分开进行）"""
+    return _extract_from(io.BytesIO(data))
+
+
+def _extract_from(source: Union[str, BinaryIO]) -> str:
+    try:
+        doc = Document(source)
+        content = ""
+        for paragraph in doc.paragraphs:
+            if paragraph.text.strip():
+                content += paragraph.text.strip() + "\n"
+        
+        # 提取表格内容
+        for table in doc.tables:
+            for row in table.rows:
+                row_text = []
+                for cell in row.cells:
+                    if cell.text.strip():
+                        row_text.append(cell.text.strip())
+                if row_text:
+                    content += " | ".join(row_text) + "\n"
+        
+        return content
+    except Exception as e:
+        print(f"提取Word文档内容时出错: {e}")
+        return ""
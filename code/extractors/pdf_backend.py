@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""PDF文档 (.pdf) 提取后端，依赖 PyPDF2（可选）"""
+
+import io
+from typing import BinaryIO
+
+
+def extract(file_path: str) -> str:
+    """提取PDF文档内容"""
+    try:
+        with open(file_path, 'rb') as file:
+            return _extract_from(file)
+    except OSError as e:
+        print(f"提取PDF文档内容时出错: {e}")
+        return ""
+
+
+def extract_bytes(data: bytes) -> str:
+    """从已读入内存的文件内容提取"""
+    return _extract_from(io.BytesIO(data))
+
+
+def _extract_from(file: BinaryIO) -> str:
+    try:
+        import PyPDF2
+        content = ""
+        pdf_reader = PyPDF2.PdfReader(file)
+        for page in pdf_reader.pages:
+            content += page.extract_text() + "\n"
+        return content
+    except ImportError:
+        print("需要安装PyPDF2库来处理PDF文件: pip install PyPDF2")
+        return ""
+    except Exception as e:
+        print(f"提取PDF文档内容时出错: {e}")
+        return ""
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""纯文本 (.txt) 提取后端，只依赖标准库"""
+
+
+def extract(file_path: str) -> str:
+    """提取文本文件内容"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except Exception as e:
+        print(f"提取文本文件内容时出错: {e}")
+        return ""
+
+
+def extract_bytes(data: bytes) -> str:
+    """从已读入内存的文件内容提取"""
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError as e:
+        print(f"提取文本文件内容时出错: {e}")
+        return ""
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+飞书多维表格批量转发工具
+使用 batch_create 接口一次提交多条记录，遇到限流或网络错误时指数退避重试
+字段格式与前端 utils/feishu.ts 的 formatRecordForFeishu 保持一致
+"""
+
+import json
+import os
+import random
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Dict, List, Optional
+
+FEISHU_API_BASE = 'https://open.feishu.cn/open-apis'
+
+# 飞书 batch_create 单次最多 500 条
+MAX_BATCH_SIZE = 500
+
+# 飞书限流错误码
+RATE_LIMIT_CODES = {99991400, 1254290}
+
+
+class FeishuError(Exception):
+    """飞书接口返回错误；retryable 表示可以稍后重试"""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def get_feishu_config() -> Optional[Dict[str, str]]:
+    """从环境变量读取飞书配置（与前端 .env 同名），不完整时返回 None"""
+    config = {
+        'app_id': os.environ.get('FEISHU_APP_ID') or os.environ.get('VITE_FEISHU_APP_ID', ''),
+        'app_secret': os.environ.get('FEISHU_APP_SECRET') or os.environ.get('VITE_FEISHU_APP_SECRET', ''),
+        'table_app_token': os.environ.get('FEISHU_TABLE_APP_TOKEN') or os.environ.get('VITE_FEISHU_TABLE_APP_TOKEN', ''),
+        'table_id': os.environ.get('FEISHU_TABLE_ID') or os.environ.get('VITE_FEISHU_TABLE_ID', ''),
+    }
+    if not all(config.values()):
+        return None
+    return config
+
+
+def format_record_for_feishu(record: Dict[str, Any]) -> Dict[str, Any]:
+    """将答题记录转换为飞书表格字段格式"""
+    return {
+        '姓名': record['name'],
+        '手机号': record['phone'],
+        '得分': record['score'],
+        '正确率': record['correctRate'],
+        '错题数': record['wrongCount'],
+        '答题用时': record.get('timeUsed') or '',
+        '答题时间': record.get('endTime') or '',
+        '查看答案': '是' if record.get('hasViewedAnswers') else '否',
+    }
+
+
+class FeishuForwarder:
+    """同步的批量转发器，由调用方放到后台线程中运行"""
+
+    def __init__(self, config: Dict[str, str], max_retries: int = 5,
+                 base_delay: float = 1.0, max_delay: float = 60.0, timeout: float = 15.0):
+        self.config = config
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self._token = None
+        self._token_expire = 0.0
+
+    def _post(self, url: str, payload: Dict[str, Any], token: Optional[str] = None) -> Dict[str, Any]:
+        headers = {'Content-Type': 'application/json; charset=utf-8'}
+        if token:
+            headers['Authorization'] = f"Bearer {token}"
+        request = urllib.request.Request(url, data=json.dumps(payload).encode('utf-8'),
+                                         headers=headers, method='POST')
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                data = json.loads(response.read().decode('utf-8'))
+        except urllib.error.HTTPError as e:
+            # 429 和 5xx 可以重试，其余 4xx 是请求本身有问题
+            raise FeishuError(f"HTTP错误: {e.code}", retryable=e.code == 429 or e.code >= 500)
+        except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+            raise FeishuError(f"网络错误: {e}")
+
+        if data.get('code') != 0:
+            code = data.get('code')
+            if code in RATE_LIMIT_CODES:
+                raise FeishuError(f"触发限流: {data.get('msg')}")
+            raise FeishuError(f"飞书接口错误: {data.get('msg')} (错误码: {code})", retryable=False)
+        return data
+
+    def _get_token(self) -> str:
+        """获取访问令牌，提前5分钟刷新"""
+        if self._token and time.time() < self._token_expire:
+            return self._token
+
+        data = self._post(f"{FEISHU_API_BASE}/auth/v3/tenant_access_token/internal", {
+            'app_id': self.config['app_id'],
+            'app_secret': self.config['app_secret'],
+        })
+        self._token = data['tenant_access_token']
+        self._token_expire = time.time() + data.get('expire', 7200) - 300
+        return self._token
+
+    def _upload_once(self, records: List[Dict[str, Any]]):
+        url = (f"{FEISHU_API_BASE}/bitable/v1/apps/{self.config['table_app_token']}"
+               f"/tables/{self.config['table_id']}/records/batch_create")
+        payload = {'records': [{'fields': format_record_for_feishu(r)} for r in records]}
+        self._post(url, payload, self._get_token())
+
+    def upload_batch(self, records: List[Dict[str, Any]]):
+        """上传一批记录（不超过 MAX_BATCH_SIZE），可重试的错误按指数退避加随机抖动重试"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._upload_once(records)
+                return
+            except FeishuError as e:
+                if not e.retryable or attempt == self.max_retries:
+                    raise
+                delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+                delay *= random.uniform(0.5, 1.0)
+                print(f"飞书上传失败，{delay:.1f} 秒后重试 ({attempt + 1}/{self.max_retries}): {e}")
+                # 令牌可能已失效，重试时重新获取
+                self._token = None
+                time.sleep(delay)
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文档增量解析
+把提取出的文本按问答边界切成块，与上一次保存的块按哈希比对，只重新解析有变化的块；
+未变化的问答对沿用上次的题目ID，修改了答案但题干不变的问答对也保留原ID，新增的问答对按题干分配ID（见 question_ids.py）。
+
+切块的边界只取解析器在该处状态完全重置的位置，逐块解析的结果与整篇解析一致（可用 --verify 检查）。
+块状态保存在 <输出文件>.blocks.json 中。
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+from collections import defaultdict, deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from question_ids import QuestionIndex
+from quiz_records import QAPair
+from quiz_core import (ANSWER_PREFIXES, COLONS, CONTINUATION_PREFIXES, NUMBERED_RE, QUESTION_MARK_RE, QUESTION_MARKS,
+                       detect_qa_format, extract_content, get_parser)
+
+STATE_VERSION = 2
+
+# 以下规则与 quiz_core.parsers 中对应解析器保持一致（标点的全角和半角写法视为相同）
+SKIP_WORDS = ('目录', '索引', '第一章', '第二章')
+QA_MARKER_RE = re.compile(f'[QA][{COLONS}]', re.IGNORECASE)
+
+def chinese_boundaries(lines: List[str]) -> List[int]:
+    """中文"答："格式：前一个非空行是单行答案、后一个非空行是答案的问题行
+    （答案有续行时，续行会被解析器当作问题向后查找答案，因此不在那里切分）"""
+    stripped = [line.strip() for line in lines]
+    nonblank = [i for i, line in enumerate(stripped) if line]
+    boundaries = []
+    for k in range(1, len(nonblank) - 1):
+        line = stripped[nonblank[k]]
+        if (stripped[nonblank[k - 1]].startswith(ANSWER_PREFIXES)
+                and stripped[nonblank[k + 1]].startswith(ANSWER_PREFIXES)
+                and line.endswith(tuple(QUESTION_MARKS))
+                and not line.startswith(ANSWER_PREFIXES + CONTINUATION_PREFIXES)
+                and not NUMBERED_RE.match(line)
+                and not any(word in line for word in SKIP_WORDS)):
+            boundaries.append(nonblank[k])
+    return boundaries
+
+
+def numbered_boundaries(lines: List[str]) -> List[int]:
+    """数字编号格式：每个编号行都会结束上一题的答案"""
+    return [i for i, line in enumerate(lines) if i and NUMBERED_RE.match(line.strip())]
+
+
+def qa_boundaries(lines: List[str]) -> List[int]:
+    """Q: A: 格式：行首的 Q:，且前面的标记依次是内容非空的 Q: 和 A:，后面紧接的标记是 A:"""
+    content = '\n'.join(lines)
+    markers = [(m.start(), m.end(), m.group()[0].upper()) for m in QA_MARKER_RE.finditer(content)]
+    position = {}
+    offset = 0
+    for i, line in enumerate(lines):
+        position[offset + len(line) - len(line.lstrip())] = i
+        offset += len(line) + 1
+
+    boundaries = []
+    for k in range(2, len(markers) - 1):
+        start, _, kind = markers[k]
+        if kind != 'Q' or start not in position:
+            continue
+        (_, q_end, q_kind), (a_start, a_end, a_kind) = markers[k - 2], markers[k - 1]
+        if (q_kind == 'Q' and a_kind == 'A' and markers[k + 1][2] == 'A'
+                and content[q_end:a_start].strip() and content[a_end:start].strip()):
+            boundaries.append(position[start])
+    return boundaries
+
+
+def generic_boundaries(lines: List[str]) -> List[int]:
+    """通用格式：顶格且问号前有内容的行，上一行为空行，且与上一个问号之间有答案内容"""
+    boundaries = []
+    has_answer = False   # 上一个问号之后是否出现过非空内容
+    for i, line in enumerate(lines):
+        parts = QUESTION_MARK_RE.split(line)
+        if (len(parts) > 1 and i and has_answer and not lines[i - 1].strip()
+                and line[:1].strip() and parts[0].strip()):
+            boundaries.append(i)
+        if len(parts) > 1:
+            has_answer = bool(parts[-1].strip())
+        elif line.strip():
+            has_answer = True
+    return boundaries
+
+
+BOUNDARY_FINDERS: Dict[str, Callable[[List[str]], List[int]]] = {
+    'chinese_format': chinese_boundaries,
+    'qa_format': qa_boundaries,
+    'numbered_format': numbered_boundaries,
+}
+
+
+def split_blocks(content: str, format_type: str) -> List[str]:
+    """按格式对应的边界把文本切成块"""
+    lines = content.split('\n')
+    finder = BOUNDARY_FINDERS.get(format_type, generic_boundaries)
+    starts = [0] + finder(lines) + [len(lines)]
+    return ['\n'.join(lines[a:b]) for a, b in zip(starts, starts[1:])]
+
+
+def block_hash(block: str) -> str:
+    return hashlib.sha1(block.encode('utf-8')).hexdigest()
+
+
+class IncrementalParser:
+    """保存上次的块及其问答对，只解析变化的块"""
+
+    def __init__(self, state_path: str):
+        self.state_path = state_path
+        self.format: Optional[str] = None
+        self.blocks: List[Tuple[str, List[QAPair]]] = []
+        self.stats = {'blocks': 0, 'reused': 0, 'parsed': 0, 'new_ids': 0}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"警告：无法读取块状态文件 {self.state_path}: {e}，将完整解析")
+            return
+        if state.get('version') != STATE_VERSION:
+            return
+        self.format = state['format']
+        self.blocks = [(block['hash'], [QAPair.from_dict(pair) for pair in block['pairs']])
+                       for block in state['blocks']]
+
+    def save(self):
+        state = {
+            'version': STATE_VERSION,
+            'format': self.format,
+            'blocks': [{'hash': digest, 'pairs': [pair.to_dict() for pair in pairs]}
+                       for digest, pairs in self.blocks],
+        }
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.state_path)
+
+    def parse(self, content: str) -> List[QAPair]:
+        """解析文本，返回带稳定ID的问答对"""
+        format_type = detect_qa_format(content)
+        parser = get_parser(format_type)
+
+        # 格式变了时块划分不同，全部重新解析，但仍按题干沿用旧ID
+        old_by_hash: Dict[str, Deque[List[QAPair]]] = defaultdict(deque)
+        if format_type == self.format:
+            for digest, pairs in self.blocks:
+                old_by_hash[digest].append(pairs)
+
+        new_blocks: List[Tuple[str, Optional[List[QAPair]]]] = []
+        changed: List[Tuple[int, str]] = []
+        for block in split_blocks(content, format_type):
+            digest = block_hash(block)
+            if old_by_hash.get(digest):
+                new_blocks.append((digest, old_by_hash[digest].popleft()))
+            else:
+                changed.append((len(new_blocks), block))
+                new_blocks.append((digest, None))
+
+        # 未被复用的旧问答对按题干索引，修改答案的问答对保留原ID
+        old_ids: Dict[str, Deque[int]] = defaultdict(deque)
+        for queue in old_by_hash.values():
+            for pairs in queue:
+                for pair in pairs:
+                    old_ids[pair.question].append(pair.id)
+        if format_type != self.format:
+            for _, pairs in self.blocks:
+                for pair in pairs:
+                    old_ids[pair.question].append(pair.id)
+
+        # 复用块中的ID先登记，新解析的问答对再分配，保证不与之冲突
+        index_by_id = QuestionIndex.build(pair for _, pairs in new_blocks if pairs is not None for pair in pairs)
+        for index, block in changed:
+            pairs = parser(block)
+            for pair in pairs:
+                if old_ids.get(pair.question):
+                    pair.id = old_ids[pair.question].popleft()
+                    index_by_id.add(pair)
+                else:
+                    index_by_id.assign(pair)
+                    self.stats['new_ids'] += 1
+            new_blocks[index] = (new_blocks[index][0], pairs)
+
+        self.format = format_type
+        self.blocks = new_blocks
+        self.stats['blocks'] = len(new_blocks)
+        self.stats['parsed'] = len(changed)
+        self.stats['reused'] = len(new_blocks) - len(changed)
+        return [pair for _, pairs in self.blocks for pair in pairs]
+
+
+def state_path_for(output_path: str) -> str:
+    """题目文件对应的块状态文件路径"""
+    return output_path + '.blocks.json'
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='文档增量解析：只重新解析变化的部分，并保持题目ID稳定')
+    parser.add_argument('input_file', help='输入文档路径')
+    parser.add_argument('--state', '-s', required=True, help='块状态文件路径')
+    parser.add_argument('--verify', action='store_true', help='同时完整解析一次，检查结果是否一致')
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input_file):
+        print(f"错误：文件不存在 {args.input_file}")
+        return
+
+    content = extract_content(args.input_file)
+    if not content:
+        print("无法提取文档内容")
+        return
+
+    incremental = IncrementalParser(args.state)
+    start = time.perf_counter()
+    qa_pairs = incremental.parse(content)
+    elapsed = time.perf_counter() - start
+    incremental.save()
+
+    stats = incremental.stats
+    print(f"✅ {len(qa_pairs)} 个问答对，{stats['blocks']} 块中复用 {stats['reused']} 块、"
+          f"重新解析 {stats['parsed']} 块，新分配 {stats['new_ids']} 个ID（用时 {elapsed * 1000:.1f} 毫秒）")
+
+    if args.verify:
+        full = get_parser(incremental.format)(content)
+        if full == qa_pairs:
+            print("✅ 与完整解析结果一致")
+        else:
+            print(f"❌ 与完整解析结果不一致：完整解析 {len(full)} 个问答对")
+
+
+if __name__ == "__main__":
+    main()
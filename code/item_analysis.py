@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+题目质量分析工具（项目分析）
+把答题记录整理成 考生 × 题目 的 NumPy 矩阵，向量化计算：
+- 难度（p值，答对比例）
+- 区分度（点二列相关、高低分组区分度指数）
+- 各选项选择率及干扰项有效性
+结果写回题库JSON每道题的 "stats" 字段，便于找出无效的干扰项
+"""
+
+import argparse
+import json
+import os
+from array import array
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+
+from record_store import RecordStore
+
+# 选择矩阵中的特殊取值
+NOT_PRESENTED = -2  # 该考生的试卷中没有这道题
+OMITTED = -1        # 未作答，或答案不在选项中
+
+# 高低分组各取的考生比例（经典项目分析取 27%）
+GROUP_RATIO = 0.27
+
+
+class ResponseMatrix:
+    """列式存储的作答数据"""
+
+    def __init__(self, choices: np.ndarray, keys: np.ndarray, num_options: np.ndarray):
+        self.choices = choices          # (考生, 题目) 所选选项下标
+        self.keys = keys                # (题目,) 正确选项下标
+        self.num_options = num_options  # (题目,) 每题选项数
+
+    @property
+    def presented(self) -> np.ndarray:
+        return self.choices != NOT_PRESENTED
+
+    @property
+    def scores(self) -> np.ndarray:
+        """答对为1，答错、未答或未出现为0"""
+        return (self.choices == self.keys[np.newaxis, :]).astype(np.float32)
+
+
+def load_records(db_path: str = None, records_path: str = None) -> Iterable[Dict[str, Any]]:
+    """从SQLite记录库或JSON数组文件读取 QuizRecord"""
+    if db_path:
+        store = RecordStore(db_path)
+        try:
+            yield from store.iter_records()
+        finally:
+            store.close()
+    if records_path:
+        with open(records_path, 'r', encoding='utf-8') as f:
+            yield from json.load(f)
+
+
+def build_response_matrix(questions: List[Dict[str, Any]], records: Iterable[Dict[str, Any]]) -> ResponseMatrix:
+    """按题目ID（旧记录没有 questionId 时按题目文本）和选项文本把记录映射到矩阵坐标，一次性填充"""
+    id_index = {q['id']: j for j, q in enumerate(questions)}
+    question_index = {q['question']: j for j, q in enumerate(questions)}
+    option_index = [{option: k for k, option in enumerate(q['options'])} for q in questions]
+
+    # 先收集坐标三元组，最后一次性写入矩阵
+    rows, cols, picks = array('i'), array('i'), array('i')
+    num_candidates = 0
+    for record in records:
+        matched = False
+        for answer in record.get('answers', []):
+            j = id_index.get(answer.get('questionId'))
+            if j is None:
+                j = question_index.get(answer.get('question'))
+            if j is None:
+                continue
+            rows.append(num_candidates)
+            cols.append(j)
+            picks.append(option_index[j].get(answer.get('userAnswer'), OMITTED))
+            matched = True
+        if matched:
+            num_candidates += 1
+
+    choices = np.full((num_candidates, len(questions)), NOT_PRESENTED, dtype=np.int16)
+    choices[np.frombuffer(rows, dtype=np.int32), np.frombuffer(cols, dtype=np.int32)] = \
+        np.frombuffer(picks, dtype=np.int32)
+
+    keys = np.array([q['correct_answer'] for q in questions], dtype=np.int16)
+    num_options = np.array([len(q['options']) for q in questions], dtype=np.int16)
+    return ResponseMatrix(choices, keys, num_options)
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """分母为0的位置返回 NaN"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1), np.nan)
+
+
+def analyze_items(matrix: ResponseMatrix) -> Dict[str, np.ndarray]:
+    """向量化计算全部题目的统计量"""
+    presented = matrix.presented.astype(np.float32)
+    scores = matrix.scores * presented
+    attempts = presented.sum(axis=0, dtype=np.float64)
+
+    # 难度：答对比例
+    p_values = _safe_divide(scores.sum(axis=0, dtype=np.float64), attempts)
+
+    # 考生能力用其试卷上的正确率表示（各考生题目数可能不同）
+    answered = presented.sum(axis=1, dtype=np.float64)
+    ability = _safe_divide(scores.sum(axis=1, dtype=np.float64), answered)
+
+    # 点二列相关：题目得分与去掉本题后的剩余得分之间的相关（校正后）
+    rest = (scores.sum(axis=1)[:, np.newaxis] - scores) * presented
+    mean_item = p_values
+    mean_rest = _safe_divide(rest.sum(axis=0), attempts)
+    dev_item = (scores - mean_item) * presented
+    dev_rest = (rest - mean_rest) * presented
+    covariance = (dev_item * dev_rest).sum(axis=0)
+    spread = np.sqrt((dev_item ** 2).sum(axis=0) * (dev_rest ** 2).sum(axis=0))
+    point_biserial = _safe_divide(covariance, spread)
+
+    # 高低分组区分度指数：高分组答对率 - 低分组答对率
+    order = np.argsort(ability, kind='stable')
+    group_size = max(1, int(round(len(order) * GROUP_RATIO)))
+    lower, upper = order[:group_size], order[-group_size:]
+    discrimination = (_safe_divide(scores[upper].sum(axis=0), presented[upper].sum(axis=0)) -
+                      _safe_divide(scores[lower].sum(axis=0), presented[lower].sum(axis=0)))
+
+    # 选项选择率，以及选择该选项的考生的平均正确率
+    # 按选项逐个比较，避免生成 选项×考生×题目 的三维数组
+    max_options = int(matrix.num_options.max()) if matrix.num_options.size else 0
+    option_counts = np.zeros((max_options, matrix.choices.shape[1]))
+    option_ability_sum = np.zeros_like(option_counts)
+    for k in range(max_options):
+        picked = (matrix.choices == k).astype(np.float32)
+        option_counts[k] = picked.sum(axis=0, dtype=np.float64)
+        option_ability_sum[k] = ability.astype(np.float32) @ picked
+    option_rates = _safe_divide(option_counts, attempts[np.newaxis, :])
+    option_ability = _safe_divide(option_ability_sum, option_counts)
+
+    return {
+        'attempts': attempts,
+        'p_values': p_values,
+        'point_biserial': point_biserial,
+        'discrimination': discrimination,
+        'option_rates': option_rates,      # (选项, 题目)
+        'option_ability': option_ability,  # (选项, 题目)
+    }
+
+
+def _round(value: float, digits: int = 4):
+    """NaN 写成 null"""
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+def write_stats(questions: List[Dict[str, Any]], matrix: ResponseMatrix, stats: Dict[str, np.ndarray],
+                min_pick_rate: float = 0.05):
+    """把统计结果写回每道题的 stats 字段"""
+    for j, question in enumerate(questions):
+        n_options = int(matrix.num_options[j])
+        key = int(matrix.keys[j])
+        rates = stats['option_rates'][:n_options, j]
+        abilities = stats['option_ability'][:n_options, j]
+        attempts = int(stats['attempts'][j])
+
+        nonfunctional, misleading = [], []
+        if attempts:
+            for k in range(n_options):
+                if k == key:
+                    continue
+                # 几乎没人选的干扰项不起作用
+                if rates[k] < min_pick_rate:
+                    nonfunctional.append(k)
+                # 高水平考生比答对者更倾向选择的干扰项可能有歧义
+                elif not np.isnan(abilities[k]) and not np.isnan(abilities[key]) and abilities[k] > abilities[key]:
+                    misleading.append(k)
+
+        question['stats'] = {
+            'attempts': attempts,
+            'p_value': _round(stats['p_values'][j]),
+            'point_biserial': _round(stats['point_biserial'][j]),
+            'discrimination': _round(stats['discrimination'][j]),
+            'option_pick_rates': [_round(rate) for rate in rates],
+            'nonfunctional_distractors': nonfunctional,
+            'misleading_distractors': misleading,
+        }
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='答题记录题目质量分析工具')
+    parser.add_argument('bank', help='题库JSON文件路径')
+    parser.add_argument('--db', help='答题记录库路径（record_ingest_service 生成的 records.db）')
+    parser.add_argument('--records', help='答题记录JSON数组文件路径')
+    parser.add_argument('--output', '-o', help='输出题库路径，默认覆盖输入文件')
+    parser.add_argument('--min-pick-rate', type=float, default=0.05, help='低于该选择率的干扰项视为无效')
+
+    args = parser.parse_args()
+
+    if not args.db and not args.records:
+        print("错误：需要通过 --db 或 --records 指定答题记录")
+        return
+
+    for path in (args.bank, args.db, args.records):
+        if path and not os.path.exists(path):
+            print(f"错误：文件不存在 {path}")
+            return
+
+    with open(args.bank, 'r', encoding='utf-8') as f:
+        bank = json.load(f)
+    questions = bank['questions']
+
+    print("正在加载答题记录...")
+    matrix = build_response_matrix(questions, load_records(args.db, args.records))
+    num_candidates = matrix.choices.shape[0]
+    if num_candidates == 0:
+        print("错误：没有与题库匹配的答题记录")
+        return
+    print(f"已加载 {num_candidates} 份作答，{len(questions)} 道题目")
+
+    stats = analyze_items(matrix)
+    write_stats(questions, matrix, stats, args.min_pick_rate)
+
+    output = args.output or args.bank
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(bank, f, ensure_ascii=False, indent=2)
+    print(f"✅ 统计结果已写入：{output}")
+
+    # 列出需要修改的干扰项
+    flagged = [(number, q) for number, q in enumerate(questions, 1)
+               if q['stats']['nonfunctional_distractors'] or q['stats']['misleading_distractors']]
+    print(f"\n=== 需要关注的干扰项（{len(flagged)} 道题） ===")
+    for number, q in flagged[:10]:
+        s = q['stats']
+        print(f"\n第 {number} 题（ID {q['id']}）: {q['question']}  (p={s['p_value']}, r={s['point_biserial']})")
+        for k in s['nonfunctional_distractors']:
+            print(f"  {chr(65 + k)}. 无效（选择率 {s['option_pick_rates'][k]}）: {q['options'][k][:40]}")
+        for k in s['misleading_distractors']:
+            print(f"  {chr(65 + k)}. 可能有歧义（高分考生多选）: {q['options'][k][:40]}")
+
+
+if __name__ == "__main__":
+    main()
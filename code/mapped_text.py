@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+内存映射的大文本文件
+合并后的语料导出成 .txt 可能有几个GB，整个读入再 split('\n') 需要两倍于文件大小的内存。
+MappedText 用 mmap 映射文件，按约 1MB 的块（在换行处切分）解码并规范化，
+对外表现为只读的行序列：解析器可以按下标访问、向后查看，内存中只缓存最近用到的几个块。
+
+建立索引时只在字节层面数换行（C 速度），每个块只记录起止偏移和首行行号，占用的内存与文件大小基本无关。
+按行切分的结果与 normalize_text(整个文件).split('\n') 完全一致（可用 main 中的检查验证）。
+"""
+
+import argparse
+import mmap
+import os
+import time
+import tracemalloc
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Iterator, List, Tuple
+
+from text_normalizer import normalize_text
+
+BLOCK_SIZE = 1 << 20
+CACHE_BLOCKS = 4
+
+
+class MappedText(Sequence):
+    """按需解码的行序列，文件内容须为 UTF-8；解码失败时在访问到该块时抛出 UnicodeDecodeError"""
+
+    def __init__(self, path: str, block_size: int = BLOCK_SIZE):
+        self.path = path
+        self._file = open(path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        # 空文件不能映射
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b''
+        self._blocks: List[Tuple[int, int]] = []
+        self._first_lines: List[int] = []
+        self._len = self._build_index(block_size)
+        self._cache: 'OrderedDict[int, List[str]]' = OrderedDict()
+        # 最近访问的块，顺序访问时不必每次二分查找
+        self._current: Tuple[int, int, List[str]] = (0, 0, [])
+
+    def _build_index(self, block_size: int) -> int:
+        """把文件切成以换行结尾的块，返回总行数"""
+        data, size = self._data, self.size
+        pos = line = 0
+        while True:
+            end = data.find(b'\n', pos + block_size) if pos + block_size < size else -1
+            end = size if end < 0 else end + 1
+            self._blocks.append((pos, end))
+            self._first_lines.append(line)
+            # 规范化会把 CRLF 和单独的 CR 都变成换行，块不会在 CRLF 中间切开
+            raw = data[pos:end]
+            line += raw.count(b'\n') + raw.count(b'\r') - raw.count(b'\r\n')
+            pos = end
+            if pos >= size:
+                break
+        # 最后一个换行之后还有一行（可能为空），与 str.split 一致
+        return line + 1
+
+    def _decode(self, k: int) -> str:
+        start, end = self._blocks[k]
+        return normalize_text(self._data[start:end].decode('utf-8'))
+
+    def _block_lines(self, k: int) -> List[str]:
+        lines = self._cache.get(k)
+        if lines is not None:
+            self._cache.move_to_end(k)
+            return lines
+        lines = self._decode(k).split('\n')
+        if k + 1 < len(self._blocks):
+            lines.pop()   # 块以换行结尾，去掉切分出的空串
+        self._cache[k] = lines
+        if len(self._cache) > CACHE_BLOCKS:
+            self._cache.popitem(last=False)
+        return lines
+
+    def iter_chunks(self) -> Iterator[str]:
+        """依次返回各块规范化后的文本，除最后一块外都以换行结尾，拼接起来就是整个文件"""
+        for k in range(len(self._blocks)):
+            yield self._decode(k)
+
+    def __iter__(self) -> Iterator[str]:
+        # 顺序遍历不经过缓存
+        for k in range(len(self._blocks)):
+            lines = self._decode(k).split('\n')
+            if k + 1 < len(self._blocks):
+                lines.pop()
+            yield from lines
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._len))]
+        if index < 0:
+            index += self._len
+        first, stop, lines = self._current
+        if first <= index < stop:
+            return lines[index - first]
+        if not 0 <= index < self._len:
+            raise IndexError('line index out of range')
+        k = bisect_right(self._first_lines, index) - 1
+        lines = self._block_lines(k)
+        first = self._first_lines[k]
+        self._current = (first, first + len(lines), lines)
+        return lines[index - first]
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def __enter__(self) -> 'MappedText':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def main():
+    """主函数：检查与整读整切的结果一致，并对比两种方式解析时的内存峰值"""
+    from quiz_core import parse_qa_content_universal
+
+    parser = argparse.ArgumentParser(description='内存映射读取大文本文件：一致性与内存占用检查')
+    parser.add_argument('input_file', nargs='?', default='data/extracted_content.txt', help='文本文件')
+    parser.add_argument('--block-size', type=int, default=BLOCK_SIZE, help='解码块大小（字节）')
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input_file):
+        print(f"错误：文件不存在 {args.input_file}")
+        return
+
+    with open(args.input_file, 'r', encoding='utf-8', newline='') as f:
+        expected_lines = normalize_text(f.read()).split('\n')
+    with MappedText(args.input_file, args.block_size) as text:
+        if list(text) == expected_lines and [text[i] for i in range(len(text))] == expected_lines:
+            print(f"✅ 按行切分一致：{len(text)} 行，{len(text._blocks)} 块")
+        else:
+            print("❌ 按行切分与整读整切的结果不一致")
+    del expected_lines
+
+    size_mb = os.path.getsize(args.input_file) / 2**20
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    with open(args.input_file, 'r', encoding='utf-8', newline='') as f:
+        expected = parse_qa_content_universal(normalize_text(f.read()))
+    elapsed = time.perf_counter() - start
+    # 解析完成后仍在占用的内存就是问答对本身，两种方式相同
+    result, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"整个读入: {len(expected)} 个问答对，用时 {elapsed:.2f} 秒，内存峰值 {peak / 2**20:.1f} MB"
+          f"（文件 {size_mb:.1f} MB，其中解析结果 {result / 2**20:.1f} MB）")
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    with MappedText(args.input_file, args.block_size) as text:
+        actual = parse_qa_content_universal(text)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"内存映射: {len(actual)} 个问答对，用时 {elapsed:.2f} 秒，内存峰值 {peak / 2**20:.1f} MB"
+          f"（除解析结果外 {(peak - result) / 2**20:.1f} MB）")
+
+    if actual == expected:
+        print("✅ 解析结果一致")
+    else:
+        print("❌ 解析结果不一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+题库干扰项预生成工具
+解析文档后用进程池为每个问答对生成干扰项，写入题库文件（*.bank.jsonl）。
+题库文件可以直接作为 universal_quiz_generator.py 的输入或加载到 quiz_service.py，组卷时只需查表。
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from quiz_core import distractor_strategy_names, extract_content, parse_qa_content_universal
+from quiz_core.precompute import BANK_SUFFIX, CHUNK_SIZE, precompute_distractors, save_bank
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='为整个题库预先生成干扰项')
+    parser.add_argument('input_file', help='输入文档路径')
+    parser.add_argument('--output', '-o', help=f'题库文件路径，默认为 data/<文档名>{BANK_SUFFIX}')
+    parser.add_argument('--domain', help='知识领域 (medical/technical/business/legal)')
+    parser.add_argument('--distractor-strategy', choices=distractor_strategy_names(), default='random',
+                        help='干扰项来源：random 随机抽取其他答案，tfidf 选取最相似的答案，'
+                             'legacy 数值改写加主题词相同的答案（早期糖尿病脚本）')
+    parser.add_argument('--seed', type=int, default=0, help='随机数种子，同一种子生成的干扰项相同')
+    parser.add_argument('--workers', '-w', type=int, default=os.cpu_count() or 2, help='并行进程数')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='每个任务处理的问答对数量')
+    parser.add_argument('--distractor-cache', metavar='DB',
+                        help='干扰项持久缓存（见 distractor_cache.py）：已缓存的答案直接沿用，只为其余问答对生成')
+    parser.add_argument('--distractor-cache-size', type=int, default=200000, help='干扰项缓存条目上限')
+    parser.add_argument('--refresh-distractors', action='store_true',
+                        help='忽略缓存中已有的干扰项，重新生成并覆盖')
+    parser.add_argument('--compare', action='store_true', help='再用单进程生成一遍，对比耗时并检查结果一致')
+
+    args = parser.parse_args()
+
+    if args.workers <= 0 or args.chunk_size <= 0:
+        print("错误：--workers 和 --chunk-size 必须大于0")
+        sys.exit(1)
+
+    if args.compare and args.distractor_cache:
+        print("错误：--compare 对比的是生成结果，不能与 --distractor-cache 同时使用")
+        sys.exit(1)
+
+    if not os.path.exists(args.input_file):
+        print(f"错误：文件不存在 {args.input_file}")
+        sys.exit(1)
+
+    content = extract_content(args.input_file)
+    if not content:
+        print("无法提取文档内容")
+        sys.exit(1)
+
+    qa_pairs = parse_qa_content_universal(content)
+    del content
+    if not qa_pairs:
+        print("错误：无法解析到有效的问答对")
+        sys.exit(1)
+
+    output = args.output or os.path.join('data', os.path.splitext(os.path.basename(args.input_file))[0] + BANK_SUFFIX)
+    options = {'domain': args.domain or '', 'strategy': args.distractor_strategy, 'seed': args.seed,
+               'chunk_size': args.chunk_size}
+
+    cache = None
+    if args.distractor_cache:
+        from distractor_cache import DistractorCache
+        cache = DistractorCache(args.distractor_cache, args.distractor_cache_size, args.distractor_strategy,
+                                args.refresh_distractors)
+
+    print(f"正在为 {len(qa_pairs)} 个问答对生成干扰项（{args.workers} 个进程）...")
+    start = time.perf_counter()
+    try:
+        generated = precompute_distractors(qa_pairs, workers=args.workers, cache=cache, **options)
+    finally:
+        if cache is not None:
+            cache.close()
+    elapsed = time.perf_counter() - start
+    print(f"⏱️ 用时 {elapsed:.2f} 秒（{len(qa_pairs) / elapsed:.0f} 个/秒）")
+    if cache is not None:
+        print(f"干扰项缓存: 命中 {len(qa_pairs) - generated}，新生成 {generated}")
+
+    if args.compare:
+        parallel = [qa.wrong_options for qa in qa_pairs]
+        start = time.perf_counter()
+        precompute_distractors(qa_pairs, workers=1, **options)
+        serial_elapsed = time.perf_counter() - start
+        print(f"   单进程 用时 {serial_elapsed:.2f} 秒，并行快 {serial_elapsed / elapsed:.1f} 倍")
+        if parallel != [qa.wrong_options for qa in qa_pairs]:
+            print("❌ 并行与单进程生成的干扰项不一致")
+            sys.exit(1)
+        print("✅ 并行与单进程结果一致")
+
+    save_bank(output, qa_pairs, {'source': os.path.abspath(args.input_file), 'domain': options['domain'],
+                                 'distractor_strategy': args.distractor_strategy, 'seed': args.seed})
+    print(f"✅ 题库已保存到: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+稳定的题目ID
+题目ID由规范化后的题干哈希得到，与抽题顺序、文档中的位置无关：同一道题每次生成、每份试卷中ID都相同，
+缓存、答题记录和统计分析都可以直接按ID关联。
+
+ID取哈希的低52位，在前端 JavaScript 的 number 中可以精确表示；
+极少数哈希冲突（或题干重复）时依次加盐重新计算，直到得到未被占用的ID。
+"""
+
+import hashlib
+import unicodedata
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from quiz_records import QAPair
+
+# JavaScript 能精确表示的整数上限为 2^53 - 1
+ID_BITS = 52
+ID_MASK = (1 << ID_BITS) - 1
+MAX_PROBES = 64
+
+
+def normalize_question(text: str) -> str:
+    """规范化题干：全角转半角、统一大小写，去掉空白和标点，只保留文字和数字"""
+    text = unicodedata.normalize('NFKC', text).lower()
+    return ''.join(ch for ch in text if ch.isalnum())
+
+
+def content_id(normalized: str, probe: int = 0) -> int:
+    """规范化题干的52位哈希，probe > 0 时加盐用于处理冲突"""
+    key = normalized if probe == 0 else f"{probe}\x00{normalized}"
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+    return (int.from_bytes(digest, 'big') & ID_MASK) or 1
+
+
+class QuestionIndex:
+    """题库内 ID -> 问答对 的索引，负责分配不冲突的稳定ID"""
+
+    def __init__(self):
+        self._by_id: Dict[int, QAPair] = {}
+        self.collisions = 0
+
+    @classmethod
+    def build(cls, qa_pairs: Iterable[QAPair]) -> 'QuestionIndex':
+        """为整个题库建立索引；已有ID的问答对保留原ID，其余按题干分配"""
+        index = cls()
+        pending = []
+        for pair in qa_pairs:
+            if pair.id is not None and pair.id not in index._by_id:
+                index._by_id[pair.id] = pair
+            else:
+                pending.append(pair)
+        for pair in pending:
+            index.assign(pair)
+        return index
+
+    def add(self, pair: QAPair) -> int:
+        """登记问答对：已有ID且未被占用时沿用，否则重新分配"""
+        if pair.id is not None and pair.id not in self._by_id:
+            self._by_id[pair.id] = pair
+            return pair.id
+        return self.assign(pair)
+
+    def assign(self, pair: QAPair) -> int:
+        """按题干计算ID；被其他问答对占用时加盐重试"""
+        normalized = normalize_question(pair.question)
+        for probe in range(MAX_PROBES):
+            question_id = content_id(normalized, probe)
+            if question_id not in self._by_id:
+                if probe:
+                    self.collisions += 1
+                pair.id = question_id
+                self._by_id[question_id] = pair
+                return question_id
+        raise RuntimeError(f"无法为题目分配ID（重复次数过多）: {pair.question[:30]}")
+
+    def get(self, question_id: int) -> Optional[QAPair]:
+        return self._by_id.get(question_id)
+
+    def __contains__(self, question_id: int) -> bool:
+        return question_id in self._by_id
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[QAPair]:
+        return iter(self._by_id.values())
+
+
+def ensure_question_ids(qa_pairs: List[QAPair]) -> Optional[QuestionIndex]:
+    """给尚未分配ID的问答对分配稳定ID；全部已有ID时直接返回 None"""
+    if all(pair.id is not None for pair in qa_pairs):
+        return None
+    return QuestionIndex.build(qa_pairs)
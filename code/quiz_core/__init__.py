@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""
+题目生成核心
+文档提取、问答解析和干扰项生成各有一个登记表，命令行脚本、批量流水线、增量解析和HTTP服务都通过这里调用同一份实现：
+- 提取后端：extractors.BACKENDS（扩展名 -> 按需导入的模块），用 register_backend 添加
+- 解析器：PARSERS（格式名 -> 解析函数）和 FORMAT_PATTERNS（格式检测规则），用 register_parser 添加
+- 干扰项策略：DISTRACTOR_STRATEGIES（策略名 -> 候选答案来源），用 register_distractor_strategy 添加
+整个题库的干扰项可以用 quiz_core.precompute 并行预生成并写入题库文件，组卷时直接查表。
+导入本包不会加载 python-docx、numpy 等依赖，用到时才导入。
+"""
+
+from extractors import BACKENDS, extract_bytes, extract_content, register_backend, supported_extensions
+from quiz_core.distractors import (DISTRACTOR_STRATEGIES, build_distractor_ranker, distractor_strategy_names,
+                                   generate_enhanced_wrong_options, prepare_distractor_source,
+                                   register_distractor_strategy)
+from quiz_core.generator import SIMILARITY_BATCH_SIZE, generate_quiz_questions, iter_quiz_questions, quiz_to_dict
+from quiz_core.parsers import (ANSWER_PREFIXES, COLONS, CONTINUATION_PREFIXES, FORMAT_PATTERNS, NUMBERED_RE, PARSERS,
+                               QUESTION_MARK_RE, QUESTION_MARKS, TextSource, detect_qa_format, get_parser,
+                               parse_chinese_format, parse_generic_format, parse_numbered_format,
+                               parse_qa_content_universal, parse_qa_format, register_parser)
+
+__all__ = [
+    # 提取后端
+    'BACKENDS', 'extract_bytes', 'extract_content', 'register_backend', 'supported_extensions',
+    # 干扰项策略
+    'DISTRACTOR_STRATEGIES', 'build_distractor_ranker', 'distractor_strategy_names', 'generate_enhanced_wrong_options',
+    'prepare_distractor_source', 'register_distractor_strategy',
+    # 组卷
+    'SIMILARITY_BATCH_SIZE', 'generate_quiz_questions', 'iter_quiz_questions', 'quiz_to_dict',
+    # 解析器
+    'ANSWER_PREFIXES', 'COLONS', 'CONTINUATION_PREFIXES', 'FORMAT_PATTERNS', 'NUMBERED_RE', 'PARSERS',
+    'QUESTION_MARK_RE', 'QUESTION_MARKS', 'TextSource', 'detect_qa_format', 'get_parser', 'parse_chinese_format',
+    'parse_generic_format', 'parse_numbered_format', 'parse_qa_content_universal', 'parse_qa_format',
+    'register_parser',
+]
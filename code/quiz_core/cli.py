@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+题目生成命令行
+universal_quiz_generator.py 以及两个早期的糖尿病题库脚本都调用这里的 main，
+早期脚本只是预先填好了输入文档、标题等参数。
+"""
+
+import argparse
+import os
+from typing import List, Optional
+
+import extractors
+from mapped_text import MappedText
+from quiz_core.distractors import distractor_strategy_names
+from quiz_core.generator import iter_quiz_questions
+from quiz_core.parsers import PARSERS, parse_qa_content_universal
+from quiz_core.precompute import is_bank_file, load_bank
+from quiz_stream import QuizStreamWriter
+
+DEFAULT_OUTPUT = os.path.join('data', 'quiz_questions.json')
+
+def build_arg_parser(tool_name: str = '通用知识库题目生成工具', has_default_input: bool = False) -> argparse.ArgumentParser:
+    """命令行参数；has_default_input 为真时输入文档可以省略（由调用方用 set_defaults 给出）"""
+    parser = argparse.ArgumentParser(description=tool_name)
+    parser.add_argument('input_file', nargs='?' if has_default_input else None,
+                        help='输入文档路径，也可以是预生成了干扰项的题库文件（*.bank.jsonl，见 precompute_distractors.py）')
+    parser.add_argument('--output', '-o', default=DEFAULT_OUTPUT, help='输出JSON文件路径')
+    parser.add_argument('--title', '-t', default='知识测试', help='测试标题')
+    parser.add_argument('--description', '-d', default='', help='测试描述')
+    parser.add_argument('--num-questions', '-n', type=int, default=25, help='生成题目数量')
+    parser.add_argument('--time-limit', '-l', type=int, default=30, help='答题时间限制（分钟）')
+    parser.add_argument('--domain', help='知识领域 (medical/technical/business/legal)')
+    parser.add_argument('--format', choices=['json', 'jsonl'],
+                        help='输出格式，默认根据扩展名判断（.jsonl 为每行一道题）')
+    parser.add_argument('--parser', choices=['auto'] + sorted(PARSERS), default='auto',
+                        help='问答解析器，默认自动检测文档格式（增量解析时总是自动检测）')
+    parser.add_argument('--distractor-strategy', choices=distractor_strategy_names(), default='random',
+                        help='干扰项来源：random 随机抽取其他答案，tfidf 选取最相似的答案，'
+                             'legacy 数值改写加主题词相同的答案（早期糖尿病脚本）')
+    parser.add_argument('--incremental', action='store_true',
+                        help='增量解析：只重新解析相对上次有变化的部分，并保持题目ID稳定（状态保存在 <输出文件>.blocks.json）')
+    parser.add_argument('--distractor-cache', metavar='DB',
+                        help='干扰项持久缓存（见 distractor_cache.py）：同一答案沿用上次选定的干扰项')
+    parser.add_argument('--distractor-cache-size', type=int, default=200000, help='干扰项缓存条目上限')
+    parser.add_argument('--refresh-distractors', action='store_true',
+                        help='忽略缓存中已有的干扰项，重新生成并覆盖')
+    parser.add_argument('--search-index', metavar='DB',
+                        help='同时把解析出的问答对增量更新到全文检索索引（见 search_index.py）')
+    parser.add_argument('--dump-text', metavar='PATH',
+                        help='同时把规范化后的文档文本保存到文件，便于检查解析结果或作为性能测试的输入')
+    return parser
+
+def _parse_document(args, format_type: Optional[str]):
+    """提取并解析输入文档，返回 (问答对, 增量解析器)；提取失败时问答对为 None"""
+    print(f"正在处理文档: {args.input_file}")
+    
+    # 纯文本文件直接内存映射、按块解码，不把整个文件读入内存（增量解析需要整段文本计算块哈希）
+    use_mapped = os.path.splitext(args.input_file)[1].lower() == '.txt' and not args.incremental
+    if use_mapped:
+        content = MappedText(args.input_file)
+        if not content.size:
+            content.close()
+            print("无法提取文档内容")
+            return None, None
+        print(f"文档大小: {content.size} 字节")
+    else:
+        content = extractors.extract_content(args.input_file)
+        
+        if not content:
+            print("无法提取文档内容")
+            return None, None
+        
+        print(f"文档内容长度: {len(content)} 字符")
+    
+    if args.dump_text:
+        os.makedirs(os.path.dirname(args.dump_text) or '.', exist_ok=True)
+        try:
+            with open(args.dump_text, 'w', encoding='utf-8') as f:
+                for chunk in (content.iter_chunks() if use_mapped else (content,)):
+                    f.write(chunk)
+        except UnicodeDecodeError as e:
+            content.close()
+            print(f"提取文本文件内容时出错: {e}")
+            return None, None
+        print(f"文档文本已保存到 {args.dump_text}")
+    
+    # 解析问答内容
+    print("正在解析问答内容...")
+    incremental = None
+    if args.incremental:
+        from incremental_parse import IncrementalParser, state_path_for
+        incremental = IncrementalParser(state_path_for(args.output))
+        qa_pairs = incremental.parse(content)
+        stats = incremental.stats
+        print(f"增量解析：{stats['blocks']} 块中复用 {stats['reused']} 块，重新解析 {stats['parsed']} 块")
+    elif use_mapped:
+        try:
+            qa_pairs = parse_qa_content_universal(content, format_type)
+        except UnicodeDecodeError as e:
+            print(f"提取文本文件内容时出错: {e}")
+            return None, None
+        finally:
+            content.close()
+    else:
+        qa_pairs = parse_qa_content_universal(content, format_type)
+    return qa_pairs, incremental
+
+def main(argv: Optional[List[str]] = None, tool_name: str = '通用知识库题目生成工具', **defaults):
+    """主函数；defaults 覆盖参数默认值（如 input_file、title、domain）"""
+    parser = build_arg_parser(tool_name, 'input_file' in defaults)
+    parser.set_defaults(**defaults)
+    args = parser.parse_args(argv)
+    format_type = None if args.parser == 'auto' else args.parser
+    
+    # 检查文件是否存在
+    if not os.path.exists(args.input_file):
+        print(f"错误：文件不存在 {args.input_file}")
+        return
+    
+    incremental = None
+    if is_bank_file(args.input_file):
+        if args.incremental:
+            print("错误：题库文件不需要解析，不能使用 --incremental")
+            return
+        try:
+            bank_meta, qa_pairs = load_bank(args.input_file)
+        except (ValueError, KeyError) as e:
+            print(f"读取题库文件时出错: {e}")
+            return
+        print(f"已加载题库文件: {args.input_file}（{bank_meta.get('source', '')}）")
+    else:
+        qa_pairs, incremental = _parse_document(args, format_type)
+        if qa_pairs is None:
+            return
+    
+    if not qa_pairs:
+        print("错误：无法解析到有效的问答对")
+        print("请检查文档格式是否符合要求")
+        return
+    
+    print(f"成功解析得到 {len(qa_pairs)} 个问答对")
+    
+    # 显示前几个问答对预览
+    print("\n=== 解析结果预览 ===")
+    for i, qa in enumerate(qa_pairs[:3]):
+        print(f"\n问答对 {i+1}:")
+        print(f"问题: {qa.question}")
+        print(f"答案: {qa.answer[:100]}...")
+    
+    # 生成题目配置
+    config = {
+        'title': args.title,
+        'description': args.description or f"基于{os.path.basename(args.input_file)}生成的测试题目",
+        'num_questions': args.num_questions,
+        'time_limit': args.time_limit,
+        'domain': args.domain or '',
+        'distractor_strategy': args.distractor_strategy
+    }
+    
+    # 生成题目，边生成边写入文件，内存中只保留预览用的前几道题
+    print(f"\n正在生成 {min(args.num_questions, len(qa_pairs))} 道题目...")
+    
+    # 确保输出目录存在
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    
+    cache = None
+    if args.distractor_cache:
+        from distractor_cache import DistractorCache
+        cache = DistractorCache(args.distractor_cache, args.distractor_cache_size, args.distractor_strategy,
+                                args.refresh_distractors)
+    
+    preview = []
+    try:
+        with QuizStreamWriter(args.output, config['title'], config['description'], config['time_limit'],
+                              args.format) as writer:
+            for question in iter_quiz_questions(qa_pairs, config, cache=cache):
+                question_data = question.to_dict()
+                writer.write_question(question_data)
+                if len(preview) < 3:
+                    preview.append(question_data)
+    finally:
+        if cache is not None:
+            cache.close()
+    
+    print(f"题目生成完成！已保存到: {args.output}")
+    if cache is not None:
+        print(f"干扰项缓存: 命中 {cache.hits}，新生成 {cache.misses}")
+    
+    # 题目文件写入成功后再更新块状态，中途失败时下次仍与上一次成功的结果比对
+    if incremental is not None:
+        incremental.save()
+    
+    if args.search_index:
+        from search_index import SearchIndex
+        index = SearchIndex(args.search_index)
+        try:
+            stats = index.upsert_source(os.path.abspath(args.input_file), qa_pairs)
+        finally:
+            index.close()
+        print(f"检索索引已更新: 新增 {stats['added']}，更新 {stats['updated']}，删除 {stats['removed']}")
+    
+    # 显示题目预览
+    print("\n=== 题目预览 ===")
+    for number, q in enumerate(preview, 1):
+        print(f"\n第 {number} 题: {q['question']}")
+        for j, option in enumerate(q['options']):
+            marker = "★" if j == q['correct_answer'] else " "
+            print(f"  {chr(65+j)}. {option[:60]}{'...' if len(option) > 60 else ''} {marker}")
+    
+    print(f"\n✅ 成功生成 {writer.count} 道题目")
+    print(f"📝 题目标题: {config['title']}")
+    print(f"⏱️ 答题时限: {config['time_limit']} 分钟")
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+干扰项生成
+generate_enhanced_wrong_options 为一道题生成3个错误选项：先做关键词反义替换，再从其他答案中取候选，最后用通用选项补足。
+候选答案从哪里来由干扰项策略决定，策略登记在 DISTRACTOR_STRATEGIES 中：
+工厂函数接收题库问答对（和可选的预建索引），返回提供 similar_answers(indices, k) 的检索器，返回 None 时随机抽取。
+"""
+
+import hashlib
+import json
+import random
+import re
+from typing import Callable, Dict, List, Optional
+
+from quiz_records import QAPair, intern_text
+
+# 通用的关键词反义替换
+COMMON_REPLACEMENTS: Dict[str, str] = {
+    '是': '不是', '不是': '是', '正确': '错误', '错误': '正确',
+    '应该': '不应该', '必须': '可以', '需要': '不需要', '能够': '不能',
+    '重要': '不重要', '有效': '无效', '安全': '危险', '合适': '不合适'
+}
+
+# 领域特定的关键词替换
+DOMAIN_REPLACEMENTS: Dict[str, Dict[str, str]] = {
+    'medical': {
+        '增加': '减少', '减少': '增加', '升高': '降低', '降低': '升高',
+        '不能': '可以', '禁止': '允许', '预防': '治疗', '急性': '慢性',
+        '正常': '异常', '健康': '患病', '有效': '无效', '安全': '危险'
+    },
+    'technical': {
+        '启动': '关闭', '开启': '禁用', '增加': '减少', '提高': '降低',
+        '安装': '卸载', '连接': '断开', '启用': '禁用', '创建': '删除'
+    },
+    'business': {
+        '增长': '下降', '盈利': '亏损', '成功': '失败', '优化': '恶化',
+        '提升': '降低', '扩大': '缩小', '加强': '削弱', '改善': '恶化'
+    },
+    'legal': {
+        '合法': '非法', '允许': '禁止', '有效': '无效', '责任': '免责',
+        '义务': '权利', '强制': '自愿', '公开': '保密', '正当': '不当'
+    }
+}
+
+# 候选不足3个时补充的通用错误选项
+GENERIC_OPTIONS = [
+    "以上说法都不正确",
+    "需要根据具体情况判断",
+    "尚无明确规定",
+    "因具体环境而异",
+    "需要进一步确认"
+]
+
+# 通用替换加上领域特定替换，按领域预先合并好
+_REPLACEMENTS: Dict[str, Dict[str, str]] = {domain: {**COMMON_REPLACEMENTS, **table}
+                                            for domain, table in DOMAIN_REPLACEMENTS.items()}
+
+def vocabulary_version(strategy: str = 'random') -> str:
+    """替换词表、通用选项和干扰项策略的指纹；其中任何一项改变，之前缓存的干扰项都不再适用"""
+    vocabulary = [COMMON_REPLACEMENTS, DOMAIN_REPLACEMENTS, GENERIC_OPTIONS, strategy]
+    data = json.dumps(vocabulary, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+def generate_enhanced_wrong_options(correct_answer: str, question: str, all_answers: List[str], domain: str = "",
+                                    rng: Optional[random.Random] = None,
+                                    similar_answers: Optional[List[str]] = None, cache=None) -> List[str]:
+    """生成增强的错误选项（rng 为空时使用全局随机数；similar_answers 为按相似度排好序的候选答案）。
+    传入 cache（distractor_cache.DistractorCache）时先查缓存，命中则直接返回上次为同一答案选定的干扰项"""
+    if cache is not None:
+        cached = cache.get(correct_answer, domain)
+        if cached is not None:
+            return list(cached)
+    
+    rng = rng or random
+    wrong_options = []
+    
+    # 使用通用替换加上领域特定替换
+    replacements = _REPLACEMENTS.get(domain, COMMON_REPLACEMENTS)
+    
+    # 生成基于关键词替换的错误选项
+    for original, replacement in replacements.items():
+        if original in correct_answer and len(wrong_options) < 2:
+            wrong_option = correct_answer.replace(original, replacement)
+            if wrong_option != correct_answer and wrong_option not in wrong_options:
+                wrong_options.append(wrong_option)
+    
+    # 从其他答案中选择相似选项：有相似度排序时按顺序取，否则随机抽取
+    if len(wrong_options) < 3:
+        if similar_answers is not None:
+            candidates = [ans for ans in similar_answers if ans != correct_answer and len(ans) < 200]
+        else:
+            suitable_answers = [ans for ans in all_answers if ans != correct_answer and len(ans) < 200]
+            candidates = rng.sample(suitable_answers, min(10, len(suitable_answers)))
+        for other_answer in candidates:
+            if len(wrong_options) < 3:
+                if len(other_answer) > 80:
+                    # 截断产生的新字符串驻留后，多道题引用同一干扰项时只保存一份
+                    wrong_option = intern_text(other_answer[:80] + "...")
+                else:
+                    wrong_option = other_answer
+                
+                if wrong_option not in wrong_options:
+                    wrong_options.append(wrong_option)
+    
+    # 添加通用错误选项
+    for option in GENERIC_OPTIONS:
+        if len(wrong_options) < 3 and option not in wrong_options:
+            wrong_options.append(option)
+    
+    wrong_options = wrong_options[:3]
+    if cache is not None:
+        cache.put(correct_answer, domain, wrong_options)
+    return wrong_options
+
+def build_distractor_ranker(qa_pairs: List[QAPair]):
+    """为题库全部答案建立TF-IDF相似度索引（需要 numpy 和 scipy）"""
+    try:
+        from tfidf_distractors import DistractorRanker
+    except ImportError:
+        print("需要安装numpy和scipy库来使用相似度干扰项: pip install numpy scipy")
+        return None
+    return DistractorRanker([qa.answer for qa in qa_pairs])
+
+# 策略名 -> 工厂函数 factory(qa_pairs, ranker) -> 相似答案检索器或 None（随机抽取）
+DISTRACTOR_STRATEGIES: Dict[str, Callable] = {}
+
+def register_distractor_strategy(name: str):
+    """登记干扰项策略的装饰器"""
+    def decorator(factory: Callable) -> Callable:
+        DISTRACTOR_STRATEGIES[name] = factory
+        return factory
+    return decorator
+
+def distractor_strategy_names() -> List[str]:
+    """已登记的干扰项策略，用于命令行和HTTP参数校验"""
+    return sorted(DISTRACTOR_STRATEGIES)
+
+@register_distractor_strategy('random')
+def _random_strategy(qa_pairs: List[QAPair], ranker=None):
+    """随机抽取其他答案"""
+    return None
+
+@register_distractor_strategy('tfidf')
+def _tfidf_strategy(qa_pairs: List[QAPair], ranker=None):
+    """选取与正确答案最相似的其他答案，可复用预先建好的索引"""
+    return ranker or build_distractor_ranker(qa_pairs)
+
+# legacy 策略：题干含有这些主题词时，优先选用同样含有该词的其他答案
+LEGACY_TOPIC_KEYWORDS = ('糖尿病', '血糖', '胰岛素')
+
+NUMBER_RE = re.compile(r'\d+(?:\.\d+)?')
+
+def numeric_variants(answer: str) -> List[str]:
+    """把答案中的前两个数值分别放大到1.2倍、缩小到0.8倍（大于1时取整），得到最多2个数值相近的错误说法"""
+    variants = []
+    for num in NUMBER_RE.findall(answer)[:2]:
+        base = float(num)
+        scaled = [str(int(base * factor)) if base > 1 else str(round(base * factor, 1)) for factor in (1.2, 0.8)]
+        for value in scaled:
+            variant = answer.replace(num, value)
+            if variant != answer and variant not in variants and len(variants) < 2:
+                variants.append(variant)
+    return variants
+
+class LegacyDistractorSource:
+    """早期糖尿病脚本的干扰项来源：先用数值改写的答案，再取与题干主题词相同的其他答案（按在文档中的距离由近到远）"""
+
+    def __init__(self, qa_pairs: List[QAPair], keywords=LEGACY_TOPIC_KEYWORDS):
+        self.qa_pairs = qa_pairs
+        self.keywords = keywords
+        # 主题词 -> 答案中含有该词的问答对下标
+        self.by_keyword = {word: [i for i, qa in enumerate(qa_pairs) if word in qa.answer] for word in keywords}
+
+    def similar_answers(self, indices: List[int], k: int = 10) -> List[List[str]]:
+        results = []
+        for index in indices:
+            qa = self.qa_pairs[index]
+            candidates = numeric_variants(qa.answer)
+            related = {i for word in self.keywords if word in qa.question for i in self.by_keyword[word]}
+            related.discard(index)
+            for i in sorted(related, key=lambda i: (abs(i - index), i))[:k]:
+                candidates.append(self.qa_pairs[i].answer)
+            results.append(candidates)
+        return results
+
+@register_distractor_strategy('legacy')
+def _legacy_strategy(qa_pairs: List[QAPair], ranker=None):
+    """数值改写加主题词相同的答案（早期糖尿病脚本的做法）"""
+    return LegacyDistractorSource(qa_pairs)
+
+def prepare_distractor_source(strategy: str, qa_pairs: List[QAPair], ranker=None):
+    """按策略名准备候选答案来源，未登记的策略抛出 ValueError"""
+    factory = DISTRACTOR_STRATEGIES.get(strategy)
+    if factory is None:
+        raise ValueError(f"未知的干扰项策略: {strategy}（可选: {', '.join(distractor_strategy_names())}）")
+    return factory(qa_pairs, ranker)
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+组卷：从解析出的问答对抽题，为每道题生成干扰项并随机排列选项
+"""
+
+import random
+from typing import Any, Dict, Iterator, List, Optional
+
+from question_ids import ensure_question_ids
+from quiz_core.distractors import generate_enhanced_wrong_options, prepare_distractor_source
+from quiz_records import QAPair, QuizQuestion
+
+# tfidf 策略下每批检索相似答案的题目数
+SIMILARITY_BATCH_SIZE = 1000
+
+def display_answer(answer: str) -> str:
+    """选项中显示的正确答案：限制长度"""
+    if len(answer) > 150:
+        return answer[:150] + "..."
+    return answer
+
+def iter_quiz_questions(qa_pairs: List[QAPair], config: Dict[str, Any],
+                        rng: Optional[random.Random] = None, ranker=None, cache=None) -> Iterator[QuizQuestion]:
+    """逐题生成题目，便于边生成边写入文件（参数含义同 generate_quiz_questions）"""
+    rng = rng or random
+    # 题目ID由题干决定，与抽题顺序无关
+    ensure_question_ids(qa_pairs)
+    num_questions = min(config.get('num_questions', 25), len(qa_pairs))
+    domain = config.get('domain', '')
+    strategy = config.get('distractor_strategy', 'random')
+    
+    if len(qa_pairs) < num_questions:
+        print(f"警告：只有 {len(qa_pairs)} 个问答对，将生成全部题目")
+        selected_indices = list(range(len(qa_pairs)))
+    else:
+        selected_indices = rng.sample(range(len(qa_pairs)), num_questions)
+    
+    # 题库已预先生成干扰项（见 precompute.py）的题目直接查表，全部命中时不必准备候选答案
+    if any(qa_pairs[index].wrong_options is None for index in selected_indices):
+        all_answers = [qa.answer for qa in qa_pairs]
+        # 按策略准备候选答案来源（random 策略为 None，随机抽取）
+        ranker = prepare_distractor_source(strategy, qa_pairs, ranker)
+    else:
+        all_answers, ranker = [], None
+    
+    for batch_start in range(0, len(selected_indices), SIMILARITY_BATCH_SIZE):
+        batch = selected_indices[batch_start:batch_start + SIMILARITY_BATCH_SIZE]
+        
+        # 相似度干扰项：一批题目一次批量检索
+        similar = ranker.similar_answers(batch, k=10) if ranker is not None else [None] * len(batch)
+        
+        for offset, index in enumerate(batch):
+            qa = qa_pairs[index]
+            question_text = qa.question
+            # 限制答案长度
+            correct_answer = display_answer(qa.answer)
+            
+            # 生成错误选项
+            if qa.wrong_options is not None:
+                wrong_options = list(qa.wrong_options)
+            else:
+                wrong_options = generate_enhanced_wrong_options(correct_answer, question_text, all_answers, domain,
+                                                                rng, similar[offset], cache)
+            
+            # 组合选项并随机排列
+            all_options = [correct_answer] + wrong_options
+            rng.shuffle(all_options)
+            correct_index = all_options.index(correct_answer)
+            
+            # 生成解析
+            explanation = f"正确答案解析：{qa.answer}"
+            if len(explanation) > 200:
+                explanation = explanation[:200] + "..."
+            
+            yield QuizQuestion.create(qa.id, question_text, all_options, correct_index, explanation)
+
+def generate_quiz_questions(qa_pairs: List[QAPair], config: Dict[str, Any],
+                            rng: Optional[random.Random] = None, ranker=None, cache=None) -> Dict[str, Any]:
+    """生成答题题目数据（传入独立的 rng 可按种子复现结果，且多线程互不干扰）
+    config['distractor_strategy'] 为 'tfidf' 时按答案相似度挑选干扰项，可传入预先建好的 ranker 复用索引；
+    cache 为 distractor_cache.DistractorCache 时，同一答案沿用上次选定的干扰项。
+    questions 为 QuizQuestion 列表，写文件或返回给前端时才用 to_dict / quiz_to_dict 转换"""
+    questions = list(iter_quiz_questions(qa_pairs, config, rng, ranker, cache))
+    
+    return {
+        "title": config.get('title', '知识测试'),
+        "description": config.get('description', '基于知识库生成的测试题目'),
+        "time_limit": config.get('time_limit', 30),
+        "total_questions": len(questions),
+        "questions": questions
+    }
+
+def quiz_to_dict(quiz_data: Dict[str, Any]) -> Dict[str, Any]:
+    """generate_quiz_questions 的结果转换为可以直接 json.dumps 的题目JSON"""
+    return dict(quiz_data, questions=[question.to_dict() for question in quiz_data['questions']])
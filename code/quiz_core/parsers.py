@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+"""
+问答解析器
+各种文档格式的解析器登记在 PARSERS 中，parse_qa_content_universal 检测格式后按名称分派。
+输入是 normalize_text 规范化后的整段文本（空白和换行已统一为 LF），或内存映射的大文件（MappedText）。
+规范化不改动标点，问号、冒号、括号的全角和半角写法只在匹配标记和切分时视为相同，解析出的内容保留原文写法。
+"""
+
+import re
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Pattern, Sequence, Tuple, Union
+
+from mapped_text import MappedText
+from quiz_records import QAPair
+
+# 解析器的输入：规范化后的整段文本，或内存映射的大文件（见 mapped_text.py）
+TextSource = Union[str, MappedText]
+
+def _split_lines(content: TextSource) -> Sequence[str]:
+    """按行切分；MappedText 本身就是按需解码的行序列"""
+    return content.split('\n') if isinstance(content, str) else content
+
+def _iter_chunks(content: TextSource) -> Iterable[str]:
+    """按块返回文本，每块（最后一块除外）都以换行结尾"""
+    return (content,) if isinstance(content, str) else content.iter_chunks()
+
+# 匹配标记时视为相同的标点写法（全角、半角和小型变体）
+QUESTION_MARKS = '？?﹖'
+COLONS = '：:﹕︰'
+OPEN_PARENS = '（(﹙'
+
+QUESTION_MARK_RE = re.compile(f'[{QUESTION_MARKS}]')
+
+# 按优先级排列，文档中出现多种格式时取排在前面的
+FORMAT_PATTERNS = [
+    ('chinese_format', re.compile(f'答[{COLONS}]')),  # 中文"答："格式
+    ('qa_format', re.compile(f'^Q[{COLONS}].+A[{COLONS}]', re.MULTILINE)),  # Q: A: 格式
+    ('numbered_format', re.compile(r'^\d+[、.]', re.MULTILINE)),  # 数字编号格式
+    ('simple_format', re.compile(f'[{QUESTION_MARKS}]\\s*\\n.+', re.MULTILINE)),  # 问号后换行格式
+]
+
+def detect_qa_format(content: TextSource) -> str:
+    """检测问答格式类型"""
+    best = len(FORMAT_PATTERNS)
+    carry = ''
+    for chunk in _iter_chunks(content):
+        text = carry + chunk
+        # 已经找到某种格式后，只需再找优先级更高的
+        for rank in range(best):
+            if FORMAT_PATTERNS[rank][1].search(text):
+                best = rank
+                break
+        if best == 0:
+            break
+        # 块末尾的问号后面只有空白时，"问号后换行"可能跨块，把这段带到下一块
+        index = max(text.rfind(mark) for mark in QUESTION_MARKS)
+        carry = text[index:] if index >= 0 and not text[index + 1:].strip() else ''
+    
+    return FORMAT_PATTERNS[best][0] if best < len(FORMAT_PATTERNS) else 'unknown'
+
+def parse_qa_content_universal(content: TextSource, format_type: Optional[str] = None) -> List[QAPair]:
+    """通用问答内容解析（content 需先经过 normalize_text，extract_content 的结果已经规范化；
+    也可以传入 MappedText，按块解码，不把整个文件读入内存）。format_type 为空时自动检测格式"""
+    if format_type is None:
+        format_type = detect_qa_format(content)
+        print(f"检测到的文档格式: {format_type}")
+    
+    # 检测不出格式（或问号后换行格式）时尝试通用解析
+    return get_parser(format_type)(content)
+
+# 中文格式中答案行的前缀，以及答案续行的开头
+ANSWER_PREFIXES = tuple(word + colon for word in ('答', '解答') for colon in COLONS)
+ANSWER_PREFIX_RE = re.compile(f'^(?:答|解答)[{COLONS}]\\s*')
+CONTINUATION_PREFIXES = tuple(OPEN_PARENS) + ('①', '②', '③', '④', '⑤')
+NUMBERED_RE = re.compile(r'^\d+[、.]')
+_ANSWER_MARKS = tuple('答' + colon for colon in COLONS)
+_QUESTION_ENDINGS = tuple(QUESTION_MARKS)
+
+def parse_chinese_format(content: TextSource) -> List[QAPair]:
+    """解析中文"答："格式"""
+    qa_pairs = []
+    lines = _split_lines(content)
+    
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+        
+        if not line or any(skip in line for skip in ['目录', '索引', '第一章', '第二章']):
+            i += 1
+            continue
+        
+        # 检查是否是问题（不以"答："开头的非空行）
+        if not line.startswith(ANSWER_PREFIXES):
+            question = line
+            answer = ""
+            
+            # 查找答案
+            j = i + 1
+            while j < len(lines):
+                next_line = lines[j].strip()
+                if not next_line:
+                    j += 1
+                    continue
+                
+                # 找到答案行
+                if next_line.startswith(ANSWER_PREFIXES):
+                    answer_text = ANSWER_PREFIX_RE.sub('', next_line)
+                    answer = answer_text
+                    
+                    # 读取后续答案内容
+                    k = j + 1
+                    while k < len(lines):
+                        cont_line = lines[k].strip()
+                        if not cont_line:
+                            k += 1
+                            continue
+                        
+                        if (cont_line.startswith(CONTINUATION_PREFIXES) or
+                            NUMBERED_RE.match(cont_line) or
+                            (not cont_line.endswith(_QUESTION_ENDINGS) and 
+                             not cont_line.startswith(_ANSWER_MARKS))):
+                            answer += " " + cont_line
+                            k += 1
+                        else:
+                            break
+                    break
+                j += 1
+            
+            if question and answer and len(question.strip()) > 3 and len(answer.strip()) > 5:
+                qa_pairs.append(QAPair(question.strip(), answer.strip()))
+            
+            i = j if 'j' in locals() else i + 1
+        else:
+            i += 1
+    
+    return qa_pairs
+
+QA_RE = re.compile(f'Q[{COLONS}]\\s*(.+?)\\s*A[{COLONS}]\\s*(.+?)(?=Q[{COLONS}]|$)', re.DOTALL | re.IGNORECASE)
+QA_START_RE = re.compile(f'Q[{COLONS}]', re.IGNORECASE)
+
+def _iter_qa_blocks(content: TextSource) -> Iterator[Tuple[str, str]]:
+    """与 QA_RE.findall(content) 结果相同，但按块扫描：
+    答案要到下一个 Q： 才能确定，未确定的部分留在缓冲区里与下一块拼接。
+    问题或答案以空白开头说明 \s* 因为缓冲区里缺少后文而回溯过，后文到来后结果可能不同，也要等下一块"""
+    buffer = ''
+    for chunk in _iter_chunks(content):
+        buffer += chunk
+        pos = 0
+        while True:
+            match = QA_RE.search(buffer, pos)
+            if (match is None or not QA_START_RE.match(buffer, match.end())
+                    or match.group(1)[0].isspace() or match.group(2)[0].isspace()):
+                break
+            yield match.group(1), match.group(2)
+            pos = match.end()
+        # 下一个问答只能从 Q： 开始，之前的内容可以丢掉
+        start = QA_START_RE.search(buffer, pos)
+        buffer = buffer[start.start():] if start else buffer[-1:]
+    yield from QA_RE.findall(buffer)
+
+def parse_qa_format(content: TextSource) -> List[QAPair]:
+    """解析Q: A:格式"""
+    qa_pairs = []
+    
+    for question, answer in _iter_qa_blocks(content):
+        question = question.strip()
+        answer = answer.strip()
+        if len(question) > 3 and len(answer) > 5:
+            qa_pairs.append(QAPair(question, answer))
+    
+    return qa_pairs
+
+def parse_numbered_format(content: TextSource) -> List[QAPair]:
+    """解析数字编号格式"""
+    qa_pairs = []
+    lines = _split_lines(content)
+    
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+        
+        # 匹配数字开头的问题
+        if re.match(r'^\d+[、.]\s*(.+)', line):
+            question = re.sub(r'^\d+[、.]\s*', '', line)
+            answer = ""
+            
+            # 收集后续的答案内容
+            j = i + 1
+            while j < len(lines):
+                next_line = lines[j].strip()
+                if not next_line:
+                    j += 1
+                    continue
+                
+                # 如果遇到下一个数字编号，停止
+                if re.match(r'^\d+[、.]\s*', next_line):
+                    break
+                
+                answer += " " + next_line
+                j += 1
+            
+            if question and answer and len(question) > 3 and len(answer) > 5:
+                qa_pairs.append(QAPair(question, answer.strip()))
+            
+            i = j
+        else:
+            i += 1
+    
+    return qa_pairs
+
+NONSPACE_RE = re.compile(r'\S')
+BLANK_LINE_RE = re.compile(r'\n[^\S\n]*(?:\n|$)')
+
+def _last_line(content: str, start: int, end: int) -> str:
+    """content[start:end].strip().split('\n')[-1]，从段尾向前逐行查找，不复制整段"""
+    while True:
+        newline = content.rfind('\n', start, end)
+        if newline < 0:
+            return content[start:end].strip()
+        line = content[newline + 1:end].rstrip()
+        if line:
+            break
+        end = newline
+    # 段内在这一行之前没有其他内容时，strip() 也会去掉它的行首空白
+    if content[start].isspace() and not NONSPACE_RE.search(content, start, newline):
+        line = line.lstrip()
+    return line
+
+def _leading_paragraph(content: str, start: int, end: int) -> str:
+    """content[start:end] 去掉开头空白后、第一个空行之前的各行，逐行 strip 后用空格连接"""
+    if start >= end:
+        return ''
+    if content[start].isspace():
+        first = NONSPACE_RE.search(content, start, end)
+        if first is None:
+            return ''
+        start = first.start()
+    blank = BLANK_LINE_RE.search(content, start, end)
+    paragraph = content[start:blank.start() if blank else end]
+    if '\n' not in paragraph:
+        return paragraph.rstrip()
+    return ' '.join(line.strip() for line in paragraph.split('\n'))
+
+def parse_generic_format(content: TextSource) -> List[QAPair]:
+    """通用格式解析：以问号为界分段，问题取问号前一段的最后一行，答案取问号后一段开头连续的非空行。
+    按问号位置扫描一遍，每段只从两端各查找到需要的位置，总耗时与文本长度成正比"""
+    if not isinstance(content, str):
+        return _parse_generic_lines(content)
+    
+    qa_pairs = []
+    previous = -1
+    question = ''
+    
+    for match in QUESTION_MARK_RE.finditer(content):
+        position = match.start()
+        # 上一个问号的答案在本段开头
+        if len(question) > 3:
+            answer = _leading_paragraph(content, previous + 1, position)
+            if len(answer) + 1 > 10:
+                qa_pairs.append(QAPair(question + "？", answer))
+        question = _last_line(content, previous + 1, position)
+        previous = position
+    
+    if len(question) > 3:
+        answer = _leading_paragraph(content, previous + 1, len(content))
+        if len(answer) + 1 > 10:
+            qa_pairs.append(QAPair(question + "？", answer))
+    
+    return qa_pairs
+
+def _parse_generic_lines(lines: Iterable[str]) -> List[QAPair]:
+    """逐行扫描的通用格式解析，结果与 parse_generic_format 对整段文本的解析相同。
+    以问号为界把文本分段：问题取前一段最后一个非空行，答案取后一段开头连续的非空行"""
+    qa_pairs = []
+    question = None      # 上一个问号前的问题，第一个问号之前为 None
+    last_piece = ''      # 本段最后一个非空片段
+    last_is_first = True # 该片段之前本段是否没有其他内容（此时要去掉行首空白）
+    answer_parts: List[str] = []
+    answer_open = True   # 答案是否还在继续（遇到空行后结束）
+    
+    def close_segment():
+        if question is not None and len(question) > 3:
+            answer = ' '.join(answer_parts)
+            if len(answer) + 1 > 10:
+                qa_pairs.append(QAPair(question + "？", answer))
+    
+    for line in lines:
+        pieces = QUESTION_MARK_RE.split(line)
+        for n, piece in enumerate(pieces):
+            if n:
+                # 问号结束当前段，本段的最后一行成为下一个答案对应的问题
+                close_segment()
+                question = last_piece if not last_is_first else last_piece.lstrip()
+                last_piece, last_is_first = '', True
+                answer_parts, answer_open = [], True
+            
+            stripped = piece.strip()
+            if stripped:
+                last_is_first = not last_piece
+                last_piece = piece.rstrip()
+                if answer_open:
+                    answer_parts.append(stripped)
+            elif answer_parts:
+                answer_open = False
+    
+    close_segment()
+    return qa_pairs
+
+
+# 格式名 -> 解析器；parse_qa_content_universal、增量解析和命令行的 --parser 都从这里取
+PARSERS: Dict[str, Callable[[TextSource], List[QAPair]]] = {
+    'chinese_format': parse_chinese_format,
+    'qa_format': parse_qa_format,
+    'numbered_format': parse_numbered_format,
+    'generic': parse_generic_format,
+}
+
+def register_parser(name: str, parser: Callable[[TextSource], List[QAPair]],
+                    pattern: Optional[Pattern] = None, priority: Optional[int] = None):
+    """登记解析器；给出 pattern 时参与格式检测，priority 为在 FORMAT_PATTERNS 中的位置（默认排在最后）"""
+    PARSERS[name] = parser
+    if pattern is not None:
+        FORMAT_PATTERNS[:] = [item for item in FORMAT_PATTERNS if item[0] != name]
+        FORMAT_PATTERNS.insert(len(FORMAT_PATTERNS) if priority is None else priority, (name, pattern))
+
+def get_parser(format_type: str) -> Callable[[TextSource], List[QAPair]]:
+    """按格式名取解析器，没有专门解析器的格式（unknown、simple_format）使用通用解析"""
+    return PARSERS.get(format_type, parse_generic_format)
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+整个题库的干扰项预生成
+按题库提供组卷服务时，每份试卷都要重新为抽到的题目生成干扰项。这里一次性为题库中每个问答对生成3个干扰项，
+写入题库文件（*.bank.jsonl），之后 iter_quiz_questions 遇到已有干扰项的问答对直接查表。
+
+题库按下标分块交给进程池。只读的问答对、答案列表和 TF-IDF 索引在创建进程池之前放进模块级变量，
+fork 出的子进程直接继承（写时复制），不需要把整个题库序列化发送给每个任务；不支持 fork 的平台在进程初始化时传入一次。
+每个问答对使用由 (种子, 题目ID) 决定的独立随机数，结果与分块方式和进程数无关，单进程生成的结果完全相同。
+使用干扰项缓存（distractor_cache.py）时，已缓存的答案直接沿用，只为其余问答对生成。
+"""
+
+import json
+import os
+import random
+from typing import Any, Dict, List, Optional, Tuple
+
+from question_ids import ensure_question_ids
+from quiz_core.distractors import generate_enhanced_wrong_options, prepare_distractor_source
+from quiz_core.generator import display_answer
+from quiz_records import QAPair, intern_text
+
+BANK_SUFFIX = '.bank.jsonl'
+BANK_VERSION = 1
+
+# 每个任务处理的问答对数量
+CHUNK_SIZE = 2000
+
+# 子进程共享的只读数据：qa_pairs、answers、short_answers、ranker、domain、seed
+_SHARED: Dict[str, Any] = {}
+
+
+def is_bank_file(path: str) -> bool:
+    """是否为预生成了干扰项的题库文件"""
+    return path.lower().endswith(BANK_SUFFIX)
+
+
+def _init_worker(shared: Dict[str, Any]):
+    """不支持 fork 时在子进程中设置共享数据"""
+    _SHARED.update(shared)
+
+
+def _precompute_chunk(indices: List[int]) -> List[Tuple[str, ...]]:
+    """为 qa_pairs 中给定下标的问答对生成干扰项"""
+    qa_pairs = _SHARED['qa_pairs']
+    answers = _SHARED['answers']
+    short_answers = _SHARED['short_answers']
+    ranker = _SHARED['ranker']
+    domain = _SHARED['domain']
+    seed = _SHARED['seed']
+
+    similar = ranker.similar_answers(indices, k=10) if ranker is not None else None
+    results = []
+    for offset, index in enumerate(indices):
+        qa = qa_pairs[index]
+        rng = random.Random((seed << 52) + qa.id)
+        if similar is not None:
+            candidates = similar[offset]
+        else:
+            # 与随机策略等价：从长度合适的答案中无放回抽取（多抽一个，抽到正确答案本身时会被跳过），
+            # 但不必每道题都把整个题库过滤一遍
+            candidates = rng.sample(short_answers, min(11, len(short_answers)))
+        wrong_options = generate_enhanced_wrong_options(display_answer(qa.answer), qa.question, answers, domain,
+                                                        rng, candidates)
+        results.append(tuple(wrong_options))
+    return results
+
+
+def precompute_distractors(qa_pairs: List[QAPair], domain: str = '', strategy: str = 'random', seed: int = 0,
+                           workers: int = 1, chunk_size: int = CHUNK_SIZE, ranker=None, cache=None) -> int:
+    """为每个问答对生成干扰项并写入 qa.wrong_options，返回实际生成（未命中缓存）的问答对数量。
+    workers 大于1时使用进程池；tfidf 策略的索引在父进程中建好一次，由子进程共享。
+    cache（distractor_cache.DistractorCache）只在父进程中查询和写入，子进程只处理未命中的问答对"""
+    ensure_question_ids(qa_pairs)
+    pending = list(range(len(qa_pairs)))
+    if cache is not None:
+        pending = []
+        cached_options = cache.get_many([display_answer(qa.answer) for qa in qa_pairs], domain)
+        for index, (qa, cached) in enumerate(zip(qa_pairs, cached_options)):
+            if cached is None:
+                pending.append(index)
+            else:
+                qa.wrong_options = tuple(intern_text(option) for option in cached)
+    if not pending:
+        return 0
+
+    answers = [qa.answer for qa in qa_pairs]
+    _SHARED.update({
+        'qa_pairs': qa_pairs,
+        'answers': answers,
+        'short_answers': [answer for answer in answers if len(answer) < 200],
+        'ranker': prepare_distractor_source(strategy, qa_pairs, ranker),
+        'domain': domain,
+        'seed': seed,
+    })
+    chunks = [pending[start:start + chunk_size] for start in range(0, len(pending), chunk_size)]
+
+    try:
+        if workers <= 1 or len(chunks) <= 1:
+            _store_chunks(qa_pairs, chunks, map(_precompute_chunk, chunks))
+        else:
+            # 进程池只在这里用到；命令行读取题库时也会导入本模块，不为此多加载 multiprocessing
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            if 'fork' in multiprocessing.get_all_start_methods():
+                context, initargs = multiprocessing.get_context('fork'), None
+            else:
+                context, initargs = multiprocessing.get_context('spawn'), (dict(_SHARED),)
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                     initializer=_init_worker if initargs else None,
+                                     initargs=initargs or ()) as executor:
+                _store_chunks(qa_pairs, chunks, executor.map(_precompute_chunk, chunks))
+    finally:
+        _SHARED.clear()
+
+    if cache is not None:
+        for index in pending:
+            qa = qa_pairs[index]
+            cache.put(display_answer(qa.answer), domain, qa.wrong_options)
+    return len(pending)
+
+
+def _store_chunks(qa_pairs: List[QAPair], chunks: List[List[int]], results):
+    for indices, chunk in zip(chunks, results):
+        for index, wrong_options in zip(indices, chunk):
+            # 子进程返回的字符串是各自的副本，驻留后相同的干扰项（如通用选项）只保存一份
+            qa_pairs[index].wrong_options = tuple(intern_text(option) for option in wrong_options)
+
+
+def save_bank(path: str, qa_pairs: List[QAPair], meta: Optional[Dict[str, Any]] = None) -> int:
+    """写入题库文件：第一行为题库信息，之后每行一个问答对（含 id 和 wrong_options）。
+    先写临时文件再替换，中途失败不会留下半个文件"""
+    header = {'format': 'question_bank', 'version': BANK_VERSION, 'total': len(qa_pairs)}
+    header.update(meta or {})
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(header, ensure_ascii=False) + '\n')
+            for qa in qa_pairs:
+                f.write(json.dumps(qa.to_dict(), ensure_ascii=False) + '\n')
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return len(qa_pairs)
+
+
+def load_bank(path: str) -> Tuple[Dict[str, Any], List[QAPair]]:
+    """读取题库文件，返回 (题库信息, 问答对)；格式不对时抛出 ValueError"""
+    with open(path, 'r', encoding='utf-8') as f:
+        header = json.loads(f.readline() or 'null')
+        if not isinstance(header, dict) or header.get('format') != 'question_bank':
+            raise ValueError(f"不是题库文件: {path}")
+        if header.get('version') != BANK_VERSION:
+            raise ValueError(f"不支持的题库文件版本 {header.get('version')}: {path}")
+        qa_pairs = [QAPair.from_dict(json.loads(line)) for line in f if line.strip()]
+    return header, qa_pairs
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+紧凑的题目数据结构
+使用 __slots__ 数据类代替每条记录一个 dict，题库达到几十万条时可以省下大量内存；
+选项文本通过 sys.intern 去重，同一个干扰项被多道题引用时只保存一份。
+"""
+
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def intern_text(text: str) -> str:
+    """驻留字符串：内容相同的选项共享同一个对象"""
+    return sys.intern(text)
+
+
+@dataclass
+class QAPair:
+    """解析得到的一个问答对；id 为题库内稳定的题目ID，未分配时为 None（不参与比较）；
+    wrong_options 为预先生成的3个干扰项（见 quiz_core/precompute.py），没有时为 None（不参与比较）"""
+    __slots__ = ('question', 'answer', 'id', 'wrong_options')
+    question: str
+    answer: str
+
+    def __post_init__(self):
+        # id 不作为数据类字段：__slots__ 与字段默认值不能同时使用（Python 3.7）
+        self.id: Optional[int] = None
+        self.wrong_options: Optional[Tuple[str, ...]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"question": self.question, "answer": self.answer}
+        if self.id is not None:
+            data["id"] = self.id
+        if self.wrong_options is not None:
+            data["wrong_options"] = list(self.wrong_options)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'QAPair':
+        pair = cls(data['question'], data['answer'])
+        pair.id = data.get('id')
+        if data.get('wrong_options') is not None:
+            pair.wrong_options = tuple(intern_text(option) for option in data['wrong_options'])
+        return pair
+
+
+@dataclass
+class QuizQuestion:
+    """生成好的一道单选题，options 为驻留过的字符串元组"""
+    __slots__ = ('id', 'question', 'options', 'correct_answer', 'explanation')
+    id: int
+    question: str
+    options: Tuple[str, ...]
+    correct_answer: int
+    explanation: str
+
+    @classmethod
+    def create(cls, question_id: int, question: str, options: List[str], correct_answer: int,
+               explanation: str) -> 'QuizQuestion':
+        return cls(question_id, question, tuple(intern_text(option) for option in options),
+                   correct_answer, explanation)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为题目JSON格式（与前端 Question 接口一致）"""
+        return {
+            "id": self.id,
+            "question": self.question,
+            "options": list(self.options),
+            "correct_answer": self.correct_answer,
+            "explanation": self.explanation,
+        }
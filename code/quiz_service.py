@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地题目生成HTTP服务
+常驻内存保存已解析的题库，按 (题库指纹, 参数) 缓存生成结果，避免每次请求都重新启动和解析文档
+
+接口：
+  GET  /health                          服务状态
+  GET  /banks                           已加载的题库列表
+  POST /banks   {"name", "path", "domain"}  加载或重新加载题库（path 可以是 *.bank.jsonl 题库文件）
+  GET  /quiz?bank=X&n=25&seed=S         从题库X按种子S生成N道题（distractors=tfidf 使用相似答案作干扰项）
+  GET  /question?bank=X&id=N            按稳定题目ID查询问答对
+  GET  /stats                           缓存命中统计
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from async_http import HTTPError, HTTPRequest, serve
+from question_ids import QuestionIndex
+from quiz_core import (build_distractor_ranker, distractor_strategy_names, extract_content, generate_quiz_questions,
+                       parse_qa_content_universal, quiz_to_dict)
+from quiz_core.precompute import is_bank_file, load_bank
+from quiz_records import QAPair
+
+
+class QuestionBank:
+    """内存中的已解析题库"""
+
+    def __init__(self, name: str, path: str, domain: str, qa_pairs: List[QAPair], digest: str):
+        self.name = name
+        self.path = path
+        self.domain = domain
+        self.qa_pairs = qa_pairs
+        # 题目ID由题干决定，重新加载后同一道题的ID不变
+        self.index = QuestionIndex.build(qa_pairs)
+        self.digest = digest
+        self.mtime = os.path.getmtime(path)
+        self.loaded_at = time.time()
+        self._ranker = None
+        # 建立索引失败（如未安装 scipy）后不再重试，直到题库重新加载
+        self._ranker_failed = False
+        self._ranker_lock = threading.Lock()
+
+    def get_ranker(self):
+        """首次使用相似度干扰项时才建立TF-IDF索引，之后常驻内存；无法建立时返回 None"""
+        with self._ranker_lock:
+            if self._ranker is None and not self._ranker_failed:
+                try:
+                    self._ranker = build_distractor_ranker(self.qa_pairs)
+                except Exception as e:
+                    print(f"建立相似度索引出错: {e}")
+                if self._ranker is None:
+                    self._ranker_failed = True
+                    print(f"⚠️ 题库 {self.name} 无法使用 tfidf 干扰项，改用随机干扰项")
+            return self._ranker
+
+    def is_stale(self) -> bool:
+        """源文件在加载后被修改过"""
+        try:
+            return os.path.getmtime(self.path) != self.mtime
+        except OSError:
+            return False
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "path": self.path,
+            "domain": self.domain,
+            "digest": self.digest,
+            "qa_pairs": len(self.qa_pairs),
+            "loaded_at": self.loaded_at,
+        }
+
+
+class LRUCache:
+    """容量固定的LRU缓存，超出容量时淘汰最久未使用的条目"""
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        if key in self._data:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: Tuple, value: Any):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def load_question_bank(name: str, path: str, domain: str = "") -> QuestionBank:
+    """提取并解析文档，构造题库（在线程池中运行）"""
+    if not os.path.exists(path):
+        raise HTTPError(404, f"文件不存在 {path}")
+
+    # 预生成了干扰项的题库文件（见 precompute_distractors.py）不需要解析，组卷时直接查表
+    if is_bank_file(path):
+        try:
+            _, qa_pairs = load_bank(path)
+        except (ValueError, KeyError) as e:
+            raise HTTPError(400, f"无法读取题库文件 {path}: {e}")
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:16]
+        return QuestionBank(name, path, domain, qa_pairs, digest)
+
+    content = extract_content(path)
+    if not content:
+        raise HTTPError(400, f"无法提取文档内容 {path}")
+
+    qa_pairs = parse_qa_content_universal(content)
+    if not qa_pairs:
+        raise HTTPError(400, f"无法解析到有效的问答对 {path}")
+
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+    return QuestionBank(name, path, domain, qa_pairs, digest)
+
+
+class QuizService:
+    """题目生成服务：管理题库、缓存和后台生成线程"""
+
+    def __init__(self, cache_size: int = 256, workers: int = 4):
+        self.banks: Dict[str, QuestionBank] = {}
+        self.cache = LRUCache(cache_size)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        # 相同参数的并发请求只生成一次，其余请求等待同一个结果
+        self._pending: Dict[Tuple, asyncio.Future] = {}
+
+    async def load_bank(self, name: str, path: str, domain: str = "") -> QuestionBank:
+        loop = asyncio.get_running_loop()
+        bank = await loop.run_in_executor(self.executor, load_question_bank, name, path, domain)
+        self.banks[name] = bank
+        print(f"✅ 已加载题库 {name}: {len(bank.qa_pairs)} 个问答对 ({bank.digest})")
+        return bank
+
+    async def get_bank(self, name: str) -> QuestionBank:
+        bank = self.banks.get(name)
+        if bank is None:
+            raise HTTPError(404, f"题库不存在 {name}")
+        # 源文件被编辑后自动重新加载，新指纹会让旧缓存自然失效
+        if bank.is_stale():
+            bank = await self.load_bank(name, bank.path, bank.domain)
+        return bank
+
+    async def generate(self, bank: QuestionBank, config: Dict[str, Any], seed: int) -> Dict[str, Any]:
+        key = (bank.digest, seed, tuple(sorted(config.items())))
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        if key in self._pending:
+            return await asyncio.shield(self._pending[key])
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, self._generate_sync, bank, config, seed)
+        self._pending[key] = future
+        try:
+            quiz_data = await future
+        finally:
+            del self._pending[key]
+
+        self.cache.put(key, quiz_data)
+        return quiz_data
+
+    @staticmethod
+    def _generate_sync(bank: QuestionBank, config: Dict[str, Any], seed: int) -> Dict[str, Any]:
+        ranker = bank.get_ranker() if config['distractor_strategy'] == 'tfidf' else None
+        if config['distractor_strategy'] == 'tfidf' and ranker is None:
+            # 否则 tfidf 策略会在每次组卷时重新尝试建立索引
+            config = dict(config, distractor_strategy='random')
+        return generate_quiz_questions(bank.qa_pairs, config, random.Random(seed), ranker)
+
+    async def handle(self, request: HTTPRequest) -> Tuple[int, Any, Dict[str, str]]:
+        """请求路由"""
+        route = (request.method, request.path)
+
+        if route == ('GET', '/health'):
+            return 200, {"status": "ok", "banks": len(self.banks)}, {}
+
+        if route == ('GET', '/banks'):
+            return 200, [bank.summary() for bank in self.banks.values()], {}
+
+        if route == ('POST', '/banks'):
+            body = request.json() or {}
+            if not body.get('name') or not body.get('path'):
+                raise HTTPError(400, "需要提供 name 和 path")
+            bank = await self.load_bank(body['name'], body['path'], body.get('domain', ''))
+            return 201, bank.summary(), {}
+
+        if route == ('GET', '/quiz'):
+            return await self.handle_quiz(request)
+
+        if route == ('GET', '/question'):
+            return await self.handle_question(request)
+
+        if route == ('GET', '/stats'):
+            return 200, {
+                "cache_size": len(self.cache),
+                "cache_max_size": self.cache.max_size,
+                "hits": self.cache.hits,
+                "misses": self.cache.misses,
+                "pending": len(self._pending),
+            }, {}
+
+        if request.path in ('/health', '/banks', '/quiz', '/question', '/stats'):
+            raise HTTPError(405, f"不支持的请求方法 {request.method}")
+        raise HTTPError(404, f"未知接口 {request.path}")
+
+    async def handle_question(self, request: HTTPRequest) -> Tuple[int, Any, Dict[str, str]]:
+        query = request.query
+        if 'bank' not in query or 'id' not in query:
+            raise HTTPError(400, "需要提供 bank 和 id 参数")
+        bank = await self.get_bank(query['bank'])
+
+        try:
+            question_id = int(query['id'])
+        except ValueError:
+            raise HTTPError(400, "id 必须是整数")
+
+        pair = bank.index.get(question_id)
+        if pair is None:
+            raise HTTPError(404, f"题目不存在 {question_id}")
+        return 200, pair.to_dict(), {}
+
+    async def handle_quiz(self, request: HTTPRequest) -> Tuple[int, Any, Dict[str, str]]:
+        query = request.query
+        if 'bank' not in query:
+            raise HTTPError(400, "需要提供 bank 参数")
+        bank = await self.get_bank(query['bank'])
+
+        try:
+            num_questions = int(query.get('n', 25))
+            time_limit = int(query.get('time_limit', 30))
+            # 未指定种子时随机生成一个，并通过响应头返回以便复现
+            seed = int(query['seed']) if 'seed' in query else random.randrange(2 ** 32)
+        except ValueError:
+            raise HTTPError(400, "n、time_limit 和 seed 必须是整数")
+
+        if num_questions <= 0:
+            raise HTTPError(400, "n 必须大于0")
+
+        strategy = query.get('distractors', 'random')
+        if strategy not in distractor_strategy_names():
+            raise HTTPError(400, f"distractors 只能是 {' 或 '.join(distractor_strategy_names())}")
+
+        config = {
+            'num_questions': num_questions,
+            'title': query.get('title', '知识测试'),
+            'description': query.get('description', f"基于{os.path.basename(bank.path)}生成的测试题目"),
+            'time_limit': time_limit,
+            'domain': query.get('domain', bank.domain),
+            'distractor_strategy': strategy,
+        }
+
+        quiz_data = await self.generate(bank, config, seed)
+        # 缓存中保存的是 QuizQuestion，只在响应时转换成字典
+        return 200, quiz_to_dict(quiz_data), {"X-Quiz-Seed": str(seed)}
+
+
+async def run_service(args):
+    service = QuizService(cache_size=args.cache_size, workers=args.workers)
+
+    for spec in args.bank:
+        name, _, path = spec.partition('=')
+        if not path:
+            name, path = os.path.splitext(os.path.basename(spec))[0], spec
+        try:
+            await service.load_bank(name, path, args.domain or '')
+        except HTTPError as e:
+            print(f"错误：加载题库 {name} 失败 {e.message}")
+
+    server = await serve(service.handle, args.host, args.port)
+    print(f"🚀 题目生成服务已启动: http://{args.host}:{args.port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='本地题目生成HTTP服务')
+    parser.add_argument('--host', default='127.0.0.1', help='监听地址')
+    parser.add_argument('--port', '-p', type=int, default=8765, help='监听端口')
+    parser.add_argument('--bank', '-b', action='append', default=[], help='启动时加载的题库，格式 名称=文档路径，可重复')
+    parser.add_argument('--domain', help='题库默认知识领域 (medical/technical/business/legal)')
+    parser.add_argument('--cache-size', type=int, default=256, help='缓存的生成结果数量上限')
+    parser.add_argument('--workers', type=int, default=4, help='后台生成线程数')
+
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run_service(args))
+    except KeyboardInterrupt:
+        print("\n服务已停止")
+
+
+if __name__ == "__main__":
+    main()
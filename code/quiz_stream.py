@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+题目数据的流式读写
+- QuizStreamWriter: 边生成边写入磁盘，结束时得到合法的 JSON（或 JSON Lines）文件
+- QuizStreamReader: 逐题读取题目文件，不把整个文档载入内存（校验见 quiz_validator.py）
+
+JSON Lines 格式：第一行为 {"title", "description", "time_limit"}，之后每行一道题
+"""
+
+import json
+import os
+from typing import Any, Dict, Iterator, Optional
+
+# 读取文件时每次读入的字符数
+CHUNK_SIZE = 1 << 16
+# 解析错误离缓冲区末尾不超过这么多字符时视为值被截断，需要继续读入
+TRUNCATION_MARGIN = 10
+
+
+def detect_format(path: str) -> str:
+    """根据扩展名判断文件格式"""
+    return 'jsonl' if path.lower().endswith(('.jsonl', '.ndjson')) else 'json'
+
+
+class QuizStreamWriter:
+    """流式写入题目文件；先写临时文件，关闭时再替换目标文件，中途失败不会留下半个文件"""
+
+    def __init__(self, path: str, title: str, description: str, time_limit: int, fmt: Optional[str] = None):
+        self.path = path
+        self.format = fmt or detect_format(path)
+        self.count = 0
+        self._tmp_path = path + '.tmp'
+        self._file = open(self._tmp_path, 'w', encoding='utf-8')
+
+        meta = {'title': title, 'description': description, 'time_limit': time_limit}
+        if self.format == 'jsonl':
+            self._file.write(json.dumps(meta, ensure_ascii=False) + '\n')
+        else:
+            # 顶层字段照常缩进，questions 放在最后逐题追加
+            self._file.write('{\n')
+            for key, value in meta.items():
+                self._file.write(f"  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n")
+            self._file.write('  "questions": [')
+
+    def write_question(self, question: Dict[str, Any]):
+        if self.format == 'jsonl':
+            self._file.write(json.dumps(question, ensure_ascii=False) + '\n')
+        else:
+            text = json.dumps(question, ensure_ascii=False, indent=2).replace('\n', '\n    ')
+            self._file.write((',\n    ' if self.count else '\n    ') + text)
+        self.count += 1
+
+    def close(self) -> int:
+        """写入结尾并落盘，返回题目数量"""
+        if self.format != 'jsonl':
+            self._file.write('\n  ],\n' if self.count else '],\n')
+            self._file.write(f'  "total_questions": {self.count}\n}}\n')
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+        return self.count
+
+    def abort(self):
+        self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def __enter__(self) -> 'QuizStreamWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class _JSONScanner:
+    """在分块读入的缓冲区上逐个解析JSON值"""
+
+    def __init__(self, f):
+        self._f = f
+        self._decoder = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        # 未解析完的部分越长读入越多，很大的值只需重新解析 O(log n) 次
+        chunk = self._f.read(max(CHUNK_SIZE, len(self._buf) - self._pos))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """跳过空白后返回下一个字符，文件结束时返回空串"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in ' \t\r\n':
+                self._pos += 1
+            if self._pos < len(self._buf) or not self._fill():
+                return self._buf[self._pos:self._pos + 1]
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            found = self.peek() or '文件结尾'
+            raise ValueError(f"JSON格式错误：期望 '{char}'，实际为 '{found}'")
+        self._pos += 1
+
+    def _truncated(self, error: json.JSONDecodeError) -> bool:
+        """解析错误是否可能只是因为值在缓冲区末尾被截断。
+        未闭合的字符串报告的是字符串开头的位置；写了一半的字面量或 \\u 转义离末尾不超过几个字符"""
+        return error.pos >= len(self._buf) - TRUNCATION_MARGIN or error.msg.startswith('Unterminated string')
+
+    def value(self) -> Any:
+        """解析下一个完整的值；值被分块截断时继续读入"""
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as e:
+                # 只有值在缓冲区末尾被截断时才继续读入；错误出现在前面说明文件本身有误，立即报告，
+                # 否则格式错误或截断的文件会被整个读进内存并反复重新解析
+                if self._truncated(e) and self._fill():
+                    continue
+                raise ValueError(f"JSON格式错误：{e.msg}")
+            # 数字可能恰好在缓冲区末尾被截断
+            if end == len(self._buf) and not self._eof and self._fill():
+                continue
+            self._pos = end
+            return obj
+
+
+class QuizStreamReader:
+    """逐题读取题目文件；遍历结束后 meta 中包含除 questions 外的全部顶层字段"""
+
+    def __init__(self, path: str, fmt: Optional[str] = None):
+        self.path = path
+        self.format = fmt or detect_format(path)
+        self.meta: Dict[str, Any] = {}
+        self.has_questions = False
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            if self.format == 'jsonl':
+                yield from self._iter_jsonl(f)
+            else:
+                yield from self._iter_json(f)
+
+    def _iter_jsonl(self, f) -> Iterator[Dict[str, Any]]:
+        header = f.readline()
+        if not header.strip():
+            raise ValueError("JSON Lines 文件缺少首行的标题信息")
+        self.meta = json.loads(header)
+        self.has_questions = True
+        count = 0
+        for line in f:
+            if line.strip():
+                count += 1
+                yield json.loads(line)
+        self.meta.setdefault('total_questions', count)
+
+    def _iter_json(self, f) -> Iterator[Dict[str, Any]]:
+        scanner = _JSONScanner(f)
+        scanner.expect('{')
+        if scanner.peek() == '}':
+            return
+        while True:
+            key = scanner.value()
+            if not isinstance(key, str):
+                raise ValueError("JSON格式错误：对象的键必须是字符串")
+            scanner.expect(':')
+            if key == 'questions':
+                self.has_questions = True
+                yield from self._iter_array(scanner)
+            else:
+                self.meta[key] = scanner.value()
+            if scanner.peek() == ',':
+                scanner.expect(',')
+                continue
+            scanner.expect('}')
+            return
+
+    @staticmethod
+    def _iter_array(scanner: _JSONScanner) -> Iterator[Any]:
+        scanner.expect('[')
+        if scanner.peek() == ']':
+            scanner.expect(']')
+            return
+        while True:
+            yield scanner.value()
+            if scanner.peek() == ',':
+                scanner.expect(',')
+                continue
+            scanner.expect(']')
+            return
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+题目数据校验工具
+一次遍历检查所有题目的约束，列出全部错误及对应题目ID：
+- 顶层必要字段、类型，total_questions 与实际题数一致
+- 每道题的字段和类型，题目ID不重复
+- 选项至少2个、非空且互不重复（关键词替换生成的干扰项经常与其他选项相同）
+- correct_answer 在选项范围内
+校验函数在创建时按规则一次性组装好，逐题调用时不再解析规则。
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from quiz_stream import QuizStreamReader
+
+# 题目文件必须包含的顶层字段及类型
+REQUIRED_FIELDS = {
+    'title': str,
+    'description': str,
+    'time_limit': int,
+    'total_questions': int,
+    'questions': list,
+}
+
+# 每道题必须包含的字段及类型
+QUESTION_FIELDS = {
+    'id': int,
+    'question': str,
+    'options': list,
+    'correct_answer': int,
+    'explanation': str,
+}
+
+# 单选题至少需要的选项数
+MIN_OPTIONS = 2
+
+
+def compile_question_check(fields: Dict[str, type] = QUESTION_FIELDS,
+                           min_options: int = MIN_OPTIONS) -> Callable[[Any], List[str]]:
+    """根据字段规则生成单题校验函数"""
+    field_items = tuple(fields.items())
+
+    def check(question: Any) -> List[str]:
+        if type(question) is not dict:
+            return ["题目必须是JSON对象"]
+
+        errors = []
+        for field, field_type in field_items:
+            value = question.get(field)
+            # bool 是 int 的子类，需要单独排除
+            if value is None:
+                errors.append(f"缺少字段 '{field}'")
+            elif not isinstance(value, field_type) or type(value) is bool:
+                errors.append(f"字段 '{field}' 类型错误")
+        if errors:
+            return errors
+
+        if not question['question'].strip():
+            errors.append("题干为空")
+
+        options = question['options']
+        if len(options) < min_options:
+            errors.append(f"选项少于 {min_options} 个")
+        # 一次集合推导同时完成类型、空值和重复检查
+        try:
+            distinct = {option.strip() for option in options}
+        except AttributeError:
+            errors.append("存在非字符串选项")
+        else:
+            if '' in distinct:
+                errors.append("存在空选项")
+            elif len(distinct) != len(options):
+                errors.append("存在重复选项")
+
+        answer = question['correct_answer']
+        if not 0 <= answer < len(options):
+            errors.append(f"correct_answer={answer} 超出选项范围 0-{len(options) - 1}")
+
+        return errors
+
+    return check
+
+
+class QuizValidator:
+    """逐题喂入的校验器，适用于整份载入或流式读取的数据"""
+
+    def __init__(self, max_errors: Optional[int] = None):
+        self.max_errors = max_errors
+        self.errors: List[str] = []
+        self.count = 0
+        self._check = compile_question_check()
+        self._seen_ids = set()
+
+    def _add(self, message: str):
+        if self.max_errors is None or len(self.errors) < self.max_errors:
+            self.errors.append(message)
+
+    def feed(self, question: Any):
+        self.count += 1
+        question_id = question.get('id') if type(question) is dict else None
+        label = f"第 {self.count} 题" if question_id is None else f"第 {self.count} 题（ID {question_id}）"
+
+        for error in self._check(question):
+            self._add(f"{label}: {error}")
+
+        if type(question_id) is int:
+            if question_id in self._seen_ids:
+                self._add(f"{label}: 题目ID重复")
+            self._seen_ids.add(question_id)
+
+    def feed_all(self, questions: Iterable[Any]):
+        for question in questions:
+            self.feed(question)
+
+    def finish(self, meta: Dict[str, Any], has_questions: bool = True) -> List[str]:
+        """检查顶层字段，返回全部错误"""
+        for field, field_type in REQUIRED_FIELDS.items():
+            if field == 'questions':
+                if not has_questions:
+                    self._add(f"题目数据缺少必要字段 '{field}'")
+            elif field not in meta:
+                self._add(f"题目数据缺少必要字段 '{field}'")
+            elif not isinstance(meta[field], field_type) or type(meta[field]) is bool:
+                self._add(f"字段 '{field}' 类型错误")
+
+        if type(meta.get('time_limit')) is int and meta['time_limit'] <= 0:
+            self._add("time_limit 必须大于0")
+        if has_questions and self.count == 0:
+            self._add("题目数据为空")
+        if type(meta.get('total_questions')) is int and meta['total_questions'] != self.count:
+            self._add(f"total_questions 为 {meta['total_questions']}，实际有 {self.count} 道题")
+        return self.errors
+
+
+def validate_quiz_data(quiz_data: Dict[str, Any], max_errors: Optional[int] = None) -> List[str]:
+    """校验已载入内存的题目数据"""
+    if not isinstance(quiz_data, dict):
+        return ["题目数据必须是JSON对象"]
+    validator = QuizValidator(max_errors)
+    questions = quiz_data.get('questions')
+    has_questions = isinstance(questions, list)
+    if has_questions:
+        validator.feed_all(questions)
+    meta = {key: value for key, value in quiz_data.items() if key != 'questions'}
+    return validator.finish(meta, has_questions)
+
+
+def validate_quiz_file(path: str, max_errors: Optional[int] = None) -> Tuple[bool, List[str], Dict[str, Any], int]:
+    """流式校验题目文件（JSON 或 JSON Lines），返回 (是否通过, 错误列表, 顶层字段, 题目数量)"""
+    reader = QuizStreamReader(path)
+    validator = QuizValidator(max_errors)
+    try:
+        validator.feed_all(reader)
+    except (ValueError, UnicodeDecodeError) as e:
+        return False, validator.errors + [str(e)], reader.meta, validator.count
+    errors = validator.finish(reader.meta, reader.has_questions)
+    return not errors, errors, reader.meta, validator.count
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='题目数据校验工具')
+    parser.add_argument('quiz_file', help='题目JSON或JSON Lines文件路径')
+    parser.add_argument('--max-errors', type=int, default=100, help='最多显示的错误数量')
+    parser.add_argument('--benchmark', type=int, metavar='N', help='用N道合成题目测量校验速度')
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.quiz_file):
+        print(f"错误：文件不存在 {args.quiz_file}")
+        return
+
+    if args.benchmark:
+        with open(args.quiz_file, 'r', encoding='utf-8') as f:
+            sample = json.load(f)['questions']
+        questions = [dict(sample[i % len(sample)], id=i + 1) for i in range(args.benchmark)]
+        start = time.perf_counter()
+        validator = QuizValidator()
+        validator.feed_all(questions)
+        elapsed = time.perf_counter() - start
+        print(f"⏱️ 校验 {args.benchmark} 道题目用时 {elapsed:.3f} 秒，发现 {len(validator.errors)} 个错误")
+        return
+
+    start = time.perf_counter()
+    valid, errors, meta, count = validate_quiz_file(args.quiz_file)
+    elapsed = time.perf_counter() - start
+
+    if valid:
+        print(f"✅ 验证通过：{count} 道题目（用时 {elapsed:.3f} 秒）")
+        return
+
+    print(f"❌ 发现 {len(errors)} 个错误（共 {count} 道题目）：")
+    for error in errors[:args.max_errors]:
+        print(f"  {error}")
+    if len(errors) > args.max_errors:
+        print(f"  ……另有 {len(errors) - args.max_errors} 个错误未显示")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地答题记录收集服务
+接收前端提交的 QuizRecord，先组提交写入预写日志再确认，随后按批次刷入 SQLite，
+可选地以批量接口转发到飞书多维表格。浏览器缓存被清空或飞书限流都不会丢失记录。
+
+接口：
+  POST /records   单条记录对象或记录数组
+  GET  /health    服务状态
+  GET  /stats     写入、刷盘、转发计数
+  GET  /export    导出全部记录，?format=xlsx（默认，含答题明细表）或 csv，CSV 可用 &table=answers 导出答题明细
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from async_http import HTTPError, HTTPRequest, serve
+from export_records import CONTENT_TYPES, export_store, load_openpyxl
+from feishu_forwarder import MAX_BATCH_SIZE, FeishuForwarder, get_feishu_config
+from record_store import RecordStore, WriteAheadLog, validate_record
+
+# 允许前端页面跨域提交
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type',
+}
+
+# 导出文件分块发送的大小
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+class IngestService:
+    """记录收集服务：组提交写日志、批量刷盘、批量转发"""
+
+    def __init__(self, data_dir: str, flush_interval: float = 1.0, flush_batch_size: int = 1000,
+                 forwarder: Optional[FeishuForwarder] = None, forward_interval: float = 5.0):
+        os.makedirs(data_dir, exist_ok=True)
+        self.data_dir = data_dir
+        self.wal = WriteAheadLog(os.path.join(data_dir, 'wal'))
+        self.store = RecordStore(os.path.join(data_dir, 'records.db'))
+        self.flush_interval = flush_interval
+        self.flush_batch_size = flush_batch_size
+        self.forwarder = forwarder
+        self.forward_interval = forward_interval
+
+        # 日志写入和数据库操作各自使用单线程执行器，保证顺序且互不阻塞
+        self.wal_executor = ThreadPoolExecutor(max_workers=1)
+        self.db_executor = ThreadPoolExecutor(max_workers=1)
+        self.forward_executor = ThreadPoolExecutor(max_workers=1)
+        # 导出使用独立的数据库连接（WAL 模式下读取不阻塞写入），不占用刷盘线程
+        self.export_executor = ThreadPoolExecutor(max_workers=1)
+
+        self.stats = {'received': 0, 'committed': 0, 'group_commits': 0,
+                      'flushed': 0, 'forwarded': 0, 'forward_errors': 0}
+        self._unflushed = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._flush_event: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._flush_event = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+
+        # 启动时先把上次未刷盘的日志重放进数据库
+        await self.flush()
+        print(f"📦 记录库已就绪，共 {self.store.count()} 条记录")
+
+        self._tasks.append(asyncio.create_task(self._committer()))
+        self._tasks.append(asyncio.create_task(self._flusher()))
+        if self.forwarder:
+            self._tasks.append(asyncio.create_task(self._forward_loop()))
+
+    async def submit(self, records: List[Dict[str, Any]]) -> List[str]:
+        """提交记录，写入日志并落盘后才返回记录ID"""
+        now = time.time()
+        entries = [{'record_id': str(uuid.uuid4()), 'received_at': now, 'record': r} for r in records]
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((entries, future))
+        self.stats['received'] += len(entries)
+        await future
+        return [entry['record_id'] for entry in entries]
+
+    async def _committer(self):
+        """组提交：一次 fsync 期间到达的请求合并到下一次写入"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            entries = [entry for group, _ in batch for entry in group]
+            try:
+                await loop.run_in_executor(self.wal_executor, self.wal.append, entries)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
+            self.stats['committed'] += len(entries)
+            self.stats['group_commits'] += 1
+            self._unflushed += len(entries)
+            if self._unflushed >= self.flush_batch_size:
+                self._flush_event.set()
+
+    async def _flusher(self):
+        """定时或积压达到批量大小时刷盘"""
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_event.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"刷入数据库失败，日志保留待重试: {e}")
+
+    async def flush(self):
+        """封存当前日志段，把已封存的段批量写入数据库后删除。
+        定时刷盘、导出和启动时的重放可能同时调用；rotate 返回磁盘上全部已封存的段，
+        两次刷盘交错会处理同一个段（后删除的一方找不到文件），所以整个过程串行执行"""
+        loop = asyncio.get_running_loop()
+        async with self._flush_lock:
+            self._unflushed = 0
+            # 封存与追加在同一个执行器中排队，封存时不会有写到一半的批次
+            sealed = await loop.run_in_executor(self.wal_executor, self.wal.rotate)
+            if sealed:
+                inserted = await loop.run_in_executor(self.db_executor, self._flush_segments, sealed)
+                self.stats['flushed'] += inserted
+
+    def _flush_segments(self, segments: List[str]) -> int:
+        inserted = 0
+        for path in segments:
+            batch = []
+            for entry in WriteAheadLog.read_segment(path):
+                batch.append(entry)
+                if len(batch) >= self.flush_batch_size:
+                    inserted += self.store.insert_batch(batch)
+                    batch = []
+            if batch:
+                inserted += self.store.insert_batch(batch)
+        # 全部提交成功后才删除日志段
+        WriteAheadLog.remove(segments)
+        return inserted
+
+    async def export(self, fmt: str, table: Optional[str]) -> AsyncIterator[bytes]:
+        """先刷盘再把全部记录导出到临时文件，返回逐块读取该文件的异步迭代器（发送完后删除文件）"""
+        await self.flush()
+        loop = asyncio.get_running_loop()
+        fd, path = tempfile.mkstemp(prefix='export-', suffix=f'.{fmt}', dir=self.data_dir)
+        os.close(fd)
+        try:
+            await loop.run_in_executor(self.export_executor, export_store, self.store.db_path, path, fmt,
+                                       self.flush_batch_size, table)
+        except BaseException:
+            os.remove(path)
+            raise
+
+        async def read_chunks():
+            try:
+                with open(path, 'rb') as f:
+                    while True:
+                        chunk = await loop.run_in_executor(self.export_executor, f.read, EXPORT_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        yield chunk
+            finally:
+                os.remove(path)
+
+        return read_chunks()
+
+    async def _forward_loop(self):
+        """把数据库中未转发的记录按批量接口同步到飞书"""
+        loop = asyncio.get_running_loop()
+        while True:
+            rows = await loop.run_in_executor(self.db_executor, self.store.unforwarded, MAX_BATCH_SIZE)
+            if not rows:
+                await asyncio.sleep(self.forward_interval)
+                continue
+
+            record_ids = [record_id for record_id, _ in rows]
+            try:
+                await loop.run_in_executor(self.forward_executor, self.forwarder.upload_batch,
+                                           [record for _, record in rows])
+            except Exception as e:
+                # 除接口返回的 FeishuError 外，网络错误、响应缺字段或不是JSON也不能让转发任务退出
+                self.stats['forward_errors'] += 1
+                print(f"飞书批量转发失败，记录保留在本地稍后重试: {type(e).__name__}: {e}")
+                await asyncio.sleep(self.forward_interval)
+                continue
+
+            await loop.run_in_executor(self.db_executor, self.store.mark_forwarded, record_ids)
+            self.stats['forwarded'] += len(record_ids)
+
+    async def handle(self, request: HTTPRequest) -> Tuple[int, Any, Dict[str, str]]:
+        """请求路由"""
+        if request.method == 'OPTIONS':
+            return 204, b'', CORS_HEADERS
+
+        route = (request.method, request.path)
+
+        if route == ('POST', '/records'):
+            body = request.json()
+            records = body if isinstance(body, list) else [body]
+            if not records:
+                raise HTTPError(400, "记录为空")
+            for index, record in enumerate(records):
+                error = validate_record(record)
+                if error:
+                    raise HTTPError(400, f"第 {index + 1} 条记录无效: {error}")
+            record_ids = await self.submit(records)
+            return 202, {"accepted": len(record_ids), "record_ids": record_ids}, CORS_HEADERS
+
+        if route == ('GET', '/health'):
+            return 200, {"status": "ok", "forwarding": self.forwarder is not None}, CORS_HEADERS
+
+        if route == ('GET', '/stats'):
+            return 200, dict(self.stats, pending_flush=self._unflushed), CORS_HEADERS
+
+        if route == ('GET', '/export'):
+            fmt = request.query.get('format', 'xlsx')
+            if fmt not in CONTENT_TYPES:
+                raise HTTPError(400, f"不支持的导出格式 {fmt}，可选 xlsx 或 csv")
+            # CSV 一个文件只能放一张表，默认导出记录表
+            table = request.query.get('table', 'records') if fmt == 'csv' else None
+            if table not in (None, 'records', 'answers'):
+                raise HTTPError(400, f"未知的表 {table}，可选 records 或 answers")
+            if fmt == 'xlsx' and load_openpyxl() is None:
+                raise HTTPError(503, "服务端未安装openpyxl，无法导出Excel，可改用 format=csv")
+            body = await self.export(fmt, table)
+            filename = f"quiz_records_{time.strftime('%Y%m%d')}{'_' + table if table else ''}.{fmt}"
+            headers = dict(CORS_HEADERS)
+            headers['Content-Type'] = CONTENT_TYPES[fmt]
+            headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+            return 200, body, headers
+
+        if request.path in ('/records', '/health', '/stats', '/export'):
+            raise HTTPError(405, f"不支持的请求方法 {request.method}")
+        raise HTTPError(404, f"未知接口 {request.path}")
+
+
+async def run_service(args):
+    forwarder = None
+    if args.forward_feishu:
+        config = get_feishu_config()
+        if config is None:
+            print("警告：飞书配置不完整（FEISHU_APP_ID 等环境变量），记录只保存在本地")
+        else:
+            forwarder = FeishuForwarder(config)
+
+    service = IngestService(args.data_dir, flush_interval=args.flush_interval,
+                            flush_batch_size=args.flush_batch_size, forwarder=forwarder)
+    await service.start()
+
+    server = await serve(service.handle, args.host, args.port)
+    print(f"🚀 答题记录收集服务已启动: http://{args.host}:{args.port}/records")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='本地答题记录收集服务')
+    parser.add_argument('--host', default='127.0.0.1', help='监听地址')
+    parser.add_argument('--port', '-p', type=int, default=8766, help='监听端口')
+    parser.add_argument('--data-dir', default='data/records', help='日志和数据库存放目录')
+    parser.add_argument('--flush-interval', type=float, default=1.0, help='刷入数据库的间隔（秒）')
+    parser.add_argument('--flush-batch-size', type=int, default=1000, help='积压多少条记录时立即刷盘')
+    parser.add_argument('--forward-feishu', action='store_true', help='批量转发记录到飞书多维表格')
+
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run_service(args))
+    except KeyboardInterrupt:
+        print("\n服务已停止，未刷盘的记录会在下次启动时从日志恢复")
+
+
+if __name__ == "__main__":
+    main()
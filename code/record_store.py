@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+答题记录本地存储
+- WriteAheadLog: 追加写入的预写日志（JSON Lines 分段文件），保证记录在确认前已落盘
+- RecordStore:   SQLite 记录库，按批次写入，支持按转发状态查询
+记录结构与前端 utils/feishu.ts 中的 QuizRecord 一致
+"""
+
+import glob
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# QuizRecord 必需字段及其类型
+RECORD_FIELDS = {
+    'name': str,
+    'phone': str,
+    'score': (int, float),
+    'correctRate': (int, float),
+    'wrongCount': int,
+    'timeUsed': str,
+    'startTime': str,
+    'endTime': str,
+    'answers': list,
+}
+
+
+def validate_record(record: Any) -> Optional[str]:
+    """检查记录是否符合 QuizRecord 结构，返回错误信息，合法时返回 None"""
+    if not isinstance(record, dict):
+        return "记录必须是JSON对象"
+    for field, field_type in RECORD_FIELDS.items():
+        if field not in record:
+            return f"缺少必要字段 '{field}'"
+        if isinstance(record[field], bool) or not isinstance(record[field], field_type):
+            return f"字段 '{field}' 类型错误"
+    for answer in record['answers']:
+        if not isinstance(answer, dict) or 'question' not in answer:
+            return "answers 中的每一项必须包含 question"
+    return None
+
+
+class WriteAheadLog:
+    """分段的预写日志：当前段持续追加，刷入SQLite后整段删除"""
+
+    def __init__(self, wal_dir: str):
+        self.wal_dir = wal_dir
+        os.makedirs(wal_dir, exist_ok=True)
+        segments = self.segments()
+        self._segment_no = self._number(segments[-1]) + 1 if segments else 1
+        self._file = None
+
+    @staticmethod
+    def _number(path: str) -> int:
+        return int(os.path.basename(path)[4:-4])
+
+    def segments(self) -> List[str]:
+        """按顺序返回全部日志段"""
+        return sorted(glob.glob(os.path.join(self.wal_dir, 'wal-*.log')), key=self._number)
+
+    def _current(self):
+        if self._file is None:
+            path = os.path.join(self.wal_dir, f"wal-{self._segment_no:08d}.log")
+            self._file = open(path, 'a', encoding='utf-8')
+        return self._file
+
+    def append(self, records: List[Dict[str, Any]]):
+        """组提交：一次写入 + 一次 fsync 落盘整批记录"""
+        f = self._current()
+        f.write(''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in records))
+        f.flush()
+        os.fsync(f.fileno())
+
+    def rotate(self) -> List[str]:
+        """封存当前段并切换到新段，返回已封存、可以在刷盘后删除的段"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._segment_no += 1
+        return [s for s in self.segments() if self._number(s) < self._segment_no]
+
+    @staticmethod
+    def read_segment(path: str) -> Iterator[Dict[str, Any]]:
+        """读取一个日志段；崩溃时写了一半的最后一行会被忽略"""
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    @staticmethod
+    def remove(segments: List[str]):
+        for path in segments:
+            os.remove(path)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class RecordStore:
+    """SQLite 答题记录库"""
+
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS quiz_records (
+            record_id    TEXT PRIMARY KEY,
+            name         TEXT NOT NULL,
+            phone        TEXT NOT NULL,
+            score        REAL NOT NULL,
+            correct_rate REAL NOT NULL,
+            wrong_count  INTEGER NOT NULL,
+            time_used    TEXT,
+            start_time   TEXT,
+            end_time     TEXT,
+            ip_address   TEXT,
+            user_agent   TEXT,
+            answers      TEXT NOT NULL,
+            received_at  REAL NOT NULL,
+            forwarded    INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_quiz_records_forwarded ON quiz_records (forwarded);
+    '''
+
+    COLUMNS = ('record_id', 'name', 'phone', 'score', 'correct_rate', 'wrong_count', 'time_used',
+               'start_time', 'end_time', 'ip_address', 'user_agent', 'answers', 'received_at')
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        # 连接只会在单个后台线程中使用
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(self.SCHEMA)
+
+    @staticmethod
+    def _row(entry: Dict[str, Any]) -> Tuple:
+        record = entry['record']
+        return (
+            entry['record_id'],
+            record['name'],
+            record['phone'],
+            record['score'],
+            record['correctRate'],
+            record['wrongCount'],
+            record.get('timeUsed'),
+            record.get('startTime'),
+            record.get('endTime'),
+            record.get('ipAddress'),
+            record.get('userAgent'),
+            json.dumps(record['answers'], ensure_ascii=False),
+            entry.get('received_at', time.time()),
+        )
+
+    def insert_batch(self, entries: List[Dict[str, Any]]) -> int:
+        """在一个事务里写入整批日志条目；重复的 record_id 会被忽略（重放日志时幂等）"""
+        placeholders = ', '.join('?' * len(self.COLUMNS))
+        with self.conn:
+            cursor = self.conn.executemany(
+                f"INSERT OR IGNORE INTO quiz_records ({', '.join(self.COLUMNS)}) VALUES ({placeholders})",
+                [self._row(entry) for entry in entries])
+        return cursor.rowcount
+
+    def unforwarded(self, limit: int) -> List[Tuple[str, Dict[str, Any]]]:
+        """取出尚未转发到飞书的记录"""
+        rows = self.conn.execute(
+            'SELECT * FROM quiz_records WHERE forwarded = 0 ORDER BY received_at LIMIT ?', (limit,))
+        return [(row[0], self.row_to_record(row)) for row in rows]
+
+    def mark_forwarded(self, record_ids: List[str]):
+        with self.conn:
+            self.conn.executemany('UPDATE quiz_records SET forwarded = 1 WHERE record_id = ?',
+                                  [(record_id,) for record_id in record_ids])
+
+    def iter_records(self, chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """按插入顺序分块读取全部记录，内存占用与总量无关"""
+        cursor = self.conn.execute('SELECT * FROM quiz_records ORDER BY rowid')
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            for row in rows:
+                yield self.row_to_record(row)
+
+    @staticmethod
+    def row_to_record(row: Tuple) -> Dict[str, Any]:
+        """数据库行还原为 QuizRecord 结构"""
+        return {
+            'recordId': row[0],
+            'name': row[1],
+            'phone': row[2],
+            'score': row[3],
+            'correctRate': row[4],
+            'wrongCount': row[5],
+            'timeUsed': row[6],
+            'startTime': row[7],
+            'endTime': row[8],
+            'ipAddress': row[9],
+            'userAgent': row[10],
+            'answers': json.loads(row[11]),
+            'receivedAt': row[12],
+        }
+
+    def count(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM quiz_records').fetchone()[0]
+
+    def close(self):
+        self.conn.close()
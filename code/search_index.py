@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+题库全文检索
+以中文二字组（英文和数字按整词）为词项建立倒排索引，保存在 SQLite 中，按 BM25 排序返回结果。
+索引以稳定题目ID（见 question_ids.py）为主键，同一文档再次导入时只更新有变化的问答对。
+
+用法：
+  python code/search_index.py build 知识库.docx 其他文档.txt     重建索引
+  python code/search_index.py add 新文档.docx                    增量导入（同一文档中已删除的问答对会被移除）
+  python code/search_index.py query "胰岛素 注射"                检索
+"""
+
+import argparse
+import hashlib
+import heapq
+import math
+import os
+import random
+import re
+import sqlite3
+import time
+from collections import Counter
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from question_ids import ensure_question_ids
+from quiz_records import QAPair
+from text_normalizer import normalize_text
+
+DEFAULT_DB_PATH = 'data/search_index.db'
+
+# 题干中的词项按两倍词频计入
+QUESTION_WEIGHT = 2
+
+# BM25 参数
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 连续的汉字，或连续的英文字母和数字
+_TOKEN_RE = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff]+|[a-z0-9]+')
+
+# 倒排表中冗余保存文档长度，打分时不需要再关联 docs 表
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id       INTEGER PRIMARY KEY,
+    source   TEXT NOT NULL,
+    question TEXT NOT NULL,
+    answer   TEXT NOT NULL,
+    length   INTEGER NOT NULL,
+    digest   TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS docs_source ON docs(source);
+CREATE TABLE IF NOT EXISTS postings (
+    term   TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    tf     INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    PRIMARY KEY (term, doc_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS stats (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# 补分阶段每条 IN 查询携带的文档ID数量
+LOOKUP_CHUNK = 500
+
+
+def tokenize(text: str) -> List[str]:
+    """汉字按相邻二字组切分（单个汉字保留为一个词项），英文和数字按整词，统一小写"""
+    tokens = []
+    for match in _TOKEN_RE.finditer(normalize_text(text).lower()):
+        run = match.group()
+        if run[0] < '\u0080' or len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def term_frequencies(question: str, answer: str) -> Counter:
+    counts = Counter(tokenize(answer))
+    for token in tokenize(question):
+        counts[token] += QUESTION_WEIGHT
+    return counts
+
+
+def pair_digest(pair: QAPair) -> str:
+    return hashlib.sha1(f"{pair.question}\x00{pair.answer}".encode('utf-8')).hexdigest()[:16]
+
+
+class SearchIndex:
+    """SQLite 中的倒排索引"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _delete_doc(self, doc_id: int, question: str, answer: str):
+        # 按原文重新切词得到词项，用主键删除，不需要额外的 doc_id 索引
+        self.conn.executemany('DELETE FROM postings WHERE term = ? AND doc_id = ?',
+                              [(term, doc_id) for term in term_frequencies(question, answer)])
+        self.conn.execute('DELETE FROM docs WHERE id = ?', (doc_id,))
+
+    def upsert_source(self, source: str, qa_pairs: List[QAPair]) -> Dict[str, int]:
+        """导入一个文档的全部问答对：新增或修改的重新索引，未变化的跳过，该文档中已不存在的删除"""
+        ensure_question_ids(qa_pairs)
+        stats = {'added': 0, 'updated': 0, 'unchanged': 0, 'removed': 0}
+        doc_rows = []
+        posting_rows = []
+
+        with self.conn:
+            existing = dict(self.conn.execute('SELECT id, digest FROM docs WHERE source = ?', (source,)))
+            seen = set()
+            for pair in qa_pairs:
+                if pair.id in seen:
+                    continue
+                seen.add(pair.id)
+                digest = pair_digest(pair)
+                if existing.get(pair.id) == digest:
+                    stats['unchanged'] += 1
+                    continue
+
+                # 同一道题可能此前从其他文档导入过，统一以最新导入的为准
+                old = self.conn.execute('SELECT question, answer FROM docs WHERE id = ?', (pair.id,)).fetchone()
+                if old is not None:
+                    self._delete_doc(pair.id, *old)
+                    stats['updated'] += 1
+                else:
+                    stats['added'] += 1
+
+                counts = term_frequencies(pair.question, pair.answer)
+                length = sum(counts.values())
+                doc_rows.append((pair.id, source, pair.question, pair.answer, length, digest))
+                posting_rows.extend((term, pair.id, tf, length) for term, tf in counts.items())
+
+            for doc_id in existing.keys() - seen:
+                old = self.conn.execute('SELECT question, answer FROM docs WHERE id = ?', (doc_id,)).fetchone()
+                self._delete_doc(doc_id, *old)
+                stats['removed'] += 1
+
+            # 按词项排序后批量写入，B树的插入位置集中，比按文档顺序随机插入快约一倍
+            posting_rows.sort(key=itemgetter(0))
+            self.conn.executemany('INSERT INTO docs VALUES (?, ?, ?, ?, ?, ?)', doc_rows)
+            self.conn.executemany('INSERT INTO postings VALUES (?, ?, ?, ?)', posting_rows)
+
+            doc_count, total_length = self.conn.execute('SELECT COUNT(*), TOTAL(length) FROM docs').fetchone()
+            self.conn.executemany('INSERT OR REPLACE INTO stats VALUES (?, ?)',
+                                  [('doc_count', doc_count), ('total_length', int(total_length))])
+
+        return stats
+
+    def _expand_terms(self, query: str) -> List[str]:
+        """查询切词；单个汉字展开为以它开头的全部二字组"""
+        terms = []
+        for token in dict.fromkeys(tokenize(query)):
+            if len(token) == 1 and token >= '\u0080':
+                terms.extend(row[0] for row in self.conn.execute(
+                    'SELECT DISTINCT term FROM postings WHERE term >= ? AND term < ?',
+                    (token, chr(ord(token) + 1))))
+            else:
+                terms.append(token)
+        return list(dict.fromkeys(terms))
+
+    def _postings(self, term: str, doc_ids: Optional[List[int]] = None) -> Iterable[Tuple[int, int, int]]:
+        """词项的 (文档ID, 词频, 文档长度)；给出 doc_ids 时只查这些文档"""
+        if doc_ids is None:
+            return self.conn.execute('SELECT doc_id, tf, length FROM postings WHERE term = ?', (term,))
+        rows = []
+        for i in range(0, len(doc_ids), LOOKUP_CHUNK):
+            chunk = doc_ids[i:i + LOOKUP_CHUNK]
+            rows += self.conn.execute(
+                f"SELECT doc_id, tf, length FROM postings WHERE term = ? AND doc_id IN ({','.join('?' * len(chunk))})",
+                [term] + chunk).fetchall()
+        return rows
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """按 BM25 得分从高到低返回匹配的问答对
+
+        按文档频率从低到高逐个扫描词项的倒排表（MaxScore）：一旦剩余词项的得分上界之和
+        不足以让尚未出现的文档进入前 limit 名，高频词项就只为现有候选文档补分，
+        不必扫描动辄覆盖半个题库的完整倒排表。结果与完整计算相同。
+        """
+        terms = self._expand_terms(query)
+        stats = dict(self.conn.execute('SELECT key, value FROM stats'))
+        doc_count = stats.get('doc_count', 0)
+        if not terms or not doc_count:
+            return []
+        avg_length = stats['total_length'] / doc_count
+
+        placeholders = ','.join('?' * len(terms))
+        doc_freq = self.conn.execute(
+            f'SELECT term, COUNT(*) FROM postings WHERE term IN ({placeholders}) GROUP BY term', terms).fetchall()
+        doc_freq.sort(key=lambda item: item[1])
+        idfs = [(term, math.log(1 + (doc_count - df + 0.5) / (df + 0.5))) for term, df in doc_freq]
+        # 单个词项对得分的最大贡献为 idf * (k1 + 1)
+        remaining = sum(idf for _, idf in idfs) * (BM25_K1 + 1)
+
+        scores: Dict[int, float] = {}
+        candidates: Optional[List[int]] = None
+        for term, idf in idfs:
+            if candidates is None and len(scores) >= limit:
+                threshold = heapq.nlargest(limit, scores.values())[-1]
+                if threshold >= remaining:
+                    # 只有当前得分加上剩余上界仍能达到第 limit 名的文档才可能进入结果
+                    candidates = [doc_id for doc_id, score in scores.items() if score + remaining >= threshold]
+            for doc_id, tf, length in self._postings(term, candidates):
+                bm25 = idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length))
+                scores[doc_id] = scores.get(doc_id, 0.0) + bm25
+            remaining -= idf * (BM25_K1 + 1)
+
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        if not top:
+            return []
+        docs = {row[0]: row for row in self.conn.execute(
+            f"SELECT id, question, answer, source FROM docs WHERE id IN ({','.join('?' * len(top))})",
+            [doc_id for doc_id, _ in top])}
+        return [{'id': doc_id, 'question': docs[doc_id][1], 'answer': docs[doc_id][2], 'source': docs[doc_id][3],
+                 'score': score} for doc_id, score in top]
+
+    def count(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM docs').fetchone()[0]
+
+
+def remove_index(db_path: str):
+    """删除索引数据库及其 WAL 文件"""
+    for path in (db_path, db_path + '-wal', db_path + '-shm'):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def load_pairs(path: str) -> List[QAPair]:
+    """提取并解析文档"""
+    from quiz_core import extract_content, parse_qa_content_universal
+
+    content = extract_content(path)
+    return parse_qa_content_universal(content) if content else []
+
+
+def import_documents(index: SearchIndex, paths: Iterable[str]):
+    for path in paths:
+        if not os.path.exists(path):
+            print(f"错误：文件不存在 {path}")
+            continue
+        qa_pairs = load_pairs(path)
+        if not qa_pairs:
+            print(f"错误：无法从 {path} 解析到有效的问答对")
+            continue
+        start = time.perf_counter()
+        stats = index.upsert_source(os.path.abspath(path), qa_pairs)
+        elapsed = time.perf_counter() - start
+        print(f"✅ {path}: 新增 {stats['added']}，更新 {stats['updated']}，未变化 {stats['unchanged']}，"
+              f"删除 {stats['removed']}（用时 {elapsed:.2f} 秒）")
+
+
+def print_results(results: List[Dict[str, Any]], elapsed: float):
+    print(f"找到 {len(results)} 条结果（用时 {elapsed * 1000:.1f} 毫秒）")
+    for rank, result in enumerate(results, 1):
+        answer = result['answer']
+        print(f"\n{rank}. [{result['id']}] {result['question']}  (得分 {result['score']:.2f})")
+        print(f"   {answer[:80]}{'...' if len(answer) > 80 else ''}")
+
+
+def run_benchmark(db_path: str, source: str, num_pairs: int, num_queries: int):
+    """用原文句子拼接出合成题库，测量建索引和检索耗时"""
+    with open(source, 'r', encoding='utf-8') as f:
+        sentences = [line.strip() for line in f if len(line.strip()) > 10]
+
+    rng = random.Random(0)
+    qa_pairs = [QAPair(f"{rng.choice(sentences)[:30]}（{i}）？", ''.join(rng.sample(sentences, 2))[:150])
+                for i in range(num_pairs)]
+
+    remove_index(db_path)
+    index = SearchIndex(db_path)
+    start = time.perf_counter()
+    index.upsert_source('benchmark', qa_pairs)
+    print(f"建立索引: {num_pairs} 个问答对，用时 {time.perf_counter() - start:.2f} 秒，"
+          f"索引文件 {os.path.getsize(db_path) / 2**20:.1f} MB")
+
+    # 修改其中1%的答案后重新导入
+    for pair in rng.sample(qa_pairs, num_pairs // 100):
+        pair.answer += "（已修订）"
+    start = time.perf_counter()
+    stats = index.upsert_source('benchmark', qa_pairs)
+    print(f"增量更新: {stats['updated']} 个问答对，用时 {time.perf_counter() - start:.2f} 秒")
+
+    queries = [rng.choice(sentences)[:4] for _ in range(num_queries)]
+    start = time.perf_counter()
+    for query in queries:
+        index.search(query, 10)
+    elapsed = time.perf_counter() - start
+    print(f"检索: {num_queries} 次查询，平均每次 {elapsed / num_queries * 1000:.1f} 毫秒")
+    index.close()
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='题库全文检索（倒排索引 + BM25）')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help='索引数据库路径')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='清空后重建索引')
+    build_parser.add_argument('documents', nargs='+', help='文档路径')
+
+    add_parser = subparsers.add_parser('add', help='增量导入文档')
+    add_parser.add_argument('documents', nargs='+', help='文档路径')
+
+    query_parser = subparsers.add_parser('query', help='检索')
+    query_parser.add_argument('text', help='检索词')
+    query_parser.add_argument('--limit', '-k', type=int, default=10, help='返回结果数量')
+
+    bench_parser = subparsers.add_parser('benchmark', help='在合成题库上测试建索引和检索速度')
+    bench_parser.add_argument('source', nargs='?', default='data/extracted_content.txt', help='用于合成问答对的文本')
+    bench_parser.add_argument('--pairs', type=int, default=50000, help='合成问答对数量')
+    bench_parser.add_argument('--queries', type=int, default=200, help='查询次数')
+
+    args = parser.parse_args()
+
+    if args.command == 'benchmark':
+        if not os.path.exists(args.source):
+            print(f"错误：文件不存在 {args.source}")
+            return
+        run_benchmark(args.db, args.source, args.pairs, args.queries)
+        return
+
+    if args.command == 'build':
+        remove_index(args.db)
+
+    index = SearchIndex(args.db)
+    try:
+        if args.command in ('build', 'add'):
+            import_documents(index, args.documents)
+            print(f"索引中共有 {index.count()} 个问答对")
+        else:
+            start = time.perf_counter()
+            results = index.search(args.text, args.limit)
+            print_results(results, time.perf_counter() - start)
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+记录收集服务的并发测试：导出、定时刷盘和手动刷盘同时进行时不能重复处理同一个日志段
+运行: cd code && python -m unittest test_record_ingest_service
+"""
+
+import asyncio
+import csv
+import io
+import shutil
+import tempfile
+import unittest
+
+from record_ingest_service import IngestService
+
+RECORD = {
+    'name': '张三', 'phone': '13800000000', 'score': 80, 'correctRate': 80, 'wrongCount': 1,
+    'timeUsed': '1分钟', 'startTime': '2024-01-01 10:00', 'endTime': '2024-01-01 10:01',
+    'answers': [{'question': '问题1', 'userAnswer': 'A', 'correctAnswer': 'A', 'isCorrect': True}],
+}
+
+
+class ExportFlushConcurrencyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def test_export_while_flushing(self):
+        async def run():
+            # 刷盘间隔很短，定时刷盘任务也会与导出交错
+            service = IngestService(self.data_dir, flush_interval=0.001)
+            await service.start()
+            try:
+                for round_no in range(1, 31):
+                    await service.submit([RECORD] * 3)
+                    results = await asyncio.gather(service.flush(), service.export('csv', 'records'),
+                                                   service.flush(), return_exceptions=True)
+                    errors = [r for r in results if isinstance(r, BaseException)]
+                    self.assertEqual(errors, [])
+
+                    body = b''.join([chunk async for chunk in results[1]])
+                    rows = list(csv.reader(io.StringIO(body.decode('utf-8-sig'))))
+                    # 导出前已确认的记录都应已刷入数据库并出现在导出文件中（首行为表头）
+                    self.assertEqual(len(rows) - 1, round_no * 3)
+                self.assertEqual(service.wal.rotate(), [])
+            finally:
+                for task in service._tasks:
+                    task.cancel()
+                await asyncio.gather(*service._tasks, return_exceptions=True)
+                service.wal.close()
+                service.store.close()
+
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基于字符 n-gram TF-IDF 的干扰项排序
+对题库全部答案只建一次稀疏矩阵，整份试卷的题目一次稀疏矩阵乘法取出最相似（但不相同）的答案，
+作为看起来合理的干扰项。需要 numpy 和 scipy。
+"""
+
+import argparse
+import os
+import random
+import re
+import time
+from typing import Dict, List, Sequence
+
+import numpy as np
+from scipy import sparse
+
+# 计算 n-gram 前去掉空白和常见标点，避免它们主导相似度
+_STRIP_PATTERN = re.compile(r'[\s，。、；：！？,.;:!?（）()“”"\'《》【】\[\]…-]+')
+
+
+def normalize_answer(text: str) -> str:
+    """用于判断两个答案是否相同的归一化文本"""
+    return _STRIP_PATTERN.sub('', text)
+
+
+def char_ngrams(text: str, ngram_range=(2, 3)) -> List[str]:
+    """提取字符 n-gram（中文按字切分即可，不需要分词）"""
+    text = normalize_answer(text)
+    grams = []
+    for n in range(ngram_range[0], ngram_range[1] + 1):
+        grams.extend(text[i:i + n] for i in range(len(text) - n + 1))
+    return grams
+
+
+class DistractorRanker:
+    """答案相似度检索器：行向量为 L2 归一化的 TF-IDF"""
+
+    def __init__(self, answers: Sequence[str], ngram_range=(2, 3), max_similarity: float = 0.95,
+                 max_df: float = 0.2):
+        self.answers = answers
+        self.max_similarity = max_similarity
+
+        vocabulary: Dict[str, int] = {}
+        indices, indptr, data = [], [0], []
+        for answer in answers:
+            counts: Dict[int, int] = {}
+            for gram in char_ngrams(answer, ngram_range):
+                column = vocabulary.setdefault(gram, len(vocabulary))
+                counts[column] = counts.get(column, 0) + 1
+            indices.extend(counts.keys())
+            data.extend(counts.values())
+            indptr.append(len(indices))
+
+        tf = sparse.csr_matrix((np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32),
+                                np.asarray(indptr, dtype=np.int64)), shape=(len(answers), len(vocabulary)))
+
+        # 平滑 idf，与常见实现一致：log((1+N)/(1+df)) + 1
+        df = np.bincount(tf.indices, minlength=len(vocabulary))
+        idf = np.log((1 + len(answers)) / (1 + df)).astype(np.float32) + 1
+        # 出现在大多数答案中的 n-gram 区分度低，却会让相似度矩阵变稠密，直接置零
+        idf[df > max_df * len(answers)] = 0
+        tfidf = tf.multiply(idf[np.newaxis, :]).tocsr()
+        tfidf.eliminate_zeros()
+
+        norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        self.matrix = sparse.diags(1 / norms).dot(tfidf).tocsr()
+        # 预先转置，查询时直接做 CSR × CSR 乘法
+        self.matrix_t = self.matrix.T.tocsr()
+
+        # 归一化文本完全相同的答案不能互为干扰项
+        self._normalized = [normalize_answer(answer) for answer in answers]
+
+    def top_k(self, query_indices: Sequence[int], k: int = 3) -> List[List[int]]:
+        """批量返回每个查询答案最相似的 k 个其他答案下标（按相似度降序）"""
+        if not len(query_indices):
+            return []
+        similarities = (self.matrix[list(query_indices)] @ self.matrix_t).tocsr()
+
+        results = []
+        for row, query in enumerate(query_indices):
+            start, end = similarities.indptr[row], similarities.indptr[row + 1]
+            columns = similarities.indices[start:end]
+            scores = similarities.data[start:end]
+
+            # 排除自身和近似重复的答案
+            keep = (columns != query) & (scores < self.max_similarity)
+            columns, scores = columns[keep], scores[keep]
+
+            # 多取一些候选，用于过滤文本相同的答案
+            take = min(len(columns), k * 2)
+            if take == 0:
+                results.append([])
+                continue
+            top = np.argpartition(-scores, take - 1)[:take]
+            top = top[np.argsort(-scores[top], kind='stable')]
+
+            own_text = self._normalized[query]
+            chosen, seen = [], {own_text}
+            for column in columns[top]:
+                text = self._normalized[column]
+                if text not in seen:
+                    seen.add(text)
+                    chosen.append(int(column))
+                    if len(chosen) == k:
+                        break
+            results.append(chosen)
+        return results
+
+    def similar_answers(self, query_indices: Sequence[int], k: int = 3) -> List[List[str]]:
+        """与 top_k 相同，但直接返回答案文本"""
+        return [[self.answers[i] for i in row] for row in self.top_k(query_indices, k)]
+
+
+def main():
+    """性能测试：在合成的大题库上建索引并为整份试卷检索干扰项"""
+    parser = argparse.ArgumentParser(description='TF-IDF 干扰项检索性能测试')
+    parser.add_argument('source', nargs='?', default='data/extracted_content.txt', help='用于合成答案的文本文件')
+    parser.add_argument('--answers', type=int, default=50000, help='合成题库的答案数量')
+    parser.add_argument('--quiz-size', type=int, default=25, help='每份试卷的题目数量')
+    parser.add_argument('--quizzes', type=int, default=100, help='检索的试卷份数')
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.source):
+        print(f"错误：文件不存在 {args.source}")
+        return
+
+    with open(args.source, 'r', encoding='utf-8') as f:
+        sentences = [line.strip() for line in f if len(line.strip()) > 10]
+
+    # 随机拼接原文句子，得到规模和用字分布接近真实题库的答案集合
+    rng = random.Random(0)
+    answers = [''.join(rng.sample(sentences, 2))[:150] for _ in range(args.answers)]
+
+    start = time.perf_counter()
+    ranker = DistractorRanker(answers)
+    build_time = time.perf_counter() - start
+    print(f"建立索引: {len(answers)} 个答案，{ranker.matrix.shape[1]} 个 n-gram，用时 {build_time:.2f} 秒")
+
+    start = time.perf_counter()
+    for _ in range(args.quizzes):
+        ranker.top_k(rng.sample(range(len(answers)), args.quiz_size), 3)
+    elapsed = time.perf_counter() - start
+    print(f"检索干扰项: {args.quizzes} 份试卷用时 {elapsed:.2f} 秒，平均每份 {elapsed / args.quizzes * 1000:.1f} 毫秒")
+
+
+if __name__ == "__main__":
+    main()
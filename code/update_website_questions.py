@@ -4,10 +4,22 @@
 更新答题网站题目数据工具
 """
 
-import json
 import shutil
 import os
 
+from quiz_stream import QuizStreamReader, QuizStreamWriter, detect_format
+from quiz_validator import validate_quiz_file
+
+def write_website_json(source_json: str, target: str, meta: dict):
+    """把题目文件写成网站使用的JSON：JSON 直接复制，JSON Lines 逐题转换"""
+    if detect_format(source_json) == 'json':
+        shutil.copyfile(source_json, target)
+        return
+    
+    with QuizStreamWriter(target, meta['title'], meta['description'], meta['time_limit'], 'json') as writer:
+        for question in QuizStreamReader(source_json):
+            writer.write_question(question)
+
 def update_website_questions(source_json: str, website_dir: str = "/workspace/diabetes-quiz"):
     """更新网站的题目数据"""
     
@@ -26,23 +38,18 @@ def update_website_questions(source_json: str, website_dir: str = "/workspace/di
     target_dist = os.path.join(website_dir, "dist", "quiz_questions.json")
     
     try:
-        # 读取新的题目数据进行验证
-        with open(source_json, 'r', encoding='utf-8') as f:
-            quiz_data = json.load(f)
-        
-        # 验证数据格式
-        required_fields = ['title', 'description', 'time_limit', 'total_questions', 'questions']
-        for field in required_fields:
-            if field not in quiz_data:
-                print(f"错误：题目数据缺少必要字段 '{field}'")
-                return False
-        
-        if not quiz_data['questions']:
-            print("错误：题目数据为空")
+        # 流式读取一遍完成全部题目的校验，不把整个文件载入内存
+        valid, errors, meta, count = validate_quiz_file(source_json)
+        if not valid:
+            print(f"错误：题目数据未通过校验，共 {len(errors)} 个问题")
+            for error in errors[:50]:
+                print(f"  {error}")
+            if len(errors) > 50:
+                print(f"  ……另有 {len(errors) - 50} 个问题未显示")
             return False
         
-        print(f"✅ 验证通过：{quiz_data['total_questions']} 道题目")
-        print(f"📝 题目标题：{quiz_data['title']}")
+        print(f"✅ 验证通过：{count} 道题目")
+        print(f"📝 题目标题：{meta['title']}")
         
         # 备份现有文件
         if os.path.exists(target_public):
@@ -56,14 +63,12 @@ def update_website_questions(source_json: str, website_dir: str = "/workspace/di
             print(f"📦 已备份原文件：{backup_dist}")
         
         # 更新public目录的题目文件
-        with open(target_public, 'w', encoding='utf-8') as f:
-            json.dump(quiz_data, f, ensure_ascii=False, indent=2)
+        write_website_json(source_json, target_public, meta)
         print(f"✅ 已更新：{target_public}")
         
-        # 更新dist目录的题目文件（如果存在）
+        # 更新dist目录的题目文件（如果存在），内容与public相同直接复制
         if os.path.exists(os.path.dirname(target_dist)):
-            with open(target_dist, 'w', encoding='utf-8') as f:
-                json.dump(quiz_data, f, ensure_ascii=False, indent=2)
+            shutil.copyfile(target_public, target_dist)
             print(f"✅ 已更新：{target_dist}")
         
         print("\n🎉 网站题目数据更新成功！")
@@ -71,9 +76,6 @@ def update_website_questions(source_json: str, website_dir: str = "/workspace/di
         
         return True
         
-    except json.JSONDecodeError as e:
-        print(f"错误：题目文件JSON格式有误 {e}")
-        return False
     except Exception as e:
         print(f"错误：更新失败 {e}")
         return False
@@ -114,7 +116,7 @@ def main():
     import argparse
     
     parser = argparse.ArgumentParser(description='更新答题网站题目数据')
-    parser.add_argument('source_json', help='新的题目JSON文件路径')
+    parser.add_argument('source_json', help='新的题目JSON文件路径（也支持 .jsonl）')
     parser.add_argument('--website-dir', default='/workspace/diabetes-quiz', help='网站目录路径')
     parser.add_argument('--rebuild', action='store_true', help='更新后重新构建网站')
     
@@ -85,6 +85,7 @@ function App() {
         startTime: new Date(result.timestamp - (quizData.time_limit * 60 * 1000)).toLocaleString('zh-CN'),
         endTime: new Date(result.timestamp).toLocaleString('zh-CN'),
         answers: result.answers.map((userAnswer, index) => ({
+          questionId: quizData.questions[index]?.id,
           question: quizData.questions[index]?.question || '',
           userAnswer: quizData.questions[index]?.options[userAnswer] || '未选择',
           correctAnswer: quizData.questions[index]?.options[quizData.questions[index].correct_answer] || '',
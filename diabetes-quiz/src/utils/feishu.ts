@@ -22,6 +22,7 @@ interface QuizRecord {
   startTime: string;
   endTime: string;
   answers: Array<{
+    questionId?: number;
     question: string;
     userAnswer: string;
     correctAnswer: string;